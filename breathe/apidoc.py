@@ -20,8 +20,13 @@ import os
 import sys
 import argparse
 import errno
+import hashlib
+import json
+import threading
 import xml.etree.ElementTree
 
+from concurrent.futures import ThreadPoolExecutor
+
 from breathe import __version__
 
 # Account for FileNotFoundError in Python 2
@@ -54,15 +59,110 @@ def print_info(msg, args):
         print(msg)
 
 
+class Manifest:
+    """Records the files written by earlier runs along with the hash of their contents and the
+    size and modification time they were written with, so that unchanged files don't need to be
+    read back and files for compounds which no longer exist can be found."""
+
+    FILENAME = ".breathe-apidoc.json"
+
+    def __init__(self, destdir):
+        self.destdir = destdir
+        self.filename = os.path.join(destdir, self.FILENAME)
+        self.entries = {}
+        self.generated = set()
+        self.lock = threading.Lock()
+        try:
+            with open(self.filename, "r") as f:
+                self.entries = json.load(f)["files"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    @staticmethod
+    def digest(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _unchanged(self, name):
+        """Whether the file is still as it was written, going by its size and modification
+        time."""
+        entry = self.entries.get(name)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.destdir, name))
+        except FileNotFoundError:
+            return False
+        return [stat.st_size, stat.st_mtime_ns] == entry["stat"]
+
+    def is_current(self, name, digest):
+        return self._unchanged(name) and self.entries[name]["digest"] == digest
+
+    def keep(self, name):
+        with self.lock:
+            self.generated.add(name)
+
+    def record(self, name, digest):
+        stat = os.stat(os.path.join(self.destdir, name))
+        with self.lock:
+            self.generated.add(name)
+            self.entries[name] = {"digest": digest, "stat": [stat.st_size, stat.st_mtime_ns]}
+
+    @staticmethod
+    def _requested(name, args, toc_files):
+        """Whether the file is of a type generated by this run. Files of the other types are kept
+        as they are, e.g., when only some types are generated with -g."""
+        directory = os.path.dirname(name)
+        if directory:
+            return directory in args.outtypes
+        if not toc_files:
+            return False
+        base = os.path.splitext(name)[0]
+        return base.endswith("list") and base[: -len("list")] in args.outtypes
+
+    def remove_stale(self, args, toc_files):
+        """Delete the files written by earlier runs for the requested types which weren't
+        generated by this one, leaving out the table of contents files unless toc_files is set,
+        and directories left empty."""
+        for name in sorted(set(self.entries) - self.generated):
+            if not self._requested(name, args, toc_files):
+                continue
+            directory = os.path.dirname(name)
+            fname = os.path.join(self.destdir, name)
+            if not os.path.exists(fname):
+                del self.entries[name]
+            elif not self._unchanged(name):
+                print_info("File %s has been modified, not removing it." % fname, args)
+            elif args.dryrun:
+                print_info("Would remove file %s." % fname, args)
+                # Only report it once
+                self.generated.add(name)
+            else:
+                print_info("Removing file %s." % fname, args)
+                os.remove(fname)
+                del self.entries[name]
+                if directory and not os.listdir(os.path.join(self.destdir, directory)):
+                    os.rmdir(os.path.join(self.destdir, directory))
+
+    def save(self):
+        with open(self.filename, "w") as f:
+            json.dump({"files": self.entries}, f, sort_keys=True)
+
+
 def write_file(name, text, args):
     """Write the output file for module/package <name>."""
-    fname = os.path.join(args.destdir, "%s.%s" % (name, args.suffix))
+    relname = "%s.%s" % (name, args.suffix)
+    fname = os.path.join(args.destdir, relname)
+    args.manifest.keep(relname)
     if args.dryrun:
         print_info("Would create file %s." % fname, args)
         return
     if not args.force and os.path.isfile(fname):
         print_info("File %s already exists, skipping." % fname, args)
     else:
+        digest = args.manifest.digest(text)
+        if args.manifest.is_current(relname, digest):
+            print_info("File %s up to date, skipping." % fname, args)
+            return
         print_info("Creating file %s." % fname, args)
         if not os.path.exists(os.path.dirname(fname)):
             try:
@@ -71,17 +171,20 @@ def write_file(name, text, args):
                 if exc.errno != errno.EEXIST:
                     raise
         try:
+            # Files not in the manifest still need to be compared with what would be written
             with open(fname, "r") as target:
                 orig = target.read()
-                if orig == text:
-                    print_info("File %s up to date, skipping." % fname, args)
-                    return
+            if orig == text:
+                print_info("File %s up to date, skipping." % fname, args)
+                args.manifest.record(relname, digest)
+                return
         except FileNotFoundError:
             # Don't mind if it isn't there
             pass
 
         with open(fname, "w") as target:
             target.write(text)
+        args.manifest.record(relname, digest)
 
 
 def format_heading(level, text):
@@ -130,13 +233,27 @@ def recurse_tree(args):
     Look for every file in the directory tree and create the corresponding
     ReST files.
     """
-    index = xml.etree.ElementTree.parse(os.path.join(args.rootpath, "index.xml"))
-
-    # Assuming this is a valid Doxygen XML
-    for compound in index.getroot():
-        create_package_file(
-            compound.findtext("name"), compound.get("kind"), compound.get("refid"), args
-        )
+    index_path = os.path.join(args.rootpath, "index.xml")
+
+    # Stream the index rather than holding the whole tree in memory and write the files as their
+    # compounds are read, assuming this is a valid Doxygen XML
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = []
+        for _, element in xml.etree.ElementTree.iterparse(index_path):
+            if element.tag != "compound":
+                continue
+            futures.append(
+                executor.submit(
+                    create_package_file,
+                    element.findtext("name"),
+                    element.get("kind"),
+                    element.get("refid"),
+                    args,
+                )
+            )
+            element.clear()
+        for future in futures:
+            future.result()
 
 
 class TypeAction(argparse.Action):
@@ -153,7 +270,7 @@ class TypeAction(argparse.Action):
         setattr(namespace, self.dest, value_list)
 
 
-def main():
+def main(argv=None):
     """Parse and check the command line arguments."""
     parser = argparse.ArgumentParser(
         description="""\
@@ -218,6 +335,22 @@ Note: By default this script will not overwrite already created files.""",
         dest="outtypes",
         help="types of output to generate, comma-separated list",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        help="number of files to write in parallel",
+        default=None,
+    )
+    parser.add_argument(
+        "--remove-stale",
+        action="store_true",
+        dest="removestale",
+        help="Remove unmodified files created by earlier runs for compounds of the generated "
+        "types which no longer exist",
+    )
     parser.add_argument(
         "-q", "--quiet", action="store_true", dest="quiet", help="suppress informational messages"
     )
@@ -225,24 +358,32 @@ Note: By default this script will not overwrite already created files.""",
         "--version", action="version", version="Breathe (breathe-apidoc) %s" % __version__
     )
     parser.add_argument("rootpath", type=str, help="The directory contains index.xml")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.suffix.startswith("."):
         args.suffix = args.suffix[1:]
     if not os.path.isdir(args.rootpath):
         print("%s is not a directory." % args.rootpath, file=sys.stderr)
         sys.exit(1)
-    if "index.xml" not in os.listdir(args.rootpath):
+    if not os.path.isfile(os.path.join(args.rootpath, "index.xml")):
         print("%s does not contain a index.xml" % args.rootpath, file=sys.stderr)
         sys.exit(1)
     if not os.path.isdir(args.destdir):
         if not args.dryrun:
             os.makedirs(args.destdir)
     args.rootpath = os.path.abspath(args.rootpath)
+    args.manifest = Manifest(args.destdir)
     recurse_tree(args)
+    if args.removestale:
+        args.manifest.remove_stale(args, toc_files=False)
     if not args.notoc:
         for key in args.outtypes:
             create_modules_toc_file(key, TYPEDICT[key], args)
+    if args.removestale and not args.notoc:
+        # The types without any files left have lost their table of contents
+        args.manifest.remove_stale(args, toc_files=True)
+    if not args.dryrun:
+        args.manifest.save()
 
 
 # So program can be started with "python -m breathe.apidoc ..."
@@ -0,0 +1,148 @@
+"""
+Reading Doxygen output from archives, so that it doesn't need to be unpacked before the build.
+
+A project path can name a ``.zip``, ``.tar.gz``/``.tgz`` or ``.tar.zst`` archive. The files in it
+are then addressed as if the archive were a directory, e.g. ``xml.zip/index.xml``. If the archive
+has a single top-level directory containing ``index.xml``, that directory is treated as the root.
+
+Zip files are read through their central directory and each member is decompressed as it is
+read. Tar archives have no central directory, so the first access streams through the archive
+once and keeps every member compressed in memory for later reads, which takes about as much memory
+as the archive itself. Every process reading the archive does so, i.e., each worker of a parallel
+build which reads from it keeps a copy of its own.
+
+Archives are opened from the threads prefetching compound files as well as from the build, so
+each archive is only read by whichever thread asks for it first while the others wait for it.
+"""
+
+from breathe.exception import BreatheError
+
+import gzip
+import io
+import os
+import re
+import threading
+import zlib
+
+from typing import Dict, IO, Iterable, Optional, Tuple, Union
+
+# The archive modules are imported when the first archive is opened as most projects read the XML
+# output directly
+_archive_path_re = re.compile(r"^(.*?(?:\.zip|\.tar\.gz|\.tgz|\.tar\.zst))(?:[\\/]+(.*))?$")
+
+
+class ArchiveError(BreatheError):
+    pass
+
+
+def _find_root(names: Iterable[str]) -> str:
+    """Returns the directory holding index.xml, with a trailing slash, or "" for the top level."""
+
+    index_names = ("index.xml", "index.xml.gz")
+    candidates = [name for name in names if os.path.basename(name) in index_names]
+    if not candidates:
+        return ""
+    root = os.path.dirname(min(candidates, key=len))
+    return root + "/" if root else ""
+
+
+class ZipArchive:
+    def __init__(self, filename: str) -> None:
+        import zipfile
+
+        self._zip = zipfile.ZipFile(filename)
+        names = [name for name in self._zip.namelist() if not name.endswith("/")]
+        root = _find_root(names)
+        self._members = {name[len(root) :]: name for name in names if name.startswith(root)}
+
+    def __contains__(self, member: str) -> bool:
+        return member in self._members
+
+    def open(self, member: str) -> IO[bytes]:
+        return self._zip.open(self._members[member])
+
+
+class TarArchive:
+    def __init__(self, filename: str) -> None:
+        import tarfile
+
+        members: Dict[str, bytes] = {}
+        with open(filename, "rb") as raw:
+            if filename.endswith(".tar.zst"):
+                try:
+                    import zstandard
+                except ImportError:
+                    raise ArchiveError("Reading %s requires the zstandard package" % filename)
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+                mode = "r|"
+            else:
+                stream = raw
+                mode = "r|gz"
+            with tarfile.open(fileobj=stream, mode=mode) as tar:
+                for info in tar:
+                    extracted = tar.extractfile(info) if info.isfile() else None
+                    if extracted is not None:
+                        members[info.name] = zlib.compress(extracted.read(), 1)
+
+        root = _find_root(members)
+        self._members = {
+            name[len(root) :]: data for name, data in members.items() if name.startswith(root)
+        }
+
+    def __contains__(self, member: str) -> bool:
+        return member in self._members
+
+    def open(self, member: str) -> IO[bytes]:
+        return io.BytesIO(zlib.decompress(self._members[member]))
+
+
+Archive = Union[ZipArchive, TarArchive]
+
+# Archives by filename, along with the modification time they were read at
+_archives: Dict[str, Tuple[float, Archive]] = {}
+_archives_lock = threading.Lock()
+
+
+def split_path(path: str) -> Optional[Tuple[str, str]]:
+    """Returns the archive and the name of the member within it if path lies inside an archive,
+    or None otherwise."""
+
+    match = _archive_path_re.match(path)
+    if match is None or not os.path.isfile(match.group(1)):
+        return None
+    return match.group(1), (match.group(2) or "").replace("\\", "/")
+
+
+def get_archive(filename: str) -> Archive:
+    import tarfile
+    import zipfile
+
+    mtime = os.path.getmtime(filename)
+    with _archives_lock:
+        try:
+            read_mtime, cached = _archives[filename]
+            if read_mtime == mtime:
+                return cached
+        except KeyError:
+            pass
+
+        archive: Archive
+        try:
+            if filename.endswith(".zip"):
+                archive = ZipArchive(filename)
+            else:
+                archive = TarArchive(filename)
+        except (zipfile.BadZipFile, tarfile.TarError, zlib.error) as e:
+            raise ArchiveError("Cannot read archive %s: %s" % (filename, e))
+        _archives[filename] = (mtime, archive)
+        return archive
+
+
+def open_member(filename: str, member: str) -> IO[bytes]:
+    archive = get_archive(filename)
+    if member not in archive:
+        gzipped = member + ".gz"
+        if gzipped in archive:
+            return gzip.GzipFile(fileobj=archive.open(gzipped))  # type: ignore
+        raise FileNotFoundError("No such file in archive %s: %s" % (filename, member))
+    return archive.open(member)
@@ -0,0 +1,188 @@
+"""
+    breathe.cache
+    ~~~~~~~~~~~~~
+
+    Parses the XML created by Doxygen ahead of the Sphinx build and stores the parsed trees in a
+    cache directory. Parsing is spread over a process pool so that large projects make use of all
+    the available cores.
+
+    A Sphinx build picks the cache up through the ``breathe_parse_cache`` setting and only reads
+    from it. Every entry records the size and digest of the XML file it was parsed from and is
+    ignored if that file has changed since, in which case the file is parsed as usual.
+"""
+
+from breathe import __version__
+from breathe.parser import compound, index
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Increment when the layout of the cache directory changes
+CACHE_VERSION = 1
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def file_digest(data: bytes) -> str:
+    """Returns the digest recorded in the manifest for the contents of an XML file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def entry_filename(name: str) -> str:
+    """Returns the name of the cache entry for the XML file with the given name."""
+    return name + ".pickle"
+
+
+def parse_file(xml_dir: str, name: str, cache_dir: str) -> Tuple[str, int, str]:
+    """Parses one XML file and stores the resulting tree in the cache directory. Returns the name
+    of the file along with the size and digest of its contents."""
+
+    with open(os.path.join(xml_dir, name), "rb") as f:
+        data = f.read()
+    module = index if name == "index.xml" else compound
+    tree = module.parse(io.BytesIO(data))
+    # A build reading the cache at the same time must never see a partially written entry
+    filename = os.path.join(cache_dir, entry_filename(name))
+    temporary = "%s.%d.tmp" % (filename, os.getpid())
+    with open(temporary, "wb") as f:
+        pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, filename)
+    return name, len(data), file_digest(data)
+
+
+def write_json(filename: str, data: Any) -> None:
+    """Writes the data to a JSON file. It is written to a temporary file first so that an
+    interrupted run never leaves a partial file."""
+    temporary = filename + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f, sort_keys=True)
+    os.replace(temporary, filename)
+
+
+def build_cache(xml_dir: str, cache_dir: str, jobs: Optional[int] = None) -> int:
+    """Parses index.xml and all the compound files it lists into the cache directory. Returns the
+    number of files parsed."""
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Remove the manifest first so the cache can't be used while it is being rebuilt
+    manifest_filename = os.path.join(cache_dir, MANIFEST_FILENAME)
+    if os.path.exists(manifest_filename):
+        os.remove(manifest_filename)
+
+    index_tree = index.parse(os.path.join(xml_dir, "index.xml"))
+    names = ["index.xml"]
+    for compound_ in index_tree.get_compound():
+        name = "%s.xml" % compound_.refid
+        if os.path.isfile(os.path.join(xml_dir, name)):
+            names.append(name)
+
+    files: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            parse_file, [xml_dir] * len(names), names, [cache_dir] * len(names), chunksize=16
+        )
+        for name, size, digest in results:
+            files[name] = {"size": size, "digest": digest}
+
+    write_json(
+        manifest_filename, {"version": CACHE_VERSION, "breathe": __version__, "files": files}
+    )
+    return len(names)
+
+
+class ParseCache:
+    """Read-only access to a cache directory written by breathe-cache."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.files: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            with open(os.path.join(cache_dir, MANIFEST_FILENAME)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Trees pickled by another version of breathe may not match the current parser classes
+        if manifest.get("version") == CACHE_VERSION and manifest.get("breathe") == __version__:
+            self.files = manifest["files"]
+
+    def load(self, filename: str):
+        """Returns the cached tree for the XML file, or None if there is no up to date entry."""
+
+        name = os.path.basename(filename)
+        try:
+            entry = self.files[name]
+            if os.path.getsize(filename) != entry["size"]:
+                return None
+            with open(filename, "rb") as f:
+                if file_digest(f.read()) != entry["digest"]:
+                    return None
+            with open(os.path.join(self.cache_dir, entry_filename(name)), "rb") as f:
+                return pickle.load(f)
+        except (KeyError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse and check the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="""\
+Parse the XML created by Doxygen in <rootpath> and store the parsed trees in
+<CACHEDIR> for use by a later Sphinx build, see the breathe_parse_cache setting.""",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        action="store",
+        dest="cachedir",
+        help="Directory to store the cache in",
+        required=True,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        help="number of processes to parse with (default: number of cores)",
+        default=None,
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", dest="quiet", help="suppress informational messages"
+    )
+    parser.add_argument(
+        "--version", action="version", version="Breathe (breathe-cache) %s" % __version__
+    )
+    parser.add_argument("rootpath", type=str, help="The directory contains index.xml")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.rootpath):
+        print("%s is not a directory." % args.rootpath, file=sys.stderr)
+        sys.exit(1)
+    if not os.path.isfile(os.path.join(args.rootpath, "index.xml")):
+        print("%s does not contain a index.xml" % args.rootpath, file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        count = build_cache(args.rootpath, args.cachedir, args.jobs)
+    except (index.ParseError, compound.ParseError, index.FileIOError, compound.FileIOError) as e:
+        print("Cannot parse %s: %s" % (args.rootpath, e), file=sys.stderr)
+        sys.exit(1)
+    if not args.quiet:
+        print("Cached %d files in %s" % (count, args.cachedir))
+
+
+# So program can be started with "python -m breathe.cache ..."
+if __name__ == "__main__":
+    main()
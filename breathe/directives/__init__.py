@@ -1,9 +1,11 @@
-from breathe.finder.factory import FinderFactory
+from breathe import missing_symbols
+from breathe.finder.factory import Finder, FinderFactory
 from breathe.parser import DoxygenParserFactory
 from breathe.parser import FileIOError, ParserError
 from breathe.project import ProjectInfoFactory, ProjectInfo
 from breathe.renderer import format_parser_error, RenderContext
-from breathe.renderer.filter import Filter, FilterFactory
+from breathe.renderer.cache import DeclarationCache, RenderCache
+from breathe.renderer.filter import Filter, FilterFactory, filter_fingerprint
 from breathe.renderer.mask import MaskFactoryBase
 from breathe.renderer.sphinxrenderer import SphinxRenderer
 from breathe.renderer.target import TargetHandler
@@ -16,9 +18,10 @@ from typing import Any, Dict, List, Optional, Sequence
 
 
 class _WarningHandler:
-    def __init__(self, state, context: Dict[str, Any]) -> None:
+    def __init__(self, state, context: Dict[str, Any], log: bool = True) -> None:
         self.state = state
         self.context = context
+        self.log = log
 
     def warn(
         self,
@@ -30,6 +33,8 @@ class _WarningHandler:
         raw_text = self.format(raw_text) + unformatted_suffix
         if rendered_nodes is None:
             rendered_nodes = [nodes.paragraph("", "", nodes.Text(raw_text))]
+        if not self.log:
+            return [nodes.warning("", *rendered_nodes)]
         return [
             nodes.warning("", *rendered_nodes),
             self.state.document.reporter.warning(raw_text, line=self.context["lineno"]),
@@ -40,6 +45,9 @@ class _WarningHandler:
 
 
 class BaseDirective(SphinxDirective):
+    # Set when the target has already been warned about as missing in this build
+    repeated_miss = False
+
     @property
     def directive_args(self) -> list:
         # the order must be the same as in docutils.parsers.rst.Directive.__init__
@@ -63,6 +71,16 @@ class BaseDirective(SphinxDirective):
     def parser_factory(self) -> DoxygenParserFactory:
         return self.env.temp_data["breathe_parser_factory"]
 
+    @property
+    def render_cache(self) -> Optional[RenderCache]:
+        if not self.config.breathe_render_cache:
+            return None
+        return self.env.temp_data.get("breathe_render_cache")
+
+    @property
+    def declaration_cache(self) -> Optional[DeclarationCache]:
+        return self.env.temp_data.get("breathe_declaration_cache")
+
     @property
     def finder_factory(self) -> FinderFactory:
         return FinderFactory(self.env.app, self.parser_factory)
@@ -75,6 +93,47 @@ class BaseDirective(SphinxDirective):
     def kind(self) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Optional[Filter]:
+        """Returns the filter which finds the target of a directive with the given argument, if
+        the target can be found from the compound and member nodes of the index alone.
+
+        These targets are resolved for all the directives in a document at once when the document
+        is read, see breathe.directives.prescan.
+        """
+
+        return None
+
+    def find_matches(
+        self, finder: Finder, project_info: ProjectInfo, finder_filter: Filter
+    ) -> List[Any]:
+        """Returns the node stacks matching the filter, using the ones found when the document was
+        pre-scanned if possible. Targets which weren't found before aren't searched for again."""
+
+        # TODO: find a more specific type for the Doxygen nodes
+        matches: Optional[List[Any]] = None
+        prescanned = self.env.temp_data.get("breathe_prescanned_matches")
+        if prescanned:
+            key = (project_info.project_path(), filter_fingerprint(finder_filter))
+            if key in prescanned:
+                matches = list(prescanned[key])
+
+        missing_key = None
+        if not matches and self.arguments:
+            missing_key = missing_symbols.create_key(
+                self.env.app, project_info, self.name, self.arguments[0]
+            )
+
+        if matches is None:
+            matches = []
+            # Don't search again for a target which wasn't found the last time
+            if not missing_symbols.is_missing(self.env.app, missing_key):
+                finder.filter_(finder_filter, matches)
+
+        if not matches:
+            self.repeated_miss = not missing_symbols.add(self.env.app, missing_key)
+        return matches
+
     def create_warning(self, project_info: Optional[ProjectInfo], **kwargs) -> _WarningHandler:
         if project_info:
             tail = 'in doxygen xml output for project "{project}" from directory: {path}'.format(
@@ -84,7 +143,9 @@ class BaseDirective(SphinxDirective):
             tail = ""
 
         context = dict(lineno=self.lineno, tail=tail, **kwargs)
-        return _WarningHandler(self.state, context)
+        # Leave repeated misses to the summary at the end of the build, see
+        # breathe.missing_symbols
+        return _WarningHandler(self.state, context, log=not self.repeated_miss)
 
     def render(
         self,
@@ -97,6 +158,15 @@ class BaseDirective(SphinxDirective):
     ) -> List[nodes.Node]:
         "Standard render process used by subclasses"
 
+        render_cache = self.render_cache
+        if render_cache is not None:
+            cache_key = render_cache.create_key(
+                project_info, node_stack, self.name, self.options, filter_, self.env.docname
+            )
+            cached = render_cache.get(cache_key, self.state.document)
+            if cached is not None:
+                return cached
+
         try:
             object_renderer = SphinxRenderer(
                 self.parser_factory.app,
@@ -118,4 +188,8 @@ class BaseDirective(SphinxDirective):
             )
 
         context = RenderContext(node_stack, mask_factory, directive_args)
-        return object_renderer.render(node_stack[0], context)
+        result = object_renderer.render(node_stack[0], context)
+
+        if render_cache is not None:
+            render_cache.store(cache_key, result)
+        return result
@@ -1,13 +1,14 @@
 from breathe.directives import BaseDirective
 from breathe.file_state_cache import MTimeError
 from breathe.project import ProjectError
+from breathe.renderer.filter import Filter, FilterFactory
 from breathe.renderer.mask import NullMaskFactory
 from breathe.renderer.target import create_target_handler
 
 from docutils.nodes import Node
 from docutils.parsers.rst.directives import unchanged_required, unchanged, flag
 
-from typing import Any, List
+from typing import List
 
 
 class _DoxygenClassLikeDirective(BaseDirective):
@@ -30,6 +31,10 @@ class _DoxygenClassLikeDirective(BaseDirective):
     }
     has_content = False
 
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Filter:
+        return filter_factory.create_compound_finder_filter(argument, cls.kind)
+
     def run(self) -> List[Node]:
         name = self.arguments[0]
 
@@ -45,11 +50,8 @@ class _DoxygenClassLikeDirective(BaseDirective):
             warning = self.create_warning(None, kind=self.kind)
             return warning.warn("doxygen{kind}: %s" % e)
 
-        finder_filter = self.filter_factory.create_compound_finder_filter(name, self.kind)
-
-        # TODO: find a more specific type for the Doxygen nodes
-        matches: List[Any] = []
-        finder.filter_(finder_filter, matches)
+        finder_filter = self.create_index_filter(self.filter_factory, name)
+        matches = self.find_matches(finder, project_info, finder_filter)
 
         if len(matches) == 0:
             warning = self.create_warning(project_info, name=name, kind=self.kind)
@@ -1,13 +1,15 @@
 from breathe.directives import BaseDirective
+from breathe.directives.sharding import namespace_shards, shard_directory, toctree
 from breathe.file_state_cache import MTimeError
 from breathe.project import ProjectError
-from breathe.renderer import RenderContext
+from breathe.renderer.filter import Filter, FilterFactory
 from breathe.renderer.mask import NullMaskFactory
-from breathe.renderer.sphinxrenderer import SphinxRenderer
 from breathe.renderer.target import create_target_handler
 
+from docutils import nodes
 from docutils.nodes import Node
-from docutils.parsers.rst.directives import unchanged_required, flag
+from docutils.parsers.rst.directives import unchanged, unchanged_required, flag
+from docutils.statemachine import StringList
 
 from typing import Any, List
 
@@ -32,6 +34,10 @@ class _DoxygenContentBlockDirective(BaseDirective):
     }
     has_content = False
 
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Filter:
+        return filter_factory.create_finder_filter(cls.kind, argument)
+
     def run(self) -> List[Node]:
         name = self.arguments[0]
 
@@ -47,17 +53,15 @@ class _DoxygenContentBlockDirective(BaseDirective):
             warning = self.create_warning(None, kind=self.kind)
             return warning.warn("doxygen{kind}: %s" % e)
 
-        finder_filter = self.filter_factory.create_finder_filter(self.kind, name)
-
-        # TODO: find a more specific type for the Doxygen nodes
-        matches: List[Any] = []
-        finder.filter_(finder_filter, matches)
+        finder_filter = self.create_index_filter(self.filter_factory, name)
+        matches = self.find_matches(finder, project_info, finder_filter)
 
         # It shouldn't be possible to have too many matches as namespaces & groups in their nature
         # are merged together if there are multiple declarations, so we only check for no matches
         if not matches:
             warning = self.create_warning(project_info, name=name, kind=self.kind)
             return warning.warn('doxygen{kind}: Cannot find {kind} "{name}" {tail}')
+        compound_matches = matches
 
         if "content-only" in self.options and self.kind != "page":
             # Unpack the single entry in the matches list
@@ -81,26 +85,46 @@ class _DoxygenContentBlockDirective(BaseDirective):
 
         node_list: List[Node] = []
         for node_stack in matches:
-            object_renderer = SphinxRenderer(
-                self.parser_factory.app,
-                project_info,
-                node_stack,
-                self.state,
-                self.state.document,
-                target_handler,
-                self.parser_factory.create_compound_parser(project_info),
-                filter_,
+            mask_factory = NullMaskFactory()
+            node_list.extend(
+                self.render(
+                    node_stack,
+                    project_info,
+                    filter_,
+                    target_handler,
+                    mask_factory,
+                    self.directive_args,
+                )
             )
 
-            mask_factory = NullMaskFactory()
-            context = RenderContext(node_stack, mask_factory, self.directive_args)
-            node_list.extend(object_renderer.render(context.node_stack[0], context))
+        if "sharded" in self.options:
+            node_list.extend(self.shard_toctree(project_info, compound_matches))
 
         return node_list
 
+    def shard_toctree(self, project_info, matches) -> List[Node]:
+        """Links the documents generated for the inner compounds of a sharded namespace."""
+
+        index_root = self.parser_factory.create_index_parser().parse(project_info)
+        kinds = {compound.refid: compound.kind for compound in index_root.compound}
+        compound_parser = self.parser_factory.create_compound_parser(project_info)
+        shards = []
+        for node_stack in matches:
+            compounddef = compound_parser.parse(node_stack[0].refid).compounddef
+            shards.extend(namespace_shards(compounddef, kinds))
+        if not shards:
+            return []
+
+        directory = shard_directory(self.env.docname, self.options["sharded"])
+        node = nodes.container()
+        self.state.nested_parse(StringList(toctree(directory, shards).splitlines()), 0, node)
+        return node.children
+
 
 class DoxygenNamespaceDirective(_DoxygenContentBlockDirective):
     kind = "namespace"
+    option_spec = _DoxygenContentBlockDirective.option_spec.copy()
+    option_spec.update({"sharded": unchanged})
 
 
 class DoxygenGroupDirective(_DoxygenContentBlockDirective):
@@ -2,8 +2,6 @@ from ..renderer.mask import NullMaskFactory
 from ..directives import BaseDirective
 from ..project import ProjectError
 
-from breathe.renderer import RenderContext
-from breathe.renderer.sphinxrenderer import SphinxRenderer
 from breathe.renderer.target import create_target_handler
 
 from docutils.parsers.rst.directives import unchanged_required, flag
@@ -37,20 +35,17 @@ class _BaseFileDirective(BaseDirective):
 
         node_list = []
         for node_stack in matches:
-            object_renderer = SphinxRenderer(
-                self.parser_factory.app,
-                project_info,
-                node_stack,
-                self.state,
-                self.state.document,
-                target_handler,
-                self.parser_factory.create_compound_parser(project_info),
-                filter_,
-            )
-
             mask_factory = NullMaskFactory()
-            context = RenderContext(node_stack, mask_factory, self.directive_args)
-            node_list.extend(object_renderer.render(node_stack[0], context))
+            node_list.extend(
+                self.render(
+                    node_stack,
+                    project_info,
+                    filter_,
+                    target_handler,
+                    mask_factory,
+                    self.directive_args,
+                )
+            )
 
         return node_list
 
@@ -4,6 +4,7 @@ from breathe.file_state_cache import MTimeError
 from breathe.parser import ParserError, FileIOError
 from breathe.project import ProjectError
 from breathe.renderer import format_parser_error, RenderContext
+from breathe.renderer.filter import Filter, FilterFactory
 from breathe.renderer.sphinxrenderer import WithContext
 from breathe.renderer.mask import MaskFactory, NullMaskFactory, NoParameterNamesMask
 from breathe.renderer.sphinxrenderer import SphinxRenderer
@@ -18,7 +19,7 @@ from docutils import nodes
 
 import re
 
-from typing import Any, List, Optional
+from typing import List, Optional, Tuple
 
 
 class _NoMatchingFunctionError(BreatheError):
@@ -41,7 +42,8 @@ class DoxygenFunctionDirective(BaseDirective):
     has_content = False
     final_argument_whitespace = True
 
-    def run(self) -> List[Node]:
+    @staticmethod
+    def split_name(argument: str) -> Tuple[str, str, str]:
         # Extract namespace, function name, and parameters
         # Regex explanation:
         # 1. (?:<something>::)?
@@ -58,11 +60,20 @@ class DoxygenFunctionDirective(BaseDirective):
         # Note: for template argument lists, the spacing is important for the Doxygen lookup.
         # TODO: we should really do this parsing differently, e.g., using the Sphinx C++ domain.
         # TODO: the Doxygen lookup should not be whitespace sensitive.
-        match = re.match(r"(?:([^:(<]+(?:::[^:(<]+)*)::)?([^(]+)(.*)", self.arguments[0])
+        match = re.match(r"(?:([^:(<]+(?:::[^:(<]+)*)::)?([^(]+)(.*)", argument)
         assert match is not None  # TODO: this is probably not appropriate, for now it fixes typing
         namespace = (match.group(1) or "").strip()
         function_name = match.group(2).strip()
         argsStr = match.group(3)
+        return namespace, function_name, argsStr
+
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Filter:
+        namespace, function_name, _ = cls.split_name(argument)
+        return filter_factory.create_function_and_all_friend_finder_filter(namespace, function_name)
+
+    def run(self) -> List[Node]:
+        namespace, function_name, argsStr = self.split_name(self.arguments[0])
 
         try:
             project_info = self.project_info_factory.create_project_info(self.options)
@@ -92,13 +103,8 @@ class DoxygenFunctionDirective(BaseDirective):
                 "Could not parse arguments. Parsing eror is\n{cpperror}"
             )
 
-        finder_filter = self.filter_factory.create_function_and_all_friend_finder_filter(
-            namespace, function_name
-        )
-
-        # TODO: find a more specific type for the Doxygen nodes
-        matchesAll: List[Any] = []
-        finder.filter_(finder_filter, matchesAll)
+        finder_filter = self.create_index_filter(self.filter_factory, self.arguments[0])
+        matchesAll = self.find_matches(finder, project_info, finder_filter)
         matches = []
         for m in matchesAll:
             # only take functions and friend functions
@@ -163,6 +169,14 @@ class DoxygenFunctionDirective(BaseDirective):
         if function_description == "":
             return None
 
+        # The signatures of the candidates are parsed again for every overloaded function
+        cache = self.declaration_cache
+        key = (cpp.DefinitionParser, "parameters", function_description)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
         parser = cpp.DefinitionParser(
             function_description, location=self.get_source_info(), config=self.config
         )
@@ -199,6 +213,8 @@ class DoxygenFunctionDirective(BaseDirective):
                 stripDeclarator(declarator)
 
         stripParamQual(paramQual)
+        if cache is not None:
+            cache.store(key, paramQual)
         return paramQual
 
     def _create_function_signature(
@@ -235,15 +251,23 @@ class DoxygenFunctionDirective(BaseDirective):
             declaration = " ".join(
                 [
                     object_renderer.create_template_prefix(node),
-                    "".join(n.astext() for n in object_renderer.render(node.get_type())),
+                    object_renderer.text(node.get_type()),
                     name,
                     node.get_argsstring(),
                 ]
             )
-        parser = cpp.DefinitionParser(
-            declaration, location=self.get_source_info(), config=self.config
-        )
-        ast = parser.parse_declaration("function", "function")
+        # Shares the entries of the C++ function directives, see BaseObject.parse_definition
+        cache = self.declaration_cache
+        key = (cpp.DefinitionParser, "function", "function", declaration)
+        ast = cache.get(key) if cache is not None else None
+        if ast is None:
+            parser = cpp.DefinitionParser(
+                declaration, location=self.get_source_info(), config=self.config
+            )
+            ast = parser.parse_declaration("function", "function")
+            parser.skip_ws()
+            if cache is not None and parser.eof:
+                cache.store(key, ast)
         return str(ast)
 
     def _resolve_function(self, matches, args: Optional[cpp.ASTParametersQualifiers], project_info):
@@ -1,4 +1,5 @@
 from breathe.directives import BaseDirective
+from breathe.directives.sharding import index_shards, shard_directory, toctree
 from breathe.parser import ParserError, FileIOError
 from breathe.project import ProjectError
 from breathe.renderer import format_parser_error, RenderContext
@@ -6,8 +7,12 @@ from breathe.renderer.mask import NullMaskFactory
 from breathe.renderer.sphinxrenderer import SphinxRenderer
 from breathe.renderer.target import create_target_handler
 
+from docutils import nodes
 from docutils.nodes import Node
-from docutils.parsers.rst.directives import unchanged_required, flag
+from docutils.parsers.rst.directives import unchanged, unchanged_required, flag
+from docutils.statemachine import StringList
+
+import copy
 
 from typing import List
 
@@ -35,6 +40,20 @@ class _BaseIndexDirective(BaseDirective):
 
         data_object = finder.root()
 
+        if "sharded" in self.options:
+            # The compounds are rendered in the generated documents instead
+            directory = shard_directory(self.env.docname, self.options["sharded"])
+            node = nodes.container()
+            text = toctree(directory, index_shards(data_object))
+            self.state.nested_parse(StringList(text.splitlines()), 0, node)
+            return node.children
+
+        if "compound" in self.options:
+            # Render a single compound of the index, as in the documents generated for the shards
+            refid = self.options["compound"]
+            data_object = copy.copy(data_object)
+            data_object.compound = [c for c in data_object.compound if c.refid == refid]
+
         target_handler = create_target_handler(self.options, project_info, self.state.document)
         filter_ = self.filter_factory.create_index_filter(self.options)
 
@@ -73,6 +92,8 @@ class DoxygenIndexDirective(_BaseIndexDirective):
         "outline": flag,
         "no-link": flag,
         "allow-dot-graphs": flag,
+        "sharded": unchanged,
+        "compound": unchanged_required,
     }
     has_content = False
 
@@ -1,7 +1,7 @@
 from breathe.directives import BaseDirective
 from breathe.file_state_cache import MTimeError
 from breathe.project import ProjectError
-from breathe.renderer.filter import Filter
+from breathe.renderer.filter import Filter, FilterFactory
 from breathe.renderer.mask import NullMaskFactory
 from breathe.renderer.target import create_target_handler
 
@@ -9,7 +9,7 @@ from docutils.nodes import Node
 
 from docutils.parsers.rst.directives import unchanged_required, flag
 
-from typing import Any, List
+from typing import List, Optional, Tuple
 
 
 class _DoxygenBaseItemDirective(BaseDirective):
@@ -23,16 +23,28 @@ class _DoxygenBaseItemDirective(BaseDirective):
     }
     has_content = False
 
-    def create_finder_filter(self, namespace: str, name: str) -> Filter:
+    @classmethod
+    def create_finder_filter(
+        cls, filter_factory: FilterFactory, namespace: str, name: str
+    ) -> Filter:
         """Creates a filter to find the node corresponding to this item."""
 
-        return self.filter_factory.create_member_finder_filter(namespace, name, self.kind)
+        return filter_factory.create_member_finder_filter(namespace, name, cls.kind)
 
-    def run(self) -> List[Node]:
+    @staticmethod
+    def split_name(argument: str) -> Tuple[str, str]:
         try:
-            namespace, name = self.arguments[0].rsplit("::", 1)
+            namespace, name = argument.rsplit("::", 1)
         except ValueError:
-            namespace, name = "", self.arguments[0]
+            namespace, name = "", argument
+        return namespace, name
+
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Optional[Filter]:
+        return cls.create_finder_filter(filter_factory, *cls.split_name(argument))
+
+    def run(self) -> List[Node]:
+        namespace, name = self.split_name(self.arguments[0])
 
         try:
             project_info = self.project_info_factory.create_project_info(self.options)
@@ -46,11 +58,8 @@ class _DoxygenBaseItemDirective(BaseDirective):
             warning = self.create_warning(None, kind=self.kind)
             return warning.warn("doxygen{kind}: %s" % e)
 
-        finder_filter = self.create_finder_filter(namespace, name)
-
-        # TODO: find a more specific type for the Doxygen nodes
-        matches: List[Any] = []
-        finder.filter_(finder_filter, matches)
+        finder_filter = self.create_finder_filter(self.filter_factory, namespace, name)
+        matches = self.find_matches(finder, project_info, finder_filter)
 
         if len(matches) == 0:
             display_name = "%s::%s" % (namespace, name) if namespace else name
@@ -78,13 +87,16 @@ class DoxygenDefineDirective(_DoxygenBaseItemDirective):
 class DoxygenConceptDirective(_DoxygenBaseItemDirective):
     kind = "concept"
 
-    def create_finder_filter(self, namespace: str, name: str) -> Filter:
+    @classmethod
+    def create_finder_filter(
+        cls, filter_factory: FilterFactory, namespace: str, name: str
+    ) -> Filter:
         # Unions are stored in the xml file with their fully namespaced name
         # We're using C++ namespaces here, it might be best to make this file
         # type dependent
         #
         xml_name = "%s::%s" % (namespace, name) if namespace else name
-        return self.filter_factory.create_compound_finder_filter(xml_name, "concept")
+        return filter_factory.create_compound_finder_filter(xml_name, "concept")
 
 
 class DoxygenEnumDirective(_DoxygenBaseItemDirective):
@@ -94,8 +106,16 @@ class DoxygenEnumDirective(_DoxygenBaseItemDirective):
 class DoxygenEnumValueDirective(_DoxygenBaseItemDirective):
     kind = "enumvalue"
 
-    def create_finder_filter(self, namespace: str, name: str) -> Filter:
-        return self.filter_factory.create_enumvalue_finder_filter(name)
+    @classmethod
+    def create_finder_filter(
+        cls, filter_factory: FilterFactory, namespace: str, name: str
+    ) -> Filter:
+        return filter_factory.create_enumvalue_finder_filter(name)
+
+    @classmethod
+    def create_index_filter(cls, filter_factory: FilterFactory, argument: str) -> Optional[Filter]:
+        # Enum values are only found in the compound files
+        return None
 
 
 class DoxygenTypedefDirective(_DoxygenBaseItemDirective):
@@ -105,10 +125,13 @@ class DoxygenTypedefDirective(_DoxygenBaseItemDirective):
 class DoxygenUnionDirective(_DoxygenBaseItemDirective):
     kind = "union"
 
-    def create_finder_filter(self, namespace: str, name: str) -> Filter:
+    @classmethod
+    def create_finder_filter(
+        cls, filter_factory: FilterFactory, namespace: str, name: str
+    ) -> Filter:
         # Unions are stored in the xml file with their fully namespaced name
         # We're using C++ namespaces here, it might be best to make this file
         # type dependent
         #
         xml_name = "%s::%s" % (namespace, name) if namespace else name
-        return self.filter_factory.create_compound_finder_filter(xml_name, "union")
+        return filter_factory.create_compound_finder_filter(xml_name, "union")
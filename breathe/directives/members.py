@@ -0,0 +1,137 @@
+"""
+Documenting a list of members with a single directive.
+
+Reference pages often consist of long runs of doxygenfunction, doxygenvariable, etc. directives,
+each of which looks up its own target. The doxygenmembers directive takes a list of members
+instead and looks them all up together: the targets which can be found from the index are
+resolved in a single walk over the index, and any others, e.g., enum values, in a single walk
+over the compound files. The members are then rendered in the given order by the directives for
+their kinds, which pick up the matches found here.
+"""
+
+from breathe.directives import BaseDirective
+from breathe.directives.function import DoxygenFunctionDirective
+from breathe.directives.item import (
+    DoxygenDefineDirective,
+    DoxygenEnumDirective,
+    DoxygenEnumValueDirective,
+    DoxygenTypedefDirective,
+    DoxygenVariableDirective,
+)
+from breathe.file_state_cache import MTimeError
+from breathe.parser import FileIOError, ParserError
+from breathe.project import ProjectError
+from breathe.renderer.filter import Filter, filter_fingerprint
+
+from docutils.nodes import Node
+from docutils.parsers.rst.directives import unchanged_required, flag
+from docutils.statemachine import StringList
+
+from typing import Dict, Hashable, List, Tuple, Type
+
+# The directives for the kinds of members which can be listed
+MEMBER_DIRECTIVES: Dict[str, Type[BaseDirective]] = {
+    "function": DoxygenFunctionDirective,
+    "variable": DoxygenVariableDirective,
+    "define": DoxygenDefineDirective,
+    "enum": DoxygenEnumDirective,
+    "enumvalue": DoxygenEnumValueDirective,
+    "typedef": DoxygenTypedefDirective,
+}
+
+
+def parse_entries(lines: List[str]) -> List[Tuple[str, str]]:
+    """Returns the kind and name of each non-empty "<kind> <name>" line."""
+
+    entries = []
+    for line in lines:
+        fields = line.split(None, 1)
+        if fields:
+            entries.append((fields[0], fields[1].strip() if len(fields) > 1 else ""))
+    return entries
+
+
+class DoxygenMembersDirective(BaseDirective):
+    required_arguments = 0
+    option_spec = {
+        "path": unchanged_required,
+        "project": unchanged_required,
+        "outline": flag,
+        "no-link": flag,
+    }
+    has_content = True
+    kind = "members"
+
+    def run(self) -> List[Node]:
+        try:
+            project_info = self.project_info_factory.create_project_info(self.options)
+        except ProjectError as e:
+            warning = self.create_warning(None)
+            return warning.warn("doxygenmembers: %s" % e)
+
+        try:
+            finder = self.finder_factory.create_finder(project_info)
+        except MTimeError as e:
+            warning = self.create_warning(None)
+            return warning.warn("doxygenmembers: %s" % e)
+
+        # The filters of all the members, split into those which only need the index and others
+        index_filters: Dict[Hashable, Filter] = {}
+        other_filters: Dict[Hashable, Filter] = {}
+        entries = parse_entries(list(self.content))
+        for kind, name in entries:
+            directive = MEMBER_DIRECTIVES.get(kind)
+            if directive is None or not name:
+                continue
+            finder_filter = directive.create_index_filter(self.filter_factory, name)
+            if finder_filter is not None:
+                index_filters.setdefault(filter_fingerprint(finder_filter), finder_filter)
+            else:
+                finder_filter = directive.create_finder_filter(  # type: ignore
+                    self.filter_factory, *directive.split_name(name)  # type: ignore
+                )
+                other_filters.setdefault(filter_fingerprint(finder_filter), finder_filter)
+
+        # The directives find their matches in the same place as the ones of a pre-scan
+        prescanned = self.env.temp_data.setdefault("breathe_prescanned_matches", {})
+        project_path = project_info.project_path()
+        try:
+            for filters, find in (
+                (index_filters, finder.filter_index_),
+                (other_filters, finder.filter_all_),
+            ):
+                if not filters:
+                    continue
+                for fingerprint, filter_matches in zip(filters, find(list(filters.values()))):
+                    prescanned[(project_path, fingerprint)] = filter_matches
+        except (ParserError, FileIOError) as e:
+            warning = self.create_warning(project_info)
+            return warning.warn("doxygenmembers: %s" % e)
+
+        result: List[Node] = []
+        for kind, name in entries:
+            directive = MEMBER_DIRECTIVES.get(kind)
+            if directive is None or not name:
+                warning = self.create_warning(
+                    None, kinds=", ".join(MEMBER_DIRECTIVES), entry=" ".join((kind, name)).strip()
+                )
+                result.extend(
+                    warning.warn(
+                        'doxygenmembers: Expected "<kind> <name>" with one of the kinds {kinds}, '
+                        'got "{entry}"'
+                    )
+                )
+                continue
+            member_directive = directive(
+                "doxygen" + kind,
+                [name],
+                self.options,
+                StringList(),
+                self.lineno,
+                self.content_offset,
+                self.block_text,
+                self.state,
+                self.state_machine,
+            )
+            result.extend(member_directive.run())
+        return result
@@ -0,0 +1,114 @@
+"""
+Pre-scanning documents for the targets of their directives.
+
+Each directive normally searches the index for its own target, which means a walk over the whole
+index, and every compound file it references, per directive. When a document is read, its source
+is scanned for Breathe directives up front instead, and all the targets which can be found from
+the index alone are resolved together in a single walk per project. The directives then pick up
+their matches by the fingerprint of their finder filter and only fall back to searching
+themselves if the scan missed them, e.g., because they come from an included file. Targets which
+are known to be missing are left out.
+"""
+
+from breathe import missing_symbols
+from breathe.directives import BaseDirective
+from breathe.file_state_cache import MTimeError
+from breathe.finder.factory import FinderFactory
+from breathe.parser import DoxygenParserFactory, FileIOError, ParserError
+from breathe.project import ProjectError, ProjectInfo, ProjectInfoFactory
+from breathe.renderer.filter import Filter, FilterFactory, filter_fingerprint
+
+from sphinx.application import Sphinx
+
+import re
+
+from typing import Any, Dict, Hashable, List, Tuple, Type
+
+_directive_re = re.compile(r"^(\s*)\.\.\s+(doxygen\w+)::\s*(.*?)\s*$")
+_option_re = re.compile(r"^(\s+):([\w-]+):\s*(.*?)\s*$")
+_literal_directive_re = re.compile(r"^\s*\.\.\s+(code-block|code|sourcecode|parsed-literal|raw)::")
+_any_directive_re = re.compile(r"^\s*\.\.\s+[\w:-]+::")
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def scan_directives(source: str) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Returns the name, argument and options of the Breathe directives in the source. Lines in
+    literal blocks and code blocks, e.g., examples of how to use the directives, are skipped."""
+
+    directives = []
+    lines = source.splitlines()
+    # The indentation of the line which started the literal block the scan is in, if any
+    literal_indent = None
+    for number, line in enumerate(lines):
+        if not line.strip():
+            continue
+        if literal_indent is not None:
+            if _indent(line) > literal_indent:
+                continue
+            literal_indent = None
+
+        match = _directive_re.match(line)
+        if match is None:
+            # A paragraph ending in "::" is followed by a literal block
+            if _literal_directive_re.match(line) or (
+                line.rstrip().endswith("::") and not _any_directive_re.match(line)
+            ):
+                literal_indent = _indent(line)
+            continue
+
+        indent, name, argument = match.groups()
+        options = {}
+        for option_line in lines[number + 1 :]:
+            option = _option_re.match(option_line)
+            if option is None or len(option.group(1)) <= len(indent):
+                break
+            options[option.group(2)] = option.group(3)
+        directives.append((name, argument, options))
+    return directives
+
+
+def prescan(
+    app: Sphinx,
+    source: str,
+    directives: Dict[str, Type[BaseDirective]],
+    project_info_factory: ProjectInfoFactory,
+    parser_factory: DoxygenParserFactory,
+) -> Dict[Tuple[str, Hashable], List[Any]]:
+    """Returns the matches for the directives in the source, keyed by project path and the
+    fingerprint of the finder filter."""
+
+    filter_factory = FilterFactory(app)
+    projects: Dict[str, Tuple[ProjectInfo, Dict[Hashable, Filter]]] = {}
+    for name, argument, options in scan_directives(source):
+        directive = directives.get(name)
+        if directive is None or not argument:
+            continue
+        finder_filter = directive.create_index_filter(filter_factory, argument)
+        if finder_filter is None:
+            continue
+        try:
+            project_info = project_info_factory.create_project_info(options)
+        except ProjectError:
+            continue
+        if missing_symbols.is_missing(
+            app, missing_symbols.create_key(app, project_info, name, argument)
+        ):
+            continue
+        _, filters = projects.setdefault(project_info.project_path(), (project_info, {}))
+        filters.setdefault(filter_fingerprint(finder_filter), finder_filter)
+
+    finder_factory = FinderFactory(app, parser_factory)
+    result: Dict[Tuple[str, Hashable], List[Any]] = {}
+    for project_path, (project_info, filters) in projects.items():
+        try:
+            finder = finder_factory.create_finder(project_info)
+            matches = finder.filter_index_(list(filters.values()))
+        except (MTimeError, ParserError, FileIOError):
+            # Leave it to the directives to report these
+            continue
+        for fingerprint, filter_matches in zip(filters, matches):
+            result[(project_path, fingerprint)] = filter_matches
+    return result
@@ -20,15 +20,26 @@ from breathe.directives.item import (
     DoxygenEnumValueDirective,
     DoxygenTypedefDirective,
 )
+from breathe.directives.members import DoxygenMembersDirective
+from breathe.directives.prescan import prescan
+from breathe.directives.sharding import ShardGenerator
 from breathe.parser import DoxygenParserFactory
 from breathe.project import ProjectInfoFactory
 from breathe.process import AutoDoxygenProcessHandle
+from breathe.renderer.cache import DeclarationCache, ParsedRstCache, RenderCache
+from breathe.renderer.graph import DotCache
+from breathe.renderer.text import TextCache
 
 from sphinx.application import Sphinx
+from sphinx.util import logging
 
 import os
 import subprocess
 
+from typing import List
+
+logger = logging.getLogger(__name__)
+
 
 def setup(app: Sphinx) -> None:
     directives = {
@@ -39,6 +50,7 @@ def setup(app: Sphinx) -> None:
         "doxygenclass": DoxygenClassDirective,
         "doxygeninterface": DoxygenInterfaceDirective,
         "doxygenvariable": DoxygenVariableDirective,
+        "doxygenmembers": DoxygenMembersDirective,
         "doxygendefine": DoxygenDefineDirective,
         "doxygenconcept": DoxygenConceptDirective,
         "doxygenenum": DoxygenEnumDirective,
@@ -60,15 +72,65 @@ def setup(app: Sphinx) -> None:
     # TODO: is that actually safe for when reading in parallel?
     project_info_factory = ProjectInfoFactory(app)
     parser_factory = DoxygenParserFactory(app)
+    render_cache = RenderCache()
+    rst_cache = ParsedRstCache()
+    dot_cache = DotCache()
+    declaration_cache = DeclarationCache()
+    text_cache = TextCache()
 
     def set_temp_data(
-        app: Sphinx, project_info_factory=project_info_factory, parser_factory=parser_factory
+        app: Sphinx,
+        project_info_factory=project_info_factory,
+        parser_factory=parser_factory,
+        render_cache=render_cache,
+        rst_cache=rst_cache,
+        dot_cache=dot_cache,
+        declaration_cache=declaration_cache,
+        text_cache=text_cache,
     ):
         assert app.env is not None
         app.env.temp_data["breathe_project_info_factory"] = project_info_factory
         app.env.temp_data["breathe_parser_factory"] = parser_factory
+        app.env.temp_data["breathe_render_cache"] = render_cache
+        app.env.temp_data["breathe_rst_cache"] = rst_cache
+        app.env.temp_data["breathe_dot_cache"] = dot_cache
+        app.env.temp_data["breathe_declaration_cache"] = declaration_cache
+        app.env.temp_data["breathe_text_cache"] = text_cache
+
+    def clear_caches(app: Sphinx, env, docnames) -> None:
+        # The rendered nodes depend on the xml which may have changed since the last read
+        render_cache.clear()
+        rst_cache.clear()
+        dot_cache.clear()
+        declaration_cache.clear()
+        text_cache.clear()
+
+    def report_cache_statistics(app: Sphinx, exception) -> None:
+        for name, cache in (("embedded reST", rst_cache), ("declaration", declaration_cache)):
+            lookups = cache.hits + cache.misses
+            if lookups:
+                logger.info(
+                    "breathe: %s cache: %d hits, %d misses (%.0f%% hit rate)",
+                    name,
+                    cache.hits,
+                    cache.misses,
+                    100.0 * cache.hits / lookups,
+                )
 
-    app.connect("source-read", lambda app, docname, source: set_temp_data(app))
+    def prescan_source(app: Sphinx, docname: str, source: List[str]) -> None:
+        set_temp_data(app)
+        if not app.config.breathe_prescan:
+            return
+        # Resolve the targets of all the directives in the document together
+        assert app.env is not None
+        app.env.temp_data["breathe_prescanned_matches"] = prescan(
+            app, source[0], directives, project_info_factory, parser_factory
+        )
+
+    app.connect("source-read", prescan_source)
+    app.connect("env-before-read-docs", clear_caches)
+    app.connect("build-finished", report_cache_statistics)
+    app.connect("build-finished", lambda app, exception: parser_factory.prefetcher.shutdown())
 
     for name, directive in directives.items():
         app.add_directive(name, directive)
@@ -92,6 +154,13 @@ def setup(app: Sphinx) -> None:
     app.add_config_value("breathe_use_project_refids", False, "env")
     app.add_config_value("breathe_order_parameters_first", False, "env")
     app.add_config_value("breathe_separate_member_pages", False, "env")
+    app.add_config_value("breathe_render_cache", False, "")
+    app.add_config_value("breathe_graph_max_nodes", 0, "env")
+    app.add_config_value("breathe_graph_max_depth", 0, "env")
+    app.add_config_value("breathe_prefetch_workers", 0, "")
+    app.add_config_value("breathe_parse_cache", {}, "")  # Dict[str, str]
+    app.add_config_value("breathe_member_index", False, "")
+    app.add_config_value("breathe_prescan", True, "")
 
     breathe_css = "breathe.css"
     if os.path.exists(os.path.join(app.confdir, "_static", breathe_css)):
@@ -118,3 +187,6 @@ def setup(app: Sphinx) -> None:
         )
 
     app.connect("builder-inited", doxygen_hook)
+
+    shard_generator = ShardGenerator(app, directives, project_info_factory, parser_factory)
+    app.connect("builder-inited", lambda app: shard_generator.generate())
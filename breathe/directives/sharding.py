@@ -0,0 +1,265 @@
+"""
+Sharded output for doxygenindex and doxygennamespace.
+
+Rendering a whole project or a large namespace into a single document makes that document
+dominate the read phase. It can't be split between parallel readers and its doctree has to be
+pickled and read back in one piece.
+
+With the ``:sharded:`` option, the compounds are instead rendered into documents of their own.
+These are generated into a directory next to the document before the sources are read, only
+rewritten when their contents change, and linked from the original document with a toctree.
+
+Each shard depends on the Doxygen XML of its own compound and on index.xml, through which its
+compound is found. Doxygen writes all its files again on every run, so after running it all the
+shards are read again, but they can be read in parallel. Only rebuilds without running Doxygen
+again, e.g., after editing the documentation, leave the shards alone.
+
+Before the sources are read, the documents which may contain sharded directives are read to
+generate their shards. To keep this cheap for large projects, only the documents which contained
+the option in the last build and those which were added or modified since are read. The others
+are only looked at for their modified time.
+"""
+
+from breathe import file_state_cache
+from breathe.directives import BaseDirective
+from breathe.directives.prescan import scan_directives
+from breathe.file_state_cache import MTimeError
+from breathe.parser import DoxygenParserFactory, FileIOError, ParserError
+from breathe.project import ProjectError, ProjectInfo, ProjectInfoFactory
+
+from sphinx.application import Sphinx
+from sphinx.util import logging
+
+import os
+import posixpath
+import re
+
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# The first line of every generated document, so that stale shards can be told apart from
+# documents written by hand
+MARKER = ".. This document was generated by Breathe from a :sharded: directive, do not edit."
+
+# The directives for the compounds of a sharded namespace
+NAMESPACE_SHARD_DIRECTIVES = {
+    "class": "doxygenclass",
+    "struct": "doxygenstruct",
+    "union": "doxygenunion",
+    "interface": "doxygeninterface",
+    "namespace": "doxygennamespace",
+}
+
+# The refid, kind and name of a compound with a document of its own
+Shard = Tuple[str, str, str]
+
+_rst_special_re = re.compile(r"([\\*`_|])")
+
+
+def shard_directory(docname: str, value: str) -> str:
+    """Returns the directory, relative to the source directory, for the shards of a directive in
+    the document with the given value of the :sharded: option."""
+
+    directory = value or "%s_shards" % posixpath.basename(docname)
+    return posixpath.normpath(posixpath.join(posixpath.dirname(docname), directory))
+
+
+def index_shards(index_root) -> List[Shard]:
+    return [
+        (compound.refid, compound.kind, compound.get_name()) for compound in index_root.compound
+    ]
+
+
+def namespace_shards(compounddef, kinds: Dict[str, str]) -> List[Shard]:
+    """Returns the inner classes and namespaces of a namespace, kinds maps refids to the kinds of
+    the compounds in the index."""
+
+    return [
+        (ref.refid, kinds.get(ref.refid, "class"), ref.content_[0].getValue())
+        for ref in list(compounddef.innerclass) + list(compounddef.innernamespace)
+    ]
+
+
+def toctree(directory: str, shards: List[Shard]) -> str:
+    lines = [".. toctree::", "   :maxdepth: 1", ""]
+    lines.extend("   /%s/%s" % (directory, refid) for refid, _, _ in shards)
+    return "\n".join(lines) + "\n"
+
+
+def _title(kind: str, name: str) -> str:
+    title = "%s %s" % (kind.capitalize(), _rst_special_re.sub(r"\\\1", name))
+    return "%s\n%s\n" % (title, "=" * len(title))
+
+
+def _directive(name: str, argument: str, options: Dict[str, str]) -> str:
+    lines = [(".. %s:: %s" % (name, argument)).rstrip()]
+    lines.extend(("   :%s: %s" % item).rstrip() for item in options.items())
+    return "\n".join(lines) + "\n"
+
+
+class ShardGenerator:
+    """Writes the documents for the sharded directives found in the sources."""
+
+    def __init__(
+        self,
+        app: Sphinx,
+        directives: Dict[str, Type[BaseDirective]],
+        project_info_factory: ProjectInfoFactory,
+        parser_factory: DoxygenParserFactory,
+    ) -> None:
+        self.app = app
+        self.directives = directives
+        self.project_info_factory = project_info_factory
+        self.parser_factory = parser_factory
+        # The documents generated in each shard directory
+        self.generated: Dict[str, Set[str]] = {}
+
+    def generate(self) -> None:
+        env = self.app.env
+        assert env is not None
+        # The sources haven't been looked for yet when the builder is initialised
+        env.find_files(self.app.config, self.app.builder)
+
+        # The modified times of the documents when they were last looked at, and the documents
+        # which contained the option then
+        scanned: Dict[str, float] = getattr(env, "breathe_shard_scanned", {})
+        sharded: Set[str] = getattr(env, "breathe_sharded_docnames", set())
+
+        queue: List[Tuple[str, str]] = []
+        env.breathe_shard_scanned = {}  # type: ignore
+        env.breathe_sharded_docnames = set()  # type: ignore
+        for docname in sorted(env.found_docs):
+            mtime = self._getmtime(env.doc2path(docname))
+            if mtime is None:
+                continue
+            env.breathe_shard_scanned[docname] = mtime  # type: ignore
+            if docname not in sharded and scanned.get(docname) == mtime:
+                continue
+            try:
+                with open(env.doc2path(docname), encoding=self.app.config.source_encoding) as f:
+                    source = f.read()
+            except OSError:
+                continue
+            if "sharded" in source and not source.startswith(MARKER):
+                env.breathe_sharded_docnames.add(docname)  # type: ignore
+                queue.append((docname, source))
+
+        # The documents which use the files read here record them when they are read
+        with file_state_cache.untracked(self.app):
+            self._generate(queue)
+        self.remove_stale()
+
+    @staticmethod
+    def _getmtime(filename: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(filename)
+        except OSError:
+            return None
+
+    def _generate(self, queue: List[Tuple[str, str]]) -> None:
+        # Sharded namespaces can contain sharded namespaces, whose documents are generated here
+        while queue:
+            docname, source = queue.pop()
+            for name, argument, options in scan_directives(source):
+                if "sharded" not in options:
+                    continue
+                try:
+                    project_info = self.project_info_factory.create_project_info(options)
+                    if name == "doxygenindex":
+                        self.generate_index(docname, options, project_info)
+                    elif name == "doxygennamespace" and argument:
+                        queue.extend(
+                            self.generate_namespace(docname, argument, options, project_info)
+                        )
+                except (ProjectError, ParserError, FileIOError, MTimeError) as e:
+                    # The directive reports the problem when the document is read
+                    logger.debug("breathe: not generating shards for %s: %s", docname, e)
+
+    def generate_index(self, docname: str, options: Dict[str, str], project_info: ProjectInfo):
+        directory = shard_directory(docname, options["sharded"])
+        shard_options = {key: value for key, value in options.items() if key != "sharded"}
+        index_root = self.parser_factory.create_index_parser().parse(project_info)
+        for refid, kind, name in index_shards(index_root):
+            text = (
+                _title(kind, name)
+                + "\n"
+                + _directive("doxygenindex", "", dict(shard_options, compound=refid))
+            )
+            self.write(directory, refid, docname, text)
+
+    def generate_namespace(
+        self, docname: str, argument: str, options: Dict[str, str], project_info: ProjectInfo
+    ) -> List[Tuple[str, str]]:
+        """Writes the documents for the compounds in the namespace and returns the ones which are
+        sharded namespaces themselves."""
+
+        directory = shard_directory(docname, options["sharded"])
+        index_root = self.parser_factory.create_index_parser().parse(project_info)
+        kinds = {compound.refid: compound.kind for compound in index_root.compound}
+        compound_parser = self.parser_factory.create_compound_parser(project_info)
+
+        nested = []
+        for compound in index_root.compound:
+            if compound.kind != "namespace" or compound.get_name() != argument:
+                continue
+            compounddef = compound_parser.parse(compound.refid).compounddef
+            for refid, kind, name in namespace_shards(compounddef, kinds):
+                directive = NAMESPACE_SHARD_DIRECTIVES.get(kind, "doxygenclass")
+                option_spec = self.directives[directive].option_spec or {}
+                # The nested shards go into the same directory
+                shard_options = {
+                    key: ("." if key == "sharded" else value)
+                    for key, value in options.items()
+                    if key in option_spec
+                }
+                text = _title(kind, name) + "\n" + _directive(directive, name, shard_options)
+                shard_docname = self.write(directory, refid, docname, text)
+                if "sharded" in shard_options:
+                    nested.append((shard_docname, text))
+        return nested
+
+    def write(self, directory: str, refid: str, docname: str, text: str) -> str:
+        """Writes the document for a shard unless it already has the same contents."""
+
+        shard_docname = "%s/%s" % (directory, refid)
+        self.generated.setdefault(directory, set()).add(refid)
+
+        text = "%s\n   Sharded from %s.\n\n%s" % (MARKER, docname, text)
+        filename = self._filename(directory, refid)
+        try:
+            with open(filename, encoding="utf-8") as f:
+                if f.read() == text:
+                    return shard_docname
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(text)
+        return shard_docname
+
+    def remove_stale(self) -> None:
+        """Removes the shards of compounds which no longer exist, including those in directories
+        which were written by the previous build but not by this one."""
+
+        env = self.app.env
+        previous = getattr(env, "breathe_shard_directories", set())
+        for directory in previous | set(self.generated):
+            path = os.path.join(self.app.srcdir, directory)
+            if not os.path.isdir(path):
+                continue
+            refids = self.generated.get(directory, set())
+            for filename in os.listdir(path):
+                refid, ext = os.path.splitext(filename)
+                if ext != ".rst" or refid in refids:
+                    continue
+                with open(os.path.join(path, filename), encoding="utf-8") as f:
+                    generated = f.readline().rstrip("\n") == MARKER
+                if generated:
+                    os.remove(os.path.join(path, filename))
+            if not os.listdir(path):
+                os.rmdir(path)
+        env.breathe_shard_directories = set(self.generated)  # type: ignore
+
+    def _filename(self, directory: str, refid: str) -> str:
+        return os.path.join(self.app.srcdir, directory, refid + ".rst")
@@ -1,8 +1,12 @@
+from breathe import path_handler
+
 from sphinx.application import Sphinx
 from sphinx.environment import BuildEnvironment
 
 import os
-from typing import List, Set
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
 
 """
 Store the modified time of the various doxygen xml files against the
@@ -11,6 +15,11 @@ reStructuredText files to rebuild if the doxygen xml is modified.
 
 We store the information in the environment object as 'breathe_file_state'
 so that it is pickled down and stored between builds as Sphinx is designed to do.
+Large projects read tens of thousands of xml files for thousands of documents, so
+the information is kept in a FileState, which numbers the files and documents and
+records the documents of each file as a bitset of their numbers. Environments
+pickled by older versions hold a dict of file names to modified times and sets of
+documents instead, which is converted when it is first used.
 
 (mypy doesn't like dynamically added attributes, hence all references to it are ignored)
 """
@@ -22,55 +31,250 @@ class MTimeError(Exception):
 
 def _getmtime(filename: str):
     try:
-        return os.path.getmtime(filename)
+        # Files inside archives or gzipped files change along with the file they are read from
+        return os.path.getmtime(path_handler.source_file(filename))
     except OSError:
         raise MTimeError("Cannot find file: %s" % os.path.realpath(filename))
 
 
-def update(app: Sphinx, source_file: str) -> None:
-    if not hasattr(app.env, "breathe_file_state"):
-        app.env.breathe_file_state = {}  # type: ignore
+def _bits(bitset: int) -> Iterator[int]:
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+class FileState:
+    """The xml files read for the documents along with their modified times.
+
+    Files and documents are numbered in the order they are first seen. The documents of each file
+    are a bitset of document numbers, and a purged document gives up its number so that the files
+    it read don't need to be visited. Unused numbers are dropped when the state is pickled, where
+    the directories of the files are stored once and the modified times and document numbers in
+    arrays.
+    """
+
+    def __init__(self) -> None:
+        self._files: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._mtimes = array("d")
+        self._documents: List[int] = []
+        self._docnames: List[Optional[str]] = []
+        self._docname_ids: Dict[str, int] = {}
+        # The bitset of the documents which haven't been purged
+        self._live = 0
+
+    @classmethod
+    def from_dict(cls, file_state: Dict[str, tuple]) -> "FileState":
+        """Converts the state stored by older versions."""
+
+        state = cls()
+        for filename, (mtime, docnames) in file_state.items():
+            for docname in docnames:
+                state.add(filename, mtime, docname)
+        return state
+
+    def __len__(self) -> int:
+        return sum(1 for bitset in self._documents if bitset & self._live)
+
+    def add(self, filename: str, mtime: float, docname: str) -> None:
+        docname_id = self._docname_ids.get(docname)
+        if docname_id is None:
+            docname_id = self._docname_ids[docname] = len(self._docnames)
+            self._docnames.append(docname)
+            self._live |= 1 << docname_id
+
+        file_id = self._file_ids.get(filename)
+        if file_id is None:
+            file_id = self._file_ids[filename] = len(self._files)
+            self._files.append(filename)
+            self._mtimes.append(mtime)
+            self._documents.append(0)
+
+        self._mtimes[file_id] = mtime
+        self._documents[file_id] |= 1 << docname_id
+
+    def docnames(self, filename: str) -> Set[str]:
+        file_id = self._file_ids.get(filename)
+        if file_id is None:
+            return set()
+        return self._docnames_of(self._documents[file_id])
+
+    def _docnames_of(self, bitset: int) -> Set[str]:
+        docnames = self._docnames
+        return {docnames[docname_id] for docname_id in _bits(bitset & self._live)}  # type: ignore
+
+    def stale_docnames(self, getmtime: Callable[[str], float]) -> Set[str]:
+        """Returns the documents which read any file modified since."""
+
+        stale = 0
+        for file_id, filename in enumerate(self._files):
+            bitset = self._documents[file_id] & self._live
+            if bitset and getmtime(filename) > self._mtimes[file_id]:
+                stale |= bitset
+        return self._docnames_of(stale)
+
+    def merge(self, other: "FileState", docnames: Set[str]) -> None:
+        """Adds the files read for the documents in another state, e.g., that of a process which
+        read them in parallel."""
+
+        other_ids = (other._docname_ids.get(docname) for docname in docnames)
+        mask = sum(1 << docname_id for docname_id in other_ids if docname_id is not None)
+        for file_id, filename in enumerate(other._files):
+            for docname_id in _bits(other._documents[file_id] & mask):
+                docname = other._docnames[docname_id]
+                self.add(filename, other._mtimes[file_id], docname)  # type: ignore
+
+    def purge(self, docname: str) -> None:
+        docname_id = self._docname_ids.pop(docname, None)
+        if docname_id is not None:
+            self._docnames[docname_id] = None
+            self._live &= ~(1 << docname_id)
 
-    new_mtime = _getmtime(source_file)
-    mtime, docnames = app.env.breathe_file_state.setdefault(  # type: ignore
-        source_file, (new_mtime, set())
-    )
+    def _compact(self) -> None:
+        # Renumber the documents that are left and drop the files none of them read
+        if None not in self._docnames:
+            return
+
+        renumbered: Dict[int, int] = {}
+        docnames: List[Optional[str]] = []
+        for docname_id, docname in enumerate(self._docnames):
+            if docname is not None:
+                renumbered[docname_id] = len(docnames)
+                docnames.append(docname)
+
+        state = FileState()
+        state._docnames = docnames
+        state._docname_ids = {docname: i for i, docname in enumerate(docnames)}  # type: ignore
+        state._live = (1 << len(docnames)) - 1
+        for file_id, filename in enumerate(self._files):
+            bitset = 0
+            for docname_id in _bits(self._documents[file_id]):
+                if docname_id in renumbered:
+                    bitset |= 1 << renumbered[docname_id]
+            if bitset:
+                state._file_ids[filename] = len(state._files)
+                state._files.append(filename)
+                state._mtimes.append(self._mtimes[file_id])
+                state._documents.append(bitset)
+        self.__dict__.update(state.__dict__)
+
+    def __getstate__(self):
+        self._compact()
+        directories: List[str] = []
+        directory_ids: Dict[str, int] = {}
+        file_directories = array("I")
+        basenames = []
+        # The document numbers of all the files one after the other, and where each file's start
+        offsets = array("I", [0])
+        document_ids = array("I")
+        for file_id, filename in enumerate(self._files):
+            head, separator, basename = filename.rpartition("/")
+            directory = head + separator
+            directory_id = directory_ids.get(directory)
+            if directory_id is None:
+                directory_id = directory_ids[directory] = len(directories)
+                directories.append(directory)
+            file_directories.append(directory_id)
+            basenames.append(basename)
+            document_ids.extend(_bits(self._documents[file_id]))
+            offsets.append(len(document_ids))
+        return {
+            "directories": directories,
+            "file_directories": file_directories,
+            "basenames": basenames,
+            "mtimes": self._mtimes,
+            "offsets": offsets,
+            "document_ids": document_ids,
+            "docnames": self._docnames,
+        }
+
+    def __setstate__(self, state) -> None:
+        directories = state["directories"]
+        self._files = [
+            directories[directory_id] + basename
+            for directory_id, basename in zip(state["file_directories"], state["basenames"])
+        ]
+        self._file_ids = {filename: i for i, filename in enumerate(self._files)}
+        self._mtimes = state["mtimes"]
+        offsets, document_ids = state["offsets"], state["document_ids"]
+        self._documents = []
+        for start, end in zip(offsets, offsets[1:]):
+            bitset = 0
+            for docname_id in document_ids[start:end]:
+                bitset |= 1 << docname_id
+            self._documents.append(bitset)
+        self._docnames = state["docnames"]
+        self._docname_ids = {docname: i for i, docname in enumerate(self._docnames)}
+        self._live = (1 << len(self._docnames)) - 1
+
+
+def _file_state(env: BuildEnvironment) -> Optional[FileState]:
+    file_state = getattr(env, "breathe_file_state", None)
+    if isinstance(file_state, dict):
+        # Pickled by an older version
+        file_state = env.breathe_file_state = FileState.from_dict(file_state)  # type: ignore
+    return file_state
+
+
+@contextmanager
+def untracked(app: Sphinx) -> Iterator[None]:
+    """Doesn't record the files read within, e.g., when they are read before any document to
+    generate the shards of sharded directives. The documents which use them record them again."""
 
     assert app.env is not None
-    docnames.add(app.env.docname)
+    app.env.temp_data["breathe_untracked"] = True
+    try:
+        yield
+    finally:
+        del app.env.temp_data["breathe_untracked"]
 
-    app.env.breathe_file_state[source_file] = (new_mtime, docnames)  # type: ignore
+
+def update(app: Sphinx, source_file: str) -> None:
+    assert app.env is not None
+    if app.env.temp_data.get("breathe_untracked"):
+        return
+
+    file_state = _file_state(app.env)
+    if file_state is None:
+        file_state = app.env.breathe_file_state = FileState()  # type: ignore
+
+    file_state.add(source_file, _getmtime(source_file), app.env.docname)
 
 
 def _get_outdated(
     app: Sphinx, env: BuildEnvironment, added: Set[str], changed: Set[str], removed: Set[str]
 ) -> List[str]:
-    if not hasattr(app.env, "breathe_file_state"):
+    file_state = _file_state(env)
+    if file_state is None:
         return []
 
-    stale = []
-    for filename, info in app.env.breathe_file_state.items():
-        old_mtime, docnames = info
-        if _getmtime(filename) > old_mtime:
-            stale.extend(docnames)
-    return list(set(stale).difference(removed))
+    return list(file_state.stale_docnames(_getmtime).difference(removed))
 
 
 def _purge_doc(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
-    if not hasattr(app.env, "breathe_file_state"):
+    file_state = _file_state(env)
+    if file_state is None:
+        return
+
+    file_state.purge(docname)
+
+
+def _merge_info(
+    app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment
+) -> None:
+    other_file_state = _file_state(other)
+    if other_file_state is None:
         return
 
-    toremove = []
-    for filename, info in app.env.breathe_file_state.items():
-        _, docnames = info
-        docnames.discard(docname)
-        if not docnames:
-            toremove.append(filename)
+    file_state = _file_state(env)
+    if file_state is None:
+        file_state = env.breathe_file_state = FileState()  # type: ignore
 
-    for filename in toremove:
-        del app.env.breathe_file_state[filename]
+    file_state.merge(other_file_state, docnames)
 
 
 def setup(app: Sphinx):
     app.connect("env-get-outdated", _get_outdated)
     app.connect("env-purge-doc", _purge_doc)
+    app.connect("env-merge-info", _merge_info)
@@ -1,21 +1,102 @@
 """
 A module to house the methods for resolving a code-blocks language based on filename
 (and extension).
+
+Pygments finds the lexer for a filename by matching it against the filename patterns of every
+lexer it knows. As the same handful of extensions come up for every listing in a project, the
+patterns are sorted into lookup tables once and the result for each filename is cached.
 """
-from typing import Optional
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+import fnmatch
 import os.path
+import re
+
+# A lexer is described by the module it is defined in and its class name as listed in pygments'
+# lexer mapping, or by the class itself for lexers from plugins, along with its aliases
+LexerInfo = Tuple[Any, str, Tuple[str, ...]]
+
+# The lexers and the patterns they were matched by
+Matches = List[Tuple[LexerInfo, str]]
+
+_glob_chars = re.compile(r"[*?\[]")
+
+
+class LexerTable:
+    """The filename patterns of all lexers sorted by how they can be looked up."""
+
+    def __init__(self) -> None:
+        # Patterns without any wildcards, e.g., "Makefile"
+        self.names: Dict[str, Matches] = {}
+        # Patterns matching any filename ending in a fixed suffix, e.g., "*.cpp"
+        self.suffixes: Dict[str, Matches] = {}
+        # Everything else, e.g., "*.[ch]pp" or "Makefile.*"
+        self.globs: List[Tuple[Pattern, LexerInfo, str]] = []
+
+    def add(self, lexer: LexerInfo, pattern: str) -> None:
+        if not _glob_chars.search(pattern):
+            self.names.setdefault(pattern, []).append((lexer, pattern))
+        elif pattern.startswith("*") and not _glob_chars.search(pattern[1:]):
+            self.suffixes.setdefault(pattern[1:], []).append((lexer, pattern))
+        else:
+            self.globs.append((re.compile(fnmatch.translate(pattern)), lexer, pattern))
+
+    def find(self, basename: str) -> Matches:
+        matches = list(self.names.get(basename, ()))
+        if self.suffixes:
+            for start in range(len(basename) + 1):
+                matches.extend(self.suffixes.get(basename[start:], ()))
+        for regex, lexer, pattern in self.globs:
+            if regex.match(basename):
+                matches.append((lexer, pattern))
+        return matches
+
+
+@lru_cache(maxsize=None)
+def _lexer_table() -> LexerTable:
+    # Importing the lexers is expensive and only needed for program listings
+    from pygments.lexers._mapping import LEXERS
+    from pygments.plugin import find_plugin_lexers
+
+    table = LexerTable()
+    for class_name, (module, _, aliases, filenames, _) in LEXERS.items():
+        for pattern in filenames:
+            table.add((module, class_name, tuple(aliases)), pattern)
+    for cls in find_plugin_lexers():
+        for pattern in cls.filenames:
+            table.add((cls, cls.__name__, tuple(cls.aliases)), pattern)
+    return table
+
+
+def _load_lexer(lexer: LexerInfo):
+    module, class_name, _ = lexer
+    if isinstance(module, str):
+        return getattr(import_module(module), class_name)
+    return module
+
 
-from pygments.lexers import get_lexer_for_filename
-from pygments.util import ClassNotFound
+def _rating(match: Tuple[LexerInfo, str]) -> Tuple[float, str]:
+    # The same order as pygments.lexers.find_lexer_class_for_filename uses without any code to
+    # analyse: explicit patterns get a bonus over the lexer's priority
+    lexer, pattern = match
+    bonus = 0.5 if "*" not in pattern else 0
+    return _load_lexer(lexer).priority + bonus, lexer[1]
 
 
+@lru_cache(maxsize=4096)
 def get_pygments_alias(filename: str) -> Optional[str]:
     "Find first pygments alias from filename"
-    try:
-        lexer_cls = get_lexer_for_filename(filename)
-        return lexer_cls.aliases[0]  # type: ignore
-    except ClassNotFound:
+    matches = _lexer_table().find(os.path.basename(filename))
+    if not matches:
         return None
+    if len(matches) == 1:
+        lexer = matches[0][0]
+    else:
+        # Only ambiguous filenames need the lexer classes to be loaded to compare their priorities
+        lexer = max(matches, key=_rating)[0]
+    aliases = lexer[2]
+    return aliases[0] if aliases else None
 
 
 def get_extension(filename: str) -> str:
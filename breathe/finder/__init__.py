@@ -1,14 +1,12 @@
 from breathe.project import ProjectInfo
+from breathe.renderer import NodeStack
 from breathe.renderer.filter import Filter
 
 
-def stack(element, list_):
-    """Stack an element on to the start of a list and return as a new list"""
+def stack(element, ancestors) -> NodeStack:
+    """Stack an element on to the start of the ancestors and return as a new stack"""
 
-    # Copy list first so we have a new list to insert into
-    output = list_[:]
-    output.insert(0, element)
-    return output
+    return NodeStack(element, NodeStack.from_sequence(ancestors))
 
 
 class ItemFinder:
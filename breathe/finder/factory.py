@@ -3,11 +3,11 @@ from breathe.finder import index as indexfinder
 from breathe.finder import compound as compoundfinder
 from breathe.parser import DoxygenParserFactory
 from breathe.project import ProjectInfo
-from breathe.renderer.filter import Filter
+from breathe.renderer.filter import Filter, OrFilter
 
 from sphinx.application import Sphinx
 
-from typing import Dict, Type
+from typing import Any, Dict, List, Sequence, Type
 
 
 class _CreateCompoundTypeSubFinder:
@@ -44,6 +44,32 @@ class Finder:
         item_finder = self.item_finder_factory.create_finder(self._root)
         item_finder.filter_([_FakeParentNode()], filter_, matches)
 
+    def filter_index_(self, filters: Sequence[Filter]) -> List[List[Any]]:
+        """Returns the matches for each of the filters, as filter_ would find them, for filters
+        which only match compound and member nodes of the index.
+
+        The index is walked once for all the filters and only the compound files of matching
+        members are loaded, rather than every compound file for every filter.
+        """
+
+        matches: List[List[Any]] = [[] for _ in filters]
+        item_finder = self.item_finder_factory.create_finder(self._root)
+        item_finder.filter_index_([_FakeParentNode()], filters, matches)  # type: ignore
+        return matches
+
+    def filter_all_(self, filters: Sequence[Filter]) -> List[List[Any]]:
+        """Returns the matches for each of the filters, as filter_ would find them, for filters
+        which don't match any nodes of the index, e.g., the ones for enum values.
+
+        The index and the compound files are walked once for all the filters together.
+        """
+
+        if not filters:
+            return []
+        matches: List[Any] = []
+        self.filter_(OrFilter(*filters), matches)
+        return [[m for m in matches if filter_.allow(m)] for filter_ in filters]
+
     def root(self):
         return self._root
 
@@ -4,7 +4,7 @@ from breathe.parser import DoxygenCompoundParser
 
 from sphinx.application import Sphinx
 
-from typing import Any, List
+from typing import Any, List, Sequence, Set
 
 
 class DoxygenTypeSubItemFinder(ItemFinder):
@@ -13,10 +13,21 @@ class DoxygenTypeSubItemFinder(ItemFinder):
 
         compounds = self.data_object.get_compound()
         node_stack = stack(self.data_object, ancestors)
-        for compound in compounds:
-            compound_finder = self.item_finder_factory.create_finder(compound)
+        compound_finders = [self.item_finder_factory.create_finder(c) for c in compounds]
+        if compound_finders:
+            # Most of the compound files are read while filtering so start on them together
+            compound_finders[0].compound_parser.prefetch(c.refid for c in compounds)
+        for compound_finder in compound_finders:
             compound_finder.filter_(node_stack, filter_, matches)
 
+    def filter_index_(self, ancestors, filters: Sequence[Filter], matches: List[List]) -> None:
+        """Finds the nodes which match each of the filters, see Finder.filter_index_"""
+
+        node_stack = stack(self.data_object, ancestors)
+        for compound in self.data_object.get_compound():
+            compound_finder = self.item_finder_factory.create_finder(compound)
+            compound_finder.filter_index_(node_stack, filters, matches)
+
 
 class CompoundTypeSubItemFinder(ItemFinder):
     def __init__(self, app: Sphinx, compound_parser: DoxygenCompoundParser, *args):
@@ -50,7 +61,7 @@ class CompoundTypeSubItemFinder(ItemFinder):
         # If there are members in this compound that match the criteria
         # then load up the file for this compound and get the member data objects
         if member_matches:
-            file_data = self.compound_parser.parse(self.data_object.refid)
+            file_data = self._parse_members({m[0].refid for m in member_matches})
             finder = self.item_finder_factory.create_finder(file_data)
 
             for member_stack in member_matches:
@@ -64,6 +75,41 @@ class CompoundTypeSubItemFinder(ItemFinder):
             finder = self.item_finder_factory.create_finder(file_data)
             finder.filter_(node_stack, filter_, matches)
 
+    def filter_index_(self, ancestors, filters: Sequence[Filter], matches: List[List]) -> None:
+        """Finds the nodes which match each of the filters, see Finder.filter_index_
+
+        The filters can only match the compound and member nodes so there is no need to descend
+        into the compound file, apart from resolving the matching members to their memberdefs.
+        """
+
+        node_stack = stack(self.data_object, ancestors)
+        member_stacks = [stack(member, node_stack) for member in self.data_object.get_member()]
+        filter_member_stacks = []
+        for filter_, filter_matches in zip(filters, matches):
+            if filter_.allow(node_stack):
+                filter_matches.append(node_stack)
+            filter_member_stacks.append([m for m in member_stacks if filter_.allow(m)])
+
+        refids = {m[0].refid for stacks in filter_member_stacks for m in stacks}
+        if not refids:
+            return
+        file_data = self._parse_members(refids)
+        finder = self.item_finder_factory.create_finder(file_data)
+        for stacks, filter_matches in zip(filter_member_stacks, matches):
+            for member_stack in stacks:
+                ref_filter = self.filter_factory.create_id_filter(
+                    "memberdef", member_stack[0].refid
+                )
+                finder.filter_(node_stack, ref_filter, filter_matches)
+
+    def _parse_members(self, refids: Set[str]):
+        """Returns the compound file for this compound, or only the fragment of it with the
+        member if just one member is needed."""
+
+        if len(refids) == 1:
+            return self.compound_parser.parse_member(self.data_object.refid, next(iter(refids)))
+        return self.compound_parser.parse(self.data_object.refid)
+
 
 class MemberTypeSubItemFinder(ItemFinder):
     def filter_(self, ancestors, filter_: Filter, matches) -> None:
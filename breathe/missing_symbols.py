@@ -0,0 +1,155 @@
+"""
+Remember the targets of directives which couldn't be found so that they aren't searched for again.
+
+Looking for a target which isn't there, e.g., because the documentation refers to something that
+has been removed or is compiled out, walks the whole index and usually parses many compound files
+before the directive gives up. The same missing targets tend to be referred to from many
+documents, so every miss is stored against the project, the directive, its argument and the
+fingerprint of the project's index.xml, along with the documents it was missed in. As long as the
+index is unchanged, the directive is then told straight away that its target doesn't exist.
+Only the first directive to miss a target in a build warns about it, the others just show the
+warning in their document.
+
+We store the misses in the environment object as 'breathe_missing_symbols' so that they are
+pickled down and kept between builds, just like 'breathe_file_state'. Entries for an index which
+has changed since are dropped before the documents are read. At the end of the build the targets
+missed by the documents read in it are listed together.
+
+(mypy doesn't like dynamically added attributes, hence all references to it are ignored)
+"""
+
+from breathe import path_handler
+from breathe.project import ProjectInfo
+
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+from sphinx.util import logging
+
+import os
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The project path, the directive name, its argument and the fingerprint of the index
+MissingKey = Tuple[str, str, str, Hashable]
+
+
+def _index_fingerprint(app: Sphinx, project_path: str) -> Optional[Hashable]:
+    filename = path_handler.resolve_path(app, project_path, "index.xml")
+    try:
+        stat = os.stat(path_handler.source_file(filename))
+    except OSError:
+        # e.g., projects read from a database rather than XML, whose misses aren't kept
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def create_key(
+    app: Sphinx, project_info: ProjectInfo, directive: str, argument: str
+) -> Optional[MissingKey]:
+    fingerprint = _index_fingerprint(app, project_info.project_path())
+    if fingerprint is None:
+        return None
+    return (project_info.project_path(), directive, argument, fingerprint)
+
+
+def is_missing(app: Sphinx, key: Optional[MissingKey]) -> bool:
+    assert app.env is not None
+    return key is not None and key in getattr(app.env, "breathe_missing_symbols", {})
+
+
+def add(app: Sphinx, key: Optional[MissingKey]) -> bool:
+    """Records that the target of the key wasn't found in the current document. Returns whether
+    this is the first time it was missed in the current build, i.e., whether to warn about it."""
+
+    assert app.env is not None
+    if key is None or "docname" not in app.env.temp_data:
+        return True
+
+    if not hasattr(app.env, "breathe_missing_symbols"):
+        app.env.breathe_missing_symbols = {}  # type: ignore
+    if not hasattr(app.env, "breathe_missing_warned"):
+        app.env.breathe_missing_warned = set()  # type: ignore
+
+    app.env.breathe_missing_symbols.setdefault(key, set()).add(app.env.docname)  # type: ignore
+    if key in app.env.breathe_missing_warned:  # type: ignore
+        return False
+    app.env.breathe_missing_warned.add(key)  # type: ignore
+    return True
+
+
+def _drop_stale(app: Sphinx, env: BuildEnvironment) -> None:
+    missing: Dict[MissingKey, Set[str]] = getattr(env, "breathe_missing_symbols", {})
+    fingerprints: Dict[str, Optional[Hashable]] = {}
+    for key in list(missing):
+        project_path = key[0]
+        if project_path not in fingerprints:
+            fingerprints[project_path] = _index_fingerprint(app, project_path)
+        if fingerprints[project_path] != key[3]:
+            del missing[key]
+
+
+def _purge_doc(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    # The misses themselves are kept, as other documents are likely to refer to the same targets
+    for docnames in getattr(env, "breathe_missing_symbols", {}).values():
+        docnames.discard(docname)
+
+
+def _merge_info(
+    app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment
+) -> None:
+    # Documents read in parallel record their misses in the environments of their processes
+    missing = getattr(other, "breathe_missing_symbols", {})
+    if not missing:
+        return
+
+    if not hasattr(env, "breathe_missing_symbols"):
+        env.breathe_missing_symbols = {}  # type: ignore
+
+    for key, other_docnames in missing.items():
+        env.breathe_missing_symbols.setdefault(key, set()).update(other_docnames)  # type: ignore
+
+
+def summary(missing: Dict[MissingKey, Set[str]], docnames: Set[str]) -> List[str]:
+    """Returns a line for each target missed in any of the documents."""
+
+    lines = []
+    for (project_path, directive, argument, _), missed_in in sorted(missing.items()):
+        missed_in = missed_in & docnames
+        if missed_in:
+            lines.append(
+                "%s:: %s (%s) in %s"
+                % (directive, argument, project_path, ", ".join(sorted(missed_in)))
+            )
+    return lines
+
+
+def setup(app: Sphinx):
+    read_docnames: Set[str] = set()
+
+    def before_read_docs(app: Sphinx, env: BuildEnvironment, docnames: List[str]) -> None:
+        read_docnames.clear()
+        read_docnames.update(docnames)
+        _drop_stale(app, env)
+        # Targets which were warned about in the last build are warned about again
+        env.breathe_missing_warned = set()  # type: ignore
+
+    def report(app: Sphinx, exception) -> None:
+        if app.env is None:
+            return
+        if hasattr(app.env, "breathe_missing_warned"):
+            del app.env.breathe_missing_warned  # type: ignore
+        if exception is not None:
+            return
+        lines = summary(getattr(app.env, "breathe_missing_symbols", {}), read_docnames)
+        if lines:
+            logger.info(
+                "breathe: %d directive targets could not be found:\n  %s",
+                len(lines),
+                "\n  ".join(lines),
+            )
+
+    app.connect("env-before-read-docs", before_read_docs)
+    app.connect("env-purge-doc", _purge_doc)
+    app.connect("env-merge-info", _merge_info)
+    app.connect("build-finished", report)
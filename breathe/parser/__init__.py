@@ -1,11 +1,22 @@
-from . import index
-from . import compound
-
+# The parser modules are large and only imported once the first file is parsed, which keeps
+# importing the extension cheap
 from breathe import file_state_cache, path_handler
+from breathe.archive import ArchiveError
+from breathe.parser.member_index import MemberIndex
 from breathe.project import ProjectInfo
 
 from sphinx.application import Sphinx
 
+import os
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, IO, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from . import database
+
 
 class ParserError(Exception):
     def __init__(self, error: Exception, filename: str):
@@ -31,9 +42,80 @@ class Parser:
         self.app = app
         self.cache = cache
 
+    def open_file(self, filename: str) -> IO[bytes]:
+        try:
+            return path_handler.open_file(filename)
+        except (OSError, ArchiveError) as e:
+            raise FileIOError(e, filename)
+
+    def open_database(self, project_info: ProjectInfo) -> Optional["database.Database"]:
+        """Returns the Doxygen SQLite3 database for the project, or None if the project is read
+        from XML, which is the default."""
+
+        from . import database
+
+        project_path = os.path.join(self.app.confdir, project_info.project_path())
+        try:
+            filename = self.cache[("database", project_path)]
+        except KeyError:
+            filename = database.find_database(project_path)
+            self.cache[("database", project_path)] = filename
+        if filename is None:
+            return None
+
+        file_state_cache.update(self.app, filename)
+        try:
+            return self.cache[filename]
+        except KeyError:
+            try:
+                result = database.Database(filename)
+            except database.FileIOError as e:
+                raise FileIOError(e, filename)
+            self.cache[filename] = result
+            return result
+
+    def load_parse_cache(self, project_info: ProjectInfo, filename: str):
+        """Returns the tree for the file from the project's breathe_parse_cache, if it has one
+        and it is up to date."""
+
+        cache_dir = self.app.config.breathe_parse_cache.get(project_info.name())
+        if not cache_dir:
+            return None
+        cache_dir = os.path.join(self.app.confdir, cache_dir)
+        try:
+            parse_cache = self.cache[("parse_cache", cache_dir)]
+        except KeyError:
+            # Imported here as breathe.cache depends on this package
+            from breathe.cache import ParseCache
+
+            parse_cache = ParseCache(cache_dir)
+            self.cache[("parse_cache", cache_dir)] = parse_cache
+        return parse_cache.load(filename)
+
+    def parse_database(self, db: "database.Database", key: str, parse: Callable[[], Any]):
+        from . import database
+
+        try:
+            return self.cache[(db.filename, key)]
+        except KeyError:
+            try:
+                result = parse()
+                self.cache[(db.filename, key)] = result
+                return result
+            except database.ParseError as e:
+                raise ParserError(e, db.filename)
+            except database.FileIOError as e:
+                raise FileIOError(e, db.filename)
+
 
 class DoxygenIndexParser(Parser):
     def parse(self, project_info: ProjectInfo):
+        from . import index
+
+        db = self.open_database(project_info)
+        if db is not None:
+            return self.parse_database(db, "index.xml", db.parse_index)
+
         filename = path_handler.resolve_path(self.app, project_info.project_path(), "index.xml")
         file_state_cache.update(self.app, filename)
 
@@ -41,9 +123,14 @@ class DoxygenIndexParser(Parser):
             # Try to get from our cache
             return self.cache[filename]
         except KeyError:
+            result = self.load_parse_cache(project_info, filename)
+            if result is not None:
+                self.cache[filename] = result
+                return result
             # If that fails, parse it afresh
             try:
-                result = index.parse(filename)
+                with self.open_file(filename) as fp:
+                    result = index.parse(fp)
                 self.cache[filename] = result
                 return result
             except index.ParseError as e:
@@ -52,29 +139,178 @@ class DoxygenIndexParser(Parser):
                 raise FileIOError(e, filename)
 
 
+class CompoundPrefetcher:
+    """Reads and parses compound files in a bounded thread pool ahead of their use.
+
+    The results are only handed over to the parser cache by the thread of the build when the file
+    is actually asked for, so the cache itself is never touched concurrently. Errors are not
+    reported by the prefetcher, the file is simply parsed again when it is needed and the error
+    raised from there.
+
+    Only a few files for each worker are read ahead at a time, more are started as the results
+    are asked for, so that results which are never asked for can't pile up. The files of each
+    call to prefetch are expected to be asked for in order, so once a file is asked for, the ones
+    before it in the same call which weren't are dropped.
+    """
+
+    # The number of files read ahead for each worker
+    PENDING_PER_WORKER = 4
+
+    def __init__(self, app: Sphinx, cache) -> None:
+        self.app = app
+        self.cache = cache
+        self.pending: Dict[str, "Future"] = {}
+        # The files to start once there is room, in order
+        self.waiting: Deque[str] = deque()
+        # The files of each call to prefetch which haven't been asked for yet
+        self.batches: Dict[str, List[str]] = {}
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._pid: Optional[int] = None
+
+    def _get_executor(self) -> Optional["ThreadPoolExecutor"]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = self.app.config.breathe_prefetch_workers
+        if not workers:
+            return None
+        # Parallel reading forks the build so a pool created by the parent can't be reused
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                thread_name_prefix="breathe-prefetch")
+            self._pid = os.getpid()
+            self.pending = {}
+            self.waiting = deque()
+            self.batches = {}
+        return self._executor
+
+    def _start(self) -> None:
+        limit = self.PENDING_PER_WORKER * self.app.config.breathe_prefetch_workers
+        while self.waiting and len(self.pending) < limit:
+            filename = self.waiting.popleft()
+            assert self._executor is not None
+            self.pending[filename] = self._executor.submit(self._parse, filename)
+
+    def _drop(self, filename: str) -> None:
+        self.batches.pop(filename, None)
+        future = self.pending.pop(filename, None)
+        if future is not None:
+            future.cancel()
+        else:
+            self.waiting.remove(filename)
+
+    def prefetch(self, filenames: Iterable[str]) -> None:
+        if self._get_executor() is None:
+            return
+        batch = []
+        for filename in filenames:
+            if filename not in self.batches and filename not in self.cache:
+                self.batches[filename] = batch
+                batch.append(filename)
+        self.waiting.extend(batch)
+        self._start()
+
+    @staticmethod
+    def _parse(filename: str):
+        from . import compound
+
+        with path_handler.open_file(filename) as fp:
+            return compound.parse(fp)
+
+    def wait(self, filename: str):
+        """Returns the prefetched result for the file, or None if it hasn't been prefetched or
+        couldn't be parsed."""
+
+        batch = self.batches.get(filename)
+        if batch is None or self._pid != os.getpid():
+            return None
+        index = batch.index(filename)
+        for skipped in batch[:index]:
+            self._drop(skipped)
+        del batch[:index + 1]
+        del self.batches[filename]
+
+        future = self.pending.pop(filename, None)
+        if future is None:
+            # Not started yet, it is quicker to parse it right away
+            self.waiting.remove(filename)
+        self._start()
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            for future in self.pending.values():
+                future.cancel()
+            if self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pending = {}
+        self.waiting = deque()
+        self.batches = {}
+
+
 class DoxygenCompoundParser(Parser):
     def __init__(self, app: Sphinx, cache,
-                 project_info: ProjectInfo) -> None:
+                 project_info: ProjectInfo,
+                 prefetcher: Optional[CompoundPrefetcher] = None,
+                 member_index: Optional["MemberIndex"] = None) -> None:
         super().__init__(app, cache)
 
         self.project_info = project_info
+        self.prefetcher = prefetcher
+        self.member_index = member_index
 
-    def parse(self, refid: str):
-        filename = path_handler.resolve_path(
+    def _compound_filename(self, refid: str) -> str:
+        return path_handler.resolve_path(
             self.app,
             self.project_info.project_path(),
             "%s.xml" % refid
         )
 
+    def prefetch(self, refids: Iterable[str]) -> None:
+        """Starts reading the compound files for the refids in the background, if enabled."""
+
+        if self.prefetcher is None or not self.app.config.breathe_prefetch_workers:
+            return
+        if self.open_database(self.project_info) is not None:
+            return
+        if self.app.config.breathe_parse_cache.get(self.project_info.name()):
+            # The files are read from the cache which is quicker than parsing them in the pool
+            return
+        self.prefetcher.prefetch(self._compound_filename(refid) for refid in refids)
+
+    def parse(self, refid: str):
+        from . import compound
+
+        db = self.open_database(self.project_info)
+        if db is not None:
+            return self.parse_database(db, refid, lambda: db.parse_compound(refid))
+
+        filename = self._compound_filename(refid)
+
         file_state_cache.update(self.app, filename)
 
         try:
             # Try to get from our cache
             return self.cache[filename]
         except KeyError:
+            if self.prefetcher is not None:
+                result = self.prefetcher.wait(filename)
+                if result is not None:
+                    self.cache[filename] = result
+                    return result
+            result = self.load_parse_cache(self.project_info, filename)
+            if result is not None:
+                self.cache[filename] = result
+                return result
             # If that fails, parse it afresh
             try:
-                result = compound.parse(filename)
+                with self.open_file(filename) as fp:
+                    result = compound.parse(fp)
                 self.cache[filename] = result
                 return result
             except compound.ParseError as e:
@@ -82,6 +318,36 @@ class DoxygenCompoundParser(Parser):
             except compound.FileIOError as e:
                 raise FileIOError(e, filename)
 
+    def parse_member(self, refid: str, member_id: str):
+        """Returns the tree of the compound file for the refid, holding at least the member. When
+        breathe_member_index is enabled and the file hasn't been parsed already, only the
+        fragment of the file with the member is parsed."""
+
+        if self.member_index is None or not self.app.config.breathe_member_index:
+            return self.parse(refid)
+        if self.open_database(self.project_info) is not None:
+            return self.parse(refid)
+        if self.app.config.breathe_parse_cache.get(self.project_info.name()):
+            return self.parse(refid)
+
+        filename = self._compound_filename(refid)
+        if filename in self.cache or path_handler.source_file(filename) != filename:
+            # Already parsed, or read from an archive or gzipped file
+            return self.parse(refid)
+        if self.prefetcher is not None and filename in self.prefetcher.pending:
+            return self.parse(refid)
+
+        file_state_cache.update(self.app, filename)
+
+        try:
+            return self.cache[(filename, member_id)]
+        except KeyError:
+            result = self.member_index.parse_member(filename, member_id)
+            if result is None:
+                return self.parse(refid)
+            self.cache[(filename, member_id)] = result
+            return result
+
 
 class DoxygenParserFactory:
     def __init__(self, app: Sphinx) -> None:
@@ -89,9 +355,12 @@ class DoxygenParserFactory:
         # TODO: do we have a base class for all the Doxygen XML node types
         #       that we can use for typing?
         self.cache = {}  # type: ignore
+        self.prefetcher = CompoundPrefetcher(app, self.cache)
+        self.member_index = MemberIndex(os.path.join(app.doctreedir, "breathe", "members"))
 
     def create_index_parser(self) -> DoxygenIndexParser:
         return DoxygenIndexParser(self.app, self.cache)
 
     def create_compound_parser(self, project_info: ProjectInfo) -> DoxygenCompoundParser:
-        return DoxygenCompoundParser(self.app, self.cache, project_info)
+        return DoxygenCompoundParser(self.app, self.cache, project_info, self.prefetcher,
+                                     self.member_index)
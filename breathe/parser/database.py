@@ -0,0 +1,374 @@
+"""
+Doxygen SQLite3 Backend
+=======================
+
+With ``GENERATE_SQLITE3 = YES`` Doxygen writes all of its output into a single database,
+``doxygen_sqlite3.db``, rather than one XML file per compound. This module reads the index and
+the compounds from that database and builds the same objects as the XML parser so that the rest
+of Breathe can't tell the difference. Compounds are loaded by indexed queries on their refid
+when they are first needed, so only the symbols that are actually rendered are read.
+
+The following tables of the Doxygen schema are used:
+
+- ``refid`` maps row ids to the Doxygen refids used by compounds and members.
+- ``compounddef`` and ``memberdef`` hold the compounds and members, with their descriptions
+  stored as Doxygen XML fragments.
+- ``member`` relates members to their scopes. Enum values are ``memberdef`` rows of kind
+  ``enumvalue`` whose scope is the enum they belong to.
+- ``contains`` relates compounds to the compounds nested in them.
+- ``compoundref`` holds base and derived classes.
+- ``param`` and ``memberdef_param`` hold function parameters.
+- ``path`` holds the file names referenced by the locations.
+
+Doxygen doesn't group members into sections in the database, so the sections are derived from
+the kind, protection and staticness of the members in the same way as the XML output does it.
+"""
+
+from . import compound
+from . import index
+
+from xml.dom import minidom
+from xml.parsers.expat import ExpatError
+from xml.sax.saxutils import escape, quoteattr
+
+import os
+import pathlib
+import sqlite3
+
+from typing import Dict, List, Optional, Tuple
+
+DATABASE_FILENAME = "doxygen_sqlite3.db"
+
+_PROTECTION = {0: "public", 1: "protected", 2: "private", 3: "package"}
+_VIRTUALNESS = {0: "non-virtual", 1: "virtual", 2: "pure-virtual"}
+
+_CLASS_KINDS = (
+    "class",
+    "struct",
+    "union",
+    "interface",
+    "protocol",
+    "category",
+    "exception",
+    "service",
+    "singleton",
+)
+
+# Sections of namespace, file and group compounds, by member kind
+_SECTIONS = {
+    "function": "func",
+    "variable": "var",
+    "typedef": "typedef",
+    "enum": "enum",
+    "define": "define",
+}
+
+
+class ParseError(Exception):
+    pass
+
+
+class FileIOError(Exception):
+    pass
+
+
+def find_database(project_path: str) -> Optional[str]:
+    """Returns the database to read for the project at project_path or None if the project should
+    be read from XML.
+
+    The path can name the database itself or the directory it is in. The XML output is preferred
+    if a directory contains both.
+    """
+
+    if os.path.isfile(project_path):
+        return project_path if project_path.endswith(".db") else None
+    if os.path.exists(os.path.join(project_path, "index.xml")):
+        return None
+    filename = os.path.join(project_path, DATABASE_FILENAME)
+    return filename if os.path.isfile(filename) else None
+
+
+def _section_kind(compound_kind: str, kind: str, prot: str, static: bool) -> str:
+    if compound_kind not in _CLASS_KINDS:
+        return _SECTIONS.get(kind, kind)
+    if kind in ("friend", "signal", "dcop", "property", "event"):
+        return kind
+    if kind in ("typedef", "enum"):
+        return "%s-type" % prot
+    if kind == "slot":
+        return "%s-slot" % prot
+    static_ = "static-" if static else ""
+    if kind == "variable":
+        return "%s-%sattrib" % (prot, static_)
+    return "%s-%sfunc" % (prot, static_)
+
+
+def _element(tag: str, text: Optional[str], **attributes) -> str:
+    attrs = "".join(
+        " %s=%s" % (name, quoteattr(str(value)))
+        for name, value in attributes.items()
+        if value is not None
+    )
+    if not text:
+        return "<%s%s/>" % (tag, attrs)
+    return "<%s%s>%s</%s>" % (tag, attrs, escape(text), tag)
+
+
+def _description(tag: str, fragment: Optional[str]) -> str:
+    # The descriptions are stored as Doxygen XML already
+    return "<%s>%s</%s>" % (tag, fragment or "", tag)
+
+
+def _yes_no(value) -> str:
+    return "yes" if value else "no"
+
+
+class Database:
+    """A read-only connection to a Doxygen SQLite3 database."""
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        try:
+            # As a URI so that the file is opened read-only, with the path quoted so that any "?",
+            # "#" or "%" in it are taken as part of the path
+            uri = pathlib.Path(filename).resolve().as_uri() + "?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True)
+        except sqlite3.Error as e:
+            raise FileIOError(e)
+        self.connection.row_factory = sqlite3.Row
+        self._path_names: Optional[Dict[int, str]] = None
+
+    def _query(self, sql: str, *args) -> List[sqlite3.Row]:
+        parameters = args[0] if args and isinstance(args[0], dict) else args
+        try:
+            return self.connection.execute(sql, parameters).fetchall()
+        except sqlite3.Error as e:
+            raise ParseError(e)
+
+    def _paths(self) -> Dict[int, str]:
+        if self._path_names is None:
+            rows = self._query("SELECT rowid, name FROM path")
+            self._path_names = {row["rowid"]: row["name"] for row in rows}
+        return self._path_names
+
+    def parse_index(self):
+        """Returns the equivalent of the parsed index.xml."""
+
+        compounds: Dict[int, index.CompoundTypeSub] = {}
+        for row in self._query(
+            "SELECT c.rowid, r.refid, c.kind, c.name FROM compounddef AS c"
+            " JOIN refid AS r ON r.rowid = c.rowid ORDER BY c.rowid"
+        ):
+            compounds[row["rowid"]] = index.CompoundTypeSub(
+                kind=row["kind"], refid=row["refid"], name=row["name"]
+            )
+
+        scopes: Dict[int, List[int]] = {}
+        members = self._query(
+            "SELECT m.scope_rowid, md.rowid, r.refid, md.kind, md.name FROM member AS m"
+            " JOIN memberdef AS md ON md.rowid = m.memberdef_rowid"
+            " JOIN refid AS r ON r.rowid = md.rowid ORDER BY m.rowid"
+        )
+        for row in members:
+            scopes.setdefault(row["rowid"], []).append(row["scope_rowid"])
+        for row in members:
+            # Enum values are listed with the compounds that their enum is in
+            scope_rowids = [row["scope_rowid"]]
+            if row["kind"] == "enumvalue":
+                scope_rowids = scopes.get(row["scope_rowid"], [])
+            for scope_rowid in scope_rowids:
+                if scope_rowid in compounds:
+                    compounds[scope_rowid].member.append(
+                        index.MemberTypeSub(kind=row["kind"], refid=row["refid"], name=row["name"])
+                    )
+
+        return index.DoxygenTypeSub(compound=list(compounds.values()))
+
+    def parse_compound(self, refid: str):
+        """Returns the equivalent of the parsed compound XML file for refid."""
+
+        rows = self._query(
+            "SELECT c.* FROM compounddef AS c JOIN refid AS r ON r.rowid = c.rowid"
+            " WHERE r.refid = ?",
+            refid,
+        )
+        if not rows:
+            raise FileIOError("Cannot find compound %s in %s" % (refid, self.filename))
+
+        xml = "<doxygen>%s</doxygen>" % self._compounddef_xml(refid, rows[0])
+        try:
+            doc = minidom.parseString(xml)
+        except ExpatError as e:
+            raise ParseError(e)
+
+        root = compound.supermod.DoxygenType.factory()
+        root.build(doc.documentElement)
+        return root
+
+    def _compounddef_xml(self, refid: str, row: sqlite3.Row) -> str:
+        paths = self._paths()
+        kind = row["kind"]
+        parts = [_element("compoundname", row["name"])]
+        if row["title"]:
+            parts.append(_element("title", row["title"]))
+
+        # A class is the derived class in the references to its bases and vice versa
+        for ref in self._query(
+            "SELECT r.refid, c.name, cr.prot, cr.virt, cr.base_rowid = :rowid AS is_base"
+            " FROM compoundref AS cr JOIN compounddef AS c ON c.rowid ="
+            "  (CASE WHEN cr.base_rowid = :rowid THEN cr.derived_rowid ELSE cr.base_rowid END)"
+            " JOIN refid AS r ON r.rowid = c.rowid"
+            " WHERE cr.base_rowid = :rowid OR cr.derived_rowid = :rowid ORDER BY cr.rowid",
+            {"rowid": row["rowid"]},
+        ):
+            parts.append(
+                _element(
+                    "derivedcompoundref" if ref["is_base"] else "basecompoundref",
+                    ref["name"],
+                    refid=ref["refid"],
+                    prot=_PROTECTION.get(ref["prot"], "public"),
+                    virt=_VIRTUALNESS.get(ref["virt"], "non-virtual"),
+                )
+            )
+
+        for inner in self._query(
+            "SELECT r.refid, c.kind, c.name, c.prot FROM contains AS ct"
+            " JOIN compounddef AS c ON c.rowid = ct.inner_rowid"
+            " JOIN refid AS r ON r.rowid = c.rowid"
+            " WHERE ct.outer_rowid = ? ORDER BY ct.rowid",
+            row["rowid"],
+        ):
+            if inner["kind"] in _CLASS_KINDS:
+                tag = "innerclass"
+            elif inner["kind"] in ("namespace", "file", "dir", "group", "page"):
+                tag = "inner" + inner["kind"]
+            else:
+                continue
+            parts.append(
+                _element(
+                    tag,
+                    inner["name"],
+                    refid=inner["refid"],
+                    prot=_PROTECTION.get(inner["prot"]) if tag == "innerclass" else None,
+                )
+            )
+
+        parts.extend(self._sectiondefs_xml(kind, row["rowid"], paths))
+        parts.append(_description("briefdescription", row["briefdescription"]))
+        parts.append(_description("detaileddescription", row["detaileddescription"]))
+        if row["file_id"] in paths:
+            parts.append(
+                _element("location", None, file=paths[row["file_id"]], line=row["line"])
+            )
+
+        return "<compounddef %s>%s</compounddef>" % (
+            " ".join(
+                "%s=%s" % (name, quoteattr(value))
+                for name, value in [
+                    ("id", refid),
+                    ("kind", kind),
+                    ("prot", _PROTECTION.get(row["prot"], "public")),
+                ]
+            ),
+            "".join(parts),
+        )
+
+    def _sectiondefs_xml(self, compound_kind: str, rowid: int, paths: Dict[int, str]) -> List[str]:
+        sections: Dict[str, List[str]] = {}
+        for member in self._query(
+            "SELECT md.*, r.refid FROM member AS m"
+            " JOIN memberdef AS md ON md.rowid = m.memberdef_rowid"
+            " JOIN refid AS r ON r.rowid = md.rowid"
+            " WHERE m.scope_rowid = ? ORDER BY m.rowid",
+            rowid,
+        ):
+            if member["kind"] == "enumvalue":
+                continue
+            prot = _PROTECTION.get(member["prot"], "public")
+            section = _section_kind(compound_kind, member["kind"], prot, member["static"])
+            sections.setdefault(section, []).append(self._memberdef_xml(member, prot, paths))
+
+        return [
+            '<sectiondef kind="%s">%s</sectiondef>' % (kind, "".join(members))
+            for kind, members in sections.items()
+        ]
+
+    def _memberdef_xml(self, member: sqlite3.Row, prot: str, paths: Dict[int, str]) -> str:
+        parts = [
+            _element("type", member["type"]),
+            _element("definition", member["definition"]),
+            _element("argsstring", member["argsstring"]),
+            _element("name", member["name"]),
+        ]
+        if member["bitfield"]:
+            parts.append(_element("bitfield", member["bitfield"]))
+
+        for param in self._query(
+            "SELECT p.* FROM memberdef_param AS mp JOIN param AS p ON p.rowid = mp.param_id"
+            " WHERE mp.memberdef_id = ? ORDER BY mp.rowid",
+            member["rowid"],
+        ):
+            parts.append(
+                "<param>%s</param>"
+                % "".join(
+                    _element(tag, param[tag])
+                    for tag in ("attributes", "type", "declname", "defname", "array", "defval")
+                    if param[tag]
+                )
+            )
+
+        if member["kind"] == "enum":
+            parts.extend(self._enumvalues_xml(member["rowid"]))
+        if member["initializer"]:
+            parts.append(_element("initializer", member["initializer"]))
+
+        parts.append(_description("briefdescription", member["briefdescription"]))
+        parts.append(_description("detaileddescription", member["detaileddescription"]))
+        parts.append(_description("inbodydescription", member["inbodydescription"]))
+        if member["file_id"] in paths:
+            parts.append(
+                _element(
+                    "location",
+                    None,
+                    file=paths[member["file_id"]],
+                    line=member["line"],
+                    bodyfile=paths.get(member["bodyfile_id"]),
+                    bodystart=member["bodystart"],
+                    bodyend=member["bodyend"],
+                )
+            )
+
+        attributes: List[Tuple[str, str]] = [
+            ("kind", member["kind"]),
+            ("id", member["refid"]),
+            ("prot", prot),
+            ("static", _yes_no(member["static"])),
+            ("const", _yes_no(member["const"])),
+            ("explicit", _yes_no(member["explicit"])),
+            ("inline", _yes_no(member["inline"])),
+            ("virt", _VIRTUALNESS.get(member["virt"], "non-virtual")),
+        ]
+        return "<memberdef %s>%s</memberdef>" % (
+            " ".join("%s=%s" % (name, quoteattr(value)) for name, value in attributes),
+            "".join(parts),
+        )
+
+    def _enumvalues_xml(self, enum_rowid: int) -> List[str]:
+        return [
+            "<enumvalue id=%s prot=%s>%s%s%s%s</enumvalue>"
+            % (
+                quoteattr(value["refid"]),
+                quoteattr(_PROTECTION.get(value["prot"], "public")),
+                _element("name", value["name"]),
+                _element("initializer", value["initializer"]) if value["initializer"] else "",
+                _description("briefdescription", value["briefdescription"]),
+                _description("detaileddescription", value["detaileddescription"]),
+            )
+            for value in self._query(
+                "SELECT md.*, r.refid FROM member AS m"
+                " JOIN memberdef AS md ON md.rowid = m.memberdef_rowid"
+                " JOIN refid AS r ON r.rowid = md.rowid"
+                " WHERE m.scope_rowid = ? AND md.kind = 'enumvalue' ORDER BY m.rowid",
+                enum_rowid,
+            )
+        ]
@@ -0,0 +1,184 @@
+"""
+Member Fragments
+================
+
+The directives for single members, e.g., ``doxygenfunction`` or ``doxygenvariable``, need one
+``memberdef`` out of a compound file, but parsing the compound file builds the whole file, which
+for a large namespace can be tens of megabytes of XML. Instead, the compound file is scanned once
+for the byte ranges of its members, which is a lot quicker than parsing it, and the ranges are
+stored in a small sidecar file in the doctree directory so that later builds don't scan it again.
+
+A member is then parsed from a fragment made of the start of the file up to its first
+``sectiondef``, i.e., the ``compounddef`` with its name, includes, template parameters, etc., the
+start of the section the member is in, the member itself and the rest of the file after the last
+``sectiondef``, i.e., the descriptions, location and list of all members of the compound. The
+fragment parses into the same structure as the whole file, holding only that member. Enum values
+are found through the enum they belong to.
+
+Fragments are only used for members found through the index, when a single member of the
+compound is needed. A directive searching for its target itself still parses every other compound
+file it looks into whole. Only plain XML files are indexed. Files read from archives or gzipped
+files are parsed whole.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Increment when the layout of the sidecar files changes
+INDEX_VERSION = 2
+
+_sectiondef_re = re.compile(rb"<sectiondef\b")
+_memberdef_re = re.compile(rb"<memberdef\b[^>]*?\sid=\"([^\"]*)\"")
+_enumvalue_re = re.compile(rb"<enumvalue\b[^>]*?\sid=\"([^\"]*)\"")
+
+_SECTION_END = b"</sectiondef>"
+
+
+def scan(data: bytes) -> Dict:
+    """Returns the byte ranges of the header, the start of each section, each member and the
+    trailer after the sections of the contents of a compound file. Enum values map to the range of
+    their enum."""
+
+    header = data.find(b"<sectiondef")
+    sections: List[Tuple[int, int]] = []
+    members: Dict[str, Tuple[int, int, int]] = {}
+    if header == -1:
+        return {"header": 0, "sections": sections, "members": members, "trailer": [0, 0]}
+
+    trailer = header
+    for section_match in _sectiondef_re.finditer(data, header):
+        start = section_match.start()
+        end = data.find(_SECTION_END, start)
+        if end == -1:
+            break
+        trailer = end + len(_SECTION_END)
+        first_member = data.find(b"<memberdef", start, end)
+        if first_member == -1:
+            continue
+        section = len(sections)
+        sections.append((start, first_member - start))
+
+        for member_match in _memberdef_re.finditer(data, first_member, end):
+            member_start = member_match.start()
+            member_end = data.find(b"</memberdef>", member_start, end)
+            if member_end == -1:
+                break
+            member_end += len(b"</memberdef>")
+            entry = (member_start, member_end - member_start, section)
+            members[member_match.group(1).decode("utf-8")] = entry
+            for enumvalue_match in _enumvalue_re.finditer(data, member_start, member_end):
+                members.setdefault(enumvalue_match.group(1).decode("utf-8"), entry)
+
+    return {
+        "header": header,
+        "sections": sections,
+        "members": members,
+        "trailer": [trailer, len(data) - trailer],
+    }
+
+
+def fragment(
+    read: Callable[[int, int], bytes], member_index: Dict, member_id: str
+) -> Optional[bytes]:
+    """Returns the fragment of the compound file which holds the member, or None if the member
+    isn't in the index. The contents of the file are read by offset and length."""
+
+    entry = member_index["members"].get(member_id)
+    if entry is None:
+        return None
+    start, length, section = entry
+    section_start, section_length = member_index["sections"][section]
+    return b"".join(
+        (
+            read(0, member_index["header"]),
+            read(section_start, section_length),
+            read(start, length),
+            _SECTION_END,
+            read(*member_index["trailer"]),
+        )
+    )
+
+
+def _stamp(filename: str) -> List[int]:
+    stat = os.stat(filename)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class MemberIndex:
+    """The member ranges of the compound files of the projects, kept in sidecar files in a
+    directory, e.g., the doctree directory of the build."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._indexes: Dict[str, Dict] = {}
+
+    def _sidecar_filename(self, filename: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:] + ".json")
+
+    def _load(self, filename: str, stamp: List[int]) -> Optional[Dict]:
+        member_index = self._indexes.get(filename)
+        if member_index is not None and member_index["stamp"] == stamp:
+            return member_index
+
+        try:
+            with open(self._sidecar_filename(filename)) as f:
+                member_index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if member_index.get("version") != INDEX_VERSION or member_index.get("stamp") != stamp:
+            return None
+        self._indexes[filename] = member_index
+        return member_index
+
+    def _store(self, filename: str, member_index: Dict) -> None:
+        self._indexes[filename] = member_index
+        sidecar = self._sidecar_filename(filename)
+        # Documents read in parallel may write the same file, so each writes its own first
+        temporary = "%s.%d.tmp" % (sidecar, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+            with open(temporary, "w") as f:
+                json.dump(member_index, f)
+            os.replace(temporary, sidecar)
+        except OSError:
+            # The index is still used for this build
+            pass
+
+    def parse_member(self, filename: str, member_id: str):
+        """Returns the tree of the compound file holding only the member, or None if the member
+        can't be found in the file."""
+
+        def read(offset: int, length: int) -> bytes:
+            f.seek(offset)
+            return f.read(length)
+
+        try:
+            stamp = _stamp(filename)
+            with open(filename, "rb") as f:
+                member_index = self._load(filename, stamp)
+                if member_index is None:
+                    data = f.read()
+                    member_index = scan(data)
+                    member_index["version"] = INDEX_VERSION
+                    member_index["stamp"] = stamp
+                    self._store(filename, member_index)
+                member_fragment = fragment(read, member_index, member_id)
+        except OSError:
+            return None
+
+        if member_fragment is None:
+            return None
+
+        from . import compound
+
+        try:
+            return compound.parse(io.BytesIO(member_fragment))
+        except compound.ParseError:
+            # Leave it to the parser of the whole file to report
+            return None
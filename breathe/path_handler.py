@@ -1,7 +1,12 @@
+from breathe import archive
+
 from sphinx.application import Sphinx
 
+import gzip
 import os
 
+from typing import IO
+
 
 def includes_directory(file_path: str):
     # Check for backslash or forward slash as we don't know what platform we're on and sometimes
@@ -12,7 +17,33 @@ def includes_directory(file_path: str):
 def resolve_path(app: Sphinx, directory: str, filename: str):
     """Returns a full path to the filename in the given directory assuming that if the directory
     path is relative, then it is relative to the conf.py directory.
+
+    The directory may be an archive, in which case the path points into the archive and should be
+    read with open_file.
     """
 
     # os.path.join does the appropriate handling if _project_path is an absolute path
     return os.path.join(app.confdir, directory, filename)
+
+
+def source_file(path: str) -> str:
+    """Returns the file on disk that the contents of path are read from by open_file."""
+
+    in_archive = archive.split_path(path)
+    if in_archive is not None:
+        return in_archive[0]
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        return path + ".gz"
+    return path
+
+
+def open_file(path: str) -> IO[bytes]:
+    """Opens path for reading, decompressing it on the fly if it lies inside an archive or only
+    exists gzipped, e.g. as index.xml.gz."""
+
+    in_archive = archive.split_path(path)
+    if in_archive is not None:
+        return archive.open_member(*in_archive)
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        return gzip.open(path + ".gz")
+    return open(path, "rb")
@@ -4,9 +4,11 @@ from sphinx.application import Sphinx
 
 import os
 import fnmatch
+import re
+from functools import lru_cache
 
 
-from typing import Dict
+from typing import Dict, List, Optional, Pattern, Tuple
 
 
 class ProjectError(BreatheError):
@@ -58,6 +60,10 @@ class ProjectInfo:
         self._source_path = source_path
         self._reference = reference
 
+        # The domain lookup is done for most rendered nodes so we cache the results per file
+        self._domain_patterns: Optional[Tuple[Optional[Pattern], List[str]]] = None
+        self._cached_domain_for_file = lru_cache(maxsize=4096)(self._find_domain_for_file)
+
     def name(self) -> str:
         return self._name
 
@@ -91,16 +97,38 @@ class ProjectInfo:
         return self._reference
 
     def domain_for_file(self, file_: str) -> str:
+        return self._cached_domain_for_file(file_)
+
+    def _get_domain_patterns(self) -> Tuple[Optional[Pattern], List[str]]:
+        """Combines all the breathe_domain_by_file_pattern entries into a single regular expression.
+
+        The last matching pattern determines the domain, whereas the regular expression stops at
+        the first matching alternative, so the patterns are combined in reverse order.
+        """
+
+        if self._domain_patterns is None:
+            items = list(self.app.config.breathe_domain_by_file_pattern.items())
+            alternatives = [
+                "(?P<p%d>%s)" % (index, fnmatch.translate(os.path.normcase(pattern)))
+                for index, (pattern, _) in reversed(list(enumerate(items)))
+            ]
+            regex = re.compile("|".join(alternatives)) if alternatives else None
+            self._domain_patterns = (regex, [domain for _, domain in items])
+        return self._domain_patterns
+
+    def _find_domain_for_file(self, file_: str) -> str:
         extension = file_.split(".")[-1]
         try:
             domain = self.app.config.breathe_domain_by_extension[extension]
         except KeyError:
             domain = ""
 
-        domainFromFilePattern = self.app.config.breathe_domain_by_file_pattern
-        for pattern, pattern_domain in domainFromFilePattern.items():
-            if fnmatch.fnmatch(file_, pattern):
-                domain = pattern_domain
+        regex, pattern_domains = self._get_domain_patterns()
+        if regex is not None:
+            match = regex.match(os.path.normcase(file_))
+            if match is not None:
+                assert match.lastgroup is not None
+                domain = pattern_domains[int(match.lastgroup[1:])]
 
         return domain
 
@@ -1,6 +1,8 @@
 from docutils import nodes
 import textwrap
 
+from typing import Iterator, Optional, Sequence
+
 
 def format_parser_error(name, error, filename, state, lineno, do_unicode_warning):
     warning = '%s: Unable to parse xml file "%s". ' % (name, filename)
@@ -34,17 +36,76 @@ def format_parser_error(name, error, filename, state, lineno, do_unicode_warning
     ]
 
 
+class NodeStack:
+    """Immutable stack of Doxygen nodes, with the most recently pushed node at index 0.
+
+    Pushing a node creates a new stack which shares all the existing entries with the stack it was
+    pushed on to, so walking down a deep hierarchy doesn't have to copy the list of ancestors for
+    every visited node.
+    """
+
+    __slots__ = ("head", "tail", "_len")
+
+    def __init__(self, head, tail: Optional["NodeStack"] = None) -> None:
+        self.head = head
+        self.tail = tail
+        self._len = 1 if tail is None else tail._len + 1
+
+    @staticmethod
+    def from_sequence(sequence: Sequence) -> Optional["NodeStack"]:
+        """Create a stack from a sequence whose first entry is the top of the stack."""
+
+        if isinstance(sequence, NodeStack):
+            return sequence
+
+        result = None
+        for entry in reversed(sequence):
+            result = NodeStack(entry, result)
+        return result
+
+    def push(self, node) -> "NodeStack":
+        return NodeStack(node, self)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        stack: Optional[NodeStack] = self
+        while stack is not None:
+            yield stack.head
+            stack = stack.tail
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index == slice(1, None, None):
+                # The common case of 'all the ancestors' doesn't need a copy
+                return self.tail if self.tail is not None else []
+            return list(self)[index]
+
+        if index < 0:
+            index += self._len
+        if index < 0 or index >= self._len:
+            raise IndexError("node stack index out of range")
+
+        stack = self
+        for _ in range(index):
+            stack = stack.tail
+        return stack.head
+
+    def __repr__(self) -> str:
+        return "NodeStack(%r)" % list(self)
+
+
 class RenderContext:
     def __init__(
         self, node_stack, mask_factory, directive_args, domain: str = "", child: bool = False
     ) -> None:
-        self.node_stack = node_stack
+        self.node_stack = NodeStack.from_sequence(node_stack)
         self.mask_factory = mask_factory
         self.directive_args = directive_args
         self.domain = domain
         self.child = child
 
     def create_child_context(self, data_object) -> "RenderContext":
-        node_stack = self.node_stack[:]
-        node_stack.insert(0, self.mask_factory.mask(data_object))
+        node_stack = NodeStack(self.mask_factory.mask(data_object), self.node_stack)
         return RenderContext(node_stack, self.mask_factory, self.directive_args, self.domain, True)
@@ -0,0 +1,248 @@
+"""
+Render Cache
+============
+
+The same class or function is frequently rendered in several documents, e.g., on an overview page
+and on a per-module page. Without caching each of those renders walks the Doxygen tree, runs the
+domain directives and parses any embedded reStructuredText again.
+
+The render cache stores the docutils nodes produced by a directive render against a key made up of
+everything that influences that output, and hands out deep copies for subsequent identical
+renders within the same build.
+
+Results are only reused within the document they were rendered for. The rendered nodes refer to
+their document, e.g., the ``refdoc`` of cross-references and the ``docname`` of formulas, and
+rendering registers the declarations with the C and C++ domains for that document, which a copy in
+another document would skip. The ids of the targets the original render registered with the
+document are stripped from the copies.
+
+The parsed reStructuredText of ``embed:rst`` verbatim blocks is cached separately, as the same
+documentation comment shows up whenever its symbol is rendered. Only self-contained results are
+kept, i.e., those without targets, cross-references or other nodes which tie them to the document
+and context they were parsed in.
+
+The C and C++ domain directives parse the declarations Breathe hands them and the same
+declarations, e.g., getters, operators and template boilerplate, recur throughout a project. The
+declaration cache keeps the parsed declarations. Registering a declaration with the domain links
+its top level node to the new symbol, so each use gets a copy of that node while the nodes below
+it, which aren't modified after parsing, are shared.
+"""
+
+from breathe.project import ProjectInfo
+from breathe.renderer.filter import Filter, filter_fingerprint
+
+from sphinx import addnodes
+
+from docutils import nodes
+from docutils.nodes import Node
+
+import copy
+
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+RenderKey = Tuple[Hashable, ...]
+
+
+def _node_identity(node) -> Hashable:
+    """Returns a hashable description of a Doxygen node, good enough to tell nodes apart."""
+
+    if isinstance(node, str):
+        return node
+
+    node_type = getattr(node, "node_type", None)
+    identifier = getattr(node, "refid", None) or getattr(node, "id", None)
+    if identifier is None:
+        identifier = getattr(node, "name", None)
+    return (node_type, identifier)
+
+
+def _node_domain(project_info: ProjectInfo, node) -> str:
+    """Returns the domain of a Doxygen node as far as it can be determined without parsing."""
+
+    try:
+        filename = node.location.file
+    except AttributeError:
+        return ""
+    return project_info.domain_for_file(filename) if filename else ""
+
+
+def _copy_node(node: Node) -> Node:
+    """Deep copies a docutils node.
+
+    Node.deepcopy() can't be used as the constructors of some Sphinx nodes, e.g., desc_sig_space,
+    create default children which are then duplicated by the copied children.
+    """
+
+    if not isinstance(node, nodes.Element):
+        return node.deepcopy()
+    result = node.copy()
+    result.children = []
+    result.extend([_copy_node(child) for child in node.children])
+    return result
+
+
+def _descendants(node: Node) -> Iterator[Node]:
+    """Returns the node and all the nodes below it."""
+
+    # Node.traverse is deprecated in favour of Node.findall since docutils 0.18.1
+    if hasattr(node, "findall"):
+        return node.findall()
+    return iter(node.traverse())
+
+
+def _normalize_options(options: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(
+        sorted((key, "" if value is None else str(value)) for key, value in options.items())
+    )
+
+
+class RenderCache:
+    """Maps render keys to the docutils nodes produced for them."""
+
+    def __init__(self) -> None:
+        self._store: Dict[RenderKey, List[Node]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def create_key(
+        self,
+        project_info: ProjectInfo,
+        node_stack,
+        directive_name: str,
+        options: Dict[str, Any],
+        filter_: Filter,
+        docname: str,
+    ) -> RenderKey:
+        return (
+            project_info.name(),
+            tuple(_node_identity(node) for node in node_stack),
+            directive_name,
+            _normalize_options(options),
+            _node_domain(project_info, node_stack[0]),
+            filter_fingerprint(filter_),
+            docname,
+        )
+
+    def get(self, key: RenderKey, document: nodes.document) -> Optional[List[Node]]:
+        """Returns a copy of the nodes stored under key, re-homed to the given document, or None
+        if there is no entry for the key."""
+
+        try:
+            stored = self._store[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = [_copy_node(node) for node in stored]
+        for node in result:
+            for child in _descendants(node):
+                child.document = document
+                if isinstance(child, nodes.Element) and child["ids"]:
+                    # The original render already registered these ids with this document so drop
+                    # them from the copy rather than emitting duplicate ids
+                    child["ids"] = [id_ for id_ in child["ids"] if id_ not in document.ids]
+                    child["names"] = [n for n in child["names"] if n not in document.nameids]
+        return result
+
+    def store(self, key: RenderKey, rendered: List[Node]) -> None:
+        self._store[key] = [_copy_node(node) for node in rendered]
+
+    def clear(self) -> None:
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Parsing reStructuredText that produces these nodes registers state with the document or captures
+# the current context, so results containing them can't be reused elsewhere
+_CONTEXT_DEPENDENT_NODES = (
+    addnodes.pending_xref,
+    nodes.pending,
+    nodes.system_message,
+    nodes.target,
+    nodes.substitution_definition,
+    nodes.footnote,
+    nodes.footnote_reference,
+    nodes.citation,
+    nodes.citation_reference,
+)
+
+
+def _is_self_contained(node: Node) -> bool:
+    for child in _descendants(node):
+        if isinstance(child, _CONTEXT_DEPENDENT_NODES):
+            return False
+        if isinstance(child, nodes.Element) and (
+            child["ids"] or child["names"] or "refname" in child
+        ):
+            return False
+    return True
+
+
+class ParsedRstCache:
+    """Maps the normalized text and embed variant of embedded reStructuredText to the nodes it
+    was parsed into."""
+
+    def __init__(self) -> None:
+        self._store: Dict[Hashable, List[Node]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, document: nodes.document) -> Optional[List[Node]]:
+        try:
+            stored = self._store[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = [_copy_node(node) for node in stored]
+        for node in result:
+            for child in _descendants(node):
+                child.document = document
+        return result
+
+    def store(self, key: Hashable, parsed: List[Node]) -> None:
+        if all(_is_self_contained(node) for node in parsed):
+            self._store[key] = [_copy_node(node) for node in parsed]
+
+    def clear(self) -> None:
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _copy_declaration(ast: Any) -> Any:
+    result = copy.copy(ast)
+    for attribute in ("symbol", "enumeratorScopedSymbol"):
+        if hasattr(result, attribute):
+            setattr(result, attribute, None)
+    return result
+
+
+class DeclarationCache:
+    """Maps the domain, object type and text of declarations to the ASTs they were parsed into."""
+
+    def __init__(self) -> None:
+        self._store: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            stored = self._store[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return _copy_declaration(stored)
+
+    def store(self, key: Hashable, ast: Any) -> None:
+        self._store[key] = _copy_declaration(ast)
+
+    def clear(self) -> None:
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
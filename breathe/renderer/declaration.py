@@ -0,0 +1,378 @@
+"""
+C++ Declarations
+================
+
+The C++ domain directives take the declaration of the entity they describe as text and parse it
+into an AST. Breathe assembles that text from the members in the Doxygen XML, so the information
+goes from structured data to text and back again for every member that is rendered.
+
+For the simplest members the AST is built here from the fields of the member instead and handed
+to the directive so that it doesn't need to parse anything. These are functions, variables,
+typedefs, enums and enumerators whose types are a single name, e.g., ``int``, ``std::size_t`` or a
+reference to a class, and whose names are plain identifiers. Doxygen gives the type of a member as
+text with references, so a type made of anything more than one name, e.g., ``const Widget &``, is
+not picked apart here. Those declarations are left to the domain, which parses them with
+``cpp.DefinitionParser`` as usual.
+
+The ASTs must be exactly the ones the parser would produce for the same declaration. The Sphinx
+classes are internal and change between versions, so the builders are checked against the parser
+once and not used at all if they don't agree.
+"""
+
+from sphinx.domains import cpp
+from sphinx.util.cfamily import ASTAttributeList
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# The type and declaration name of a parameter
+Param = Tuple[str, str]
+
+_identifier_re = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+
+# The fundamental types which make up a type on their own, with the same name when canonicalized
+_FUNDAMENTAL_TYPES = {
+    "void",
+    "bool",
+    "char",
+    "wchar_t",
+    "char8_t",
+    "char16_t",
+    "char32_t",
+    "int",
+    "float",
+    "double",
+}
+
+# Words which may appear on their own in the type of a member but which the parser doesn't read as
+# a name, so that the declarations with them are left to it
+_NOT_NAMES = {
+    "auto",
+    "decltype",
+    "signed",
+    "unsigned",
+    "short",
+    "long",
+    "__int64",
+    "__int128",
+    "const",
+    "volatile",
+    "typename",
+    "class",
+    "struct",
+    "enum",
+    "union",
+    "operator",
+    "this",
+    "nullptr",
+}
+
+# The decl-specifiers the parser looks for with each kind of declaration. It leaves the ones it
+# never looked for as None and the others as booleans
+_SPECIFIERS = {
+    None: {"const", "volatile"},
+    "type": {"const", "volatile"},
+    "member": {"const", "volatile", "inline", "constexpr", "constinit", "threadLocal"},
+    "function": {"const", "volatile", "inline", "constexpr", "consteval", "friend", "virtual"},
+}
+_FLAGS = [
+    "threadLocal",
+    "inline",
+    "virtual",
+    "consteval",
+    "constexpr",
+    "constinit",
+    "volatile",
+    "const",
+    "friend",
+]
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _text(item) -> str:
+    if item.category == item.CategoryText:
+        return item.value
+    # A reference, whose text is the name it refers to
+    return "".join(_text(child) for child in item.value.content_)
+
+
+def simple_type(linked_text) -> Optional[str]:
+    """Returns the type of a member or parameter if it is a single piece of text or a single
+    reference, which the builders then check for being a name."""
+
+    if linked_text is None:
+        return None
+    if isinstance(linked_text, str):
+        return linked_text.strip() or None
+    items = [
+        item
+        for item in linked_text.content_
+        if item.category != item.CategoryText or item.value.strip()
+    ]
+    if len(items) != 1:
+        return None
+    item = items[0]
+    if item.category != item.CategoryText and item.name != "ref":
+        return None
+    return _text(item).strip()
+
+
+def _attributes() -> ASTAttributeList:
+    return ASTAttributeList(attrs=[])
+
+
+def _nested_name(name: str) -> cpp.ASTNestedName:
+    names = []
+    for identifier in name.split("::"):
+        if not _identifier_re.match(identifier) or identifier in _NOT_NAMES:
+            raise _Unsupported()
+        if identifier in _FUNDAMENTAL_TYPES:
+            raise _Unsupported()
+        names.append(
+            cpp.ASTNestedNameElement(identOrOp=cpp.ASTIdentifier(identifier), templateArgs=None)
+        )
+    return cpp.ASTNestedName(names=names, templates=[False] * len(names), rooted=False)
+
+
+def _trailing_type_spec(type_: str) -> cpp.ASTTrailingTypeSpec:
+    if type_ in _FUNDAMENTAL_TYPES:
+        return cpp.ASTTrailingTypeSpecFundamental(names=[type_], canonNames=[type_])
+    return cpp.ASTTrailingTypeSpecName(
+        prefix=None, nestedName=_nested_name(type_), placeholderType=None
+    )
+
+
+def _simple_specs(
+    outer: Optional[str], storage: Optional[str] = None, **flags: bool
+) -> cpp.ASTDeclSpecsSimple:
+    values: Dict[str, Any] = {
+        flag: (False if flag in _SPECIFIERS[outer] else None) for flag in _FLAGS
+    }
+    values.update(flags)
+    return cpp.ASTDeclSpecsSimple(storage=storage, explicitSpec=None, attrs=_attributes(), **values)
+
+
+def _type(
+    outer: Optional[str],
+    type_: str,
+    declId: Optional[cpp.ASTNestedName],
+    left: Optional[cpp.ASTDeclSpecsSimple] = None,
+    paramQual: Optional[cpp.ASTParametersQualifiers] = None,
+) -> cpp.ASTType:
+    declSpecs = cpp.ASTDeclSpecs(
+        outer=outer,
+        leftSpecs=left or _simple_specs(outer),
+        rightSpecs=_simple_specs(outer),
+        trailing=_trailing_type_spec(type_),
+    )
+    decl = cpp.ASTDeclaratorNameParamQual(declId=declId, arrayOps=[], paramQual=paramQual)
+    return cpp.ASTType(declSpecs=declSpecs, decl=decl)
+
+
+def _storage(specifiers: Sequence[str], allowed: Sequence[str]) -> Optional[str]:
+    storage = [specifier for specifier in specifiers if specifier in allowed]
+    if len(storage) > 1:
+        raise _Unsupported()
+    return storage[0] if storage else None
+
+
+def _build_function(
+    specifiers: Sequence[str], type_: str, name: str, params: Sequence[Param], const: bool
+) -> cpp.ASTDeclaration:
+    if not set(specifiers) <= {"static", "inline", "friend", "virtual"}:
+        raise _Unsupported()
+    args = []
+    for param_type, declname in params:
+        declId = _nested_name(declname) if declname else None
+        if declname and "::" in declname:
+            raise _Unsupported()
+        param = cpp.ASTTypeWithInit(type=_type(None, param_type, declId), init=None)
+        args.append(cpp.ASTFunctionParameter(arg=param))
+    paramQual = cpp.ASTParametersQualifiers(
+        args=args,
+        volatile=False,
+        const=const,
+        refQual=None,
+        exceptionSpec=None,
+        trailingReturn=None,
+        override=False,
+        final=False,
+        attrs=_attributes(),
+        initializer=None,
+    )
+    left = _simple_specs(
+        "function",
+        _storage(specifiers, ["static"]),
+        **{flag: True for flag in specifiers if flag != "static"}
+    )
+    declaration = _type("function", type_, _nested_name(name), left, paramQual)
+    return cpp.ASTDeclaration(
+        objectType="function", directiveType="function", declaration=declaration
+    )
+
+
+def _build_variable(specifiers: Sequence[str], type_: str, name: str) -> cpp.ASTDeclaration:
+    if not set(specifiers) <= {"static", "mutable"}:
+        raise _Unsupported()
+    left = _simple_specs("member", _storage(specifiers, ["static", "mutable"]))
+    declaration = cpp.ASTTypeWithInit(
+        type=_type("member", type_, _nested_name(name), left), init=None
+    )
+    return cpp.ASTDeclaration(objectType="member", directiveType="var", declaration=declaration)
+
+
+def _build_typedef(type_: str, name: str) -> cpp.ASTDeclaration:
+    declaration = _type("type", type_, _nested_name(name))
+    return cpp.ASTDeclaration(objectType="type", directiveType="type", declaration=declaration)
+
+
+def _build_enum(name: str, directive_type: str, underlying_type: str) -> cpp.ASTDeclaration:
+    underlying = _type(None, underlying_type, None) if underlying_type else None
+    declaration = cpp.ASTEnum(
+        name=_nested_name(name), scoped=None, underlyingType=underlying, attrs=_attributes()
+    )
+    return cpp.ASTDeclaration(
+        objectType="enum", directiveType=directive_type, declaration=declaration
+    )
+
+
+def _build_enumerator(name: str) -> cpp.ASTDeclaration:
+    declaration = cpp.ASTEnumerator(name=_nested_name(name), init=None, attrs=_attributes())
+    return cpp.ASTDeclaration(
+        objectType="enumerator", directiveType="enumerator", declaration=declaration
+    )
+
+
+def _parse(text: str, object_type: str, directive_type: str) -> cpp.ASTDeclaration:
+    class Config:
+        cpp_id_attributes: List[str] = []
+        cpp_paren_attributes: List[str] = []
+
+    parser = cpp.DefinitionParser(text, location=None, config=Config)
+    ast = parser.parse_declaration(object_type, directive_type)
+    parser.assert_end()
+    return ast
+
+
+@lru_cache(maxsize=None)
+def _supported() -> bool:
+    """Checks the builders against the parser of the installed version of Sphinx."""
+
+    checks = [
+        (
+            _build_function,
+            (["static"], "size_t", "ns::Widget::size", [("int", "index"), ("Widget", "")], True),
+            "static size_t ns::Widget::size(int index, Widget) const",
+            "function",
+            "function",
+        ),
+        (
+            _build_function,
+            (["virtual", "inline"], "void", "draw", [], False),
+            "virtual inline void draw()",
+            "function",
+            "function",
+        ),
+        (
+            _build_variable,
+            (["mutable"], "std::string", "ns::Widget::name"),
+            "mutable std::string ns::Widget::name",
+            "member",
+            "var",
+        ),
+        (_build_typedef, ("double", "ns::Real"), "double ns::Real", "type", "type"),
+        (
+            _build_enum,
+            ("ns::Color", "enum-class", "char"),
+            "ns::Color : char",
+            "enum",
+            "enum-class",
+        ),
+        (_build_enumerator, ("Red",), "Red", "enumerator", "enumerator"),
+    ]
+    try:
+        for build, args, text, object_type, directive_type in checks:
+            if build(*args) != _parse(text, object_type, directive_type):  # type: ignore
+                return False
+    except Exception:
+        return False
+    return True
+
+
+def _build(config, names: Sequence[str], build, *args) -> Optional[cpp.ASTDeclaration]:
+    if not _supported():
+        return None
+    # The parser reads these as attributes rather than as names
+    attributes = set(config.cpp_id_attributes) | set(config.cpp_paren_attributes)
+    if any(part in attributes for name in names for part in name.split("::")):
+        return None
+    try:
+        return build(*args)
+    except _Unsupported:
+        return None
+
+
+def function_declaration(
+    config, specifiers: List[str], node, name: str
+) -> Optional[cpp.ASTDeclaration]:
+    """Returns the AST for "<specifiers> <type> <name><argsstring>" of the function member without
+    a template prefix if it can be built from its fields."""
+
+    type_ = simple_type(node.get_type())
+    if not type_:
+        return None
+    params = []
+    for param in node.param:
+        param_type = simple_type(param.type_)
+        if not param_type or param.array or param.defval:
+            return None
+        params.append((param_type, param.declname or ""))
+
+    # The argsstring is what the domain sees, so it can't hold anything else, e.g., noexcept
+    const = node.const == "yes"
+    argsstring = "(%s)%s" % (
+        ", ".join(" ".join(filter(None, param)) for param in params),
+        " const" if const else "",
+    )
+    if node.get_argsstring() != argsstring:
+        return None
+
+    names = [type_, name] + [part for param in params for part in param]
+    return _build(config, names, _build_function, specifiers, type_, name, params, const)
+
+
+def variable_declaration(
+    config, specifiers: List[str], node, name: str
+) -> Optional[cpp.ASTDeclaration]:
+    """Returns the AST for "<specifiers> <type> <name>" of the variable member without a template
+    prefix or initializer if it can be built from its fields."""
+
+    type_ = simple_type(node.get_type())
+    if not type_ or node.get_argsstring():
+        return None
+    return _build(config, [type_, name], _build_variable, specifiers, type_, name)
+
+
+def typedef_declaration(config, node, name: str) -> Optional[cpp.ASTDeclaration]:
+    type_ = simple_type(node.get_type())
+    if not type_ or node.get_argsstring():
+        return None
+    return _build(config, [type_, name], _build_typedef, type_, name)
+
+
+def enum_declaration(config, node, name: str, directive_type: str) -> Optional[cpp.ASTDeclaration]:
+    underlying_type = ""
+    if directive_type == "enum-class" and node.type_ is not None and node.type_.content_:
+        underlying_type = simple_type(node.type_) or ""
+        if not underlying_type:
+            return None
+    names = [name, underlying_type] if underlying_type else [name]
+    return _build(config, names, _build_enum, name, directive_type, underlying_type)
+
+
+def enumerator_declaration(config, name: str) -> Optional[cpp.ASTDeclaration]:
+    return _build(config, [name], _build_enumerator, name)
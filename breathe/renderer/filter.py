@@ -204,7 +204,7 @@ from breathe import path_handler
 from sphinx.application import Sphinx
 
 import os
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Hashable, List
 
 
 class UnrecognisedKindError(Exception):
@@ -554,6 +554,29 @@ class Gather(Filter):
 ###############################################################################
 
 
+def filter_fingerprint(entry) -> Hashable:
+    """Returns a hashable value describing the structure of a filter hierarchy.
+
+    Two filters built from the same options have the same fingerprint, which allows filters to be
+    used as part of cache keys even though they don't implement equality themselves.
+    """
+
+    if isinstance(entry, (Filter, Selector, Accessor, Glob)):
+        return (type(entry).__name__,) + tuple(
+            (name, filter_fingerprint(value)) for name, value in sorted(vars(entry).items())
+        )
+    if isinstance(entry, (list, tuple)):
+        return tuple(filter_fingerprint(value) for value in entry)
+    if isinstance(entry, (set, frozenset)):
+        return tuple(sorted(repr(value) for value in entry))
+    if callable(entry):
+        code = getattr(entry, "__code__", None)
+        if code is not None:
+            return (code.co_filename, code.co_firstlineno, code.co_code)
+        return repr(entry)
+    return entry
+
+
 class Glob:
     def __init__(self, method, pattern):
         self.method = method
@@ -0,0 +1,155 @@
+"""
+DOT Graphs
+==========
+
+Doxygen lists the nodes and edges of its include, inheritance and collaboration graphs in the XML
+output and these are translated into DOT source for Sphinx's graphviz extension.
+
+Include graphs of large projects can have thousands of nodes, which Graphviz takes a very long
+time to lay out and which aren't readable anyway. Graphs can be limited to a number of nodes and
+to the nodes within a number of edges of the node the graph is for. Whatever is left out is
+replaced by a single node saying how many nodes were dropped.
+
+The same graph is typically shown in several documents, e.g., the include graph of a header on
+the page of each of its classes, so the DOT source is kept for each graph that has been
+translated.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+# use graphs' legend from doxygen (v1.9.1)
+# most colors can be changed via `graphviz_dot_args` in conf.py
+EDGE_COLORS = {
+    # blue (#1414CE) doesn't contrast well in dark mode.
+    # "public-inheritance": "1414CE",  # allow user to customize this one
+    "private-inheritance": "8B1A1A",  # hardcoded
+    "protected-inheritance": "006400",  # hardcoded
+    # the following are demonstrated in the doxygen graphs' legend, but
+    # these don't show in XML properly (bug?); these keys are fiction.
+    "used-internal": "9C35CE",  # should also be dashed
+    "template-instantiated-inheritance": "FFA500",  # should also be dashed
+}
+
+# Doxygen numbers the nodes of a graph starting with the compound the graph is for
+FOCUS_NODE_ID = "1"
+
+TRUNCATED_NODE_ID = "truncated"
+
+
+def _select_nodes(graph_nodes: List, max_nodes: int, max_depth: int) -> List:
+    """Returns the nodes to draw, in their original order, picking the ones closest to the focus
+    node first. A limit of 0 means no limit."""
+
+    if not max_nodes and not max_depth:
+        return graph_nodes
+
+    # The edges are followed in either direction as e.g. the base classes in an inheritance graph
+    # point at the focus node rather than the other way around
+    neighbours: Dict[str, List[str]] = {g_node.get_id(): [] for g_node in graph_nodes}
+    for g_node in graph_nodes:
+        for child_node in g_node.childnode:
+            refid = child_node.get_refid()
+            if refid in neighbours:
+                neighbours[g_node.get_id()].append(refid)
+                neighbours[refid].append(g_node.get_id())
+
+    focus = FOCUS_NODE_ID if FOCUS_NODE_ID in neighbours else graph_nodes[0].get_id()
+    selected = {focus}
+    frontier = [focus]
+    depth = 0
+    while frontier and (not max_depth or depth < max_depth):
+        depth += 1
+        next_frontier = []
+        for node_id in frontier:
+            for neighbour in neighbours[node_id]:
+                if neighbour not in selected:
+                    if max_nodes and len(selected) >= max_nodes:
+                        break
+                    selected.add(neighbour)
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    return [g_node for g_node in graph_nodes if g_node.get_id() in selected]
+
+
+def create_dot(graph, max_nodes: int = 0, max_depth: int = 0) -> str:
+    """Returns the DOT source for a Doxygen graph, limited to at most max_nodes nodes and to the
+    nodes at most max_depth edges away from the focus node."""
+
+    graph_nodes = graph.get_node()
+    drawn = _select_nodes(graph_nodes, max_nodes, max_depth) if graph_nodes else graph_nodes
+    drawn_ids = {g_node.get_id() for g_node in drawn}
+    truncated = len(graph_nodes) - len(drawn)
+
+    # assemble the dot syntax we'll pass to the graphviz directive
+    lines = [
+        "digraph {",
+        '    graph [bgcolor="#00000000"]',  # transparent color for graph's bg
+        '    node [shape=rectangle style=filled fillcolor="#FFFFFF" font=Helvetica padding=2]',
+        '    edge [color="#1414CE"]',
+    ]
+    relations = []
+    direction = graph.get_direction()
+    for g_node in drawn:
+        node_id = g_node.get_id()
+        label = g_node.get_label()
+        attributes = 'label="%s" tooltip="%s"' % (label, label)
+        if node_id == FOCUS_NODE_ID:
+            # the disabled grey color is used in doxygen to indicate that the URL is
+            # not set (for the compound in focus). Setting this here doesn't allow
+            # further customization. Maybe remove this since URL is not used?
+            #
+            attributes += ' fillcolor="#BFBFBF"'  # hardcoded
+        # URLs from a doxygen refid won't work in sphinx graphviz; we can't convert
+        # the refid until all docs are built, and pending references are un-noticed
+        # within graphviz directives. Maybe someone wiser will find a way to do it.
+        #
+        # attributes += ' URL="%s"' % g_node.get_link().get_refid()
+        lines.append('    "%s" [%s]' % (node_id, attributes))
+
+        leads_out = False
+        for child_node in g_node.childnode:
+            refid = child_node.get_refid()
+            if truncated and refid not in drawn_ids:
+                leads_out = True
+                continue
+            relation = child_node.get_relation()
+            # edge labels don't appear in XML (bug?); use tooltip in meantime
+            edge = '    "%s" -> "%s" [dir=%s tooltip="%s"' % (node_id, refid, direction, relation)
+            if relation in EDGE_COLORS:
+                edge += ' color="#%s"' % EDGE_COLORS[relation]
+            relations.append(edge + "]")
+        if leads_out:
+            relations.append('    "%s" -> "%s" [style=dashed]' % (node_id, TRUNCATED_NODE_ID))
+
+    if truncated:
+        lines.append(
+            '    "%s" [label="%d more not shown" shape=plaintext style=""]'
+            % (TRUNCATED_NODE_ID, truncated)
+        )
+    lines.extend(relations)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+class DotCache:
+    """Keeps the DOT source created for each Doxygen graph.
+
+    The graphs are held weakly so that entries go away together with the parsed XML they came
+    from, e.g., when it is parsed again after changing.
+    """
+
+    def __init__(self) -> None:
+        self._store: "WeakKeyDictionary[object, Dict[Tuple[int, int], str]]" = WeakKeyDictionary()
+
+    def get(self, graph, max_nodes: int = 0, max_depth: int = 0) -> str:
+        by_limits = self._store.setdefault(graph, {})
+        dot: Optional[str] = by_limits.get((max_nodes, max_depth))
+        if dot is None:
+            dot = create_dot(graph, max_nodes, max_depth)
+            by_limits[(max_nodes, max_depth)] = dot
+        return dot
+
+    def clear(self) -> None:
+        self._store.clear()
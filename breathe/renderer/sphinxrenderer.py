@@ -1,11 +1,23 @@
 import os
 import sphinx
 
-from breathe.parser import compound, compoundsuper, DoxygenCompoundParser
+from breathe import path_handler
+from breathe.archive import ArchiveError
+from breathe.parser import DoxygenCompoundParser
 from breathe.project import ProjectInfo
 from breathe.renderer import RenderContext
+from breathe.renderer.cache import DeclarationCache, ParsedRstCache
+from breathe.renderer.declaration import (
+    enum_declaration,
+    enumerator_declaration,
+    function_declaration,
+    typedef_declaration,
+    variable_declaration,
+)
 from breathe.renderer.filter import Filter
+from breathe.renderer.graph import DotCache, create_dot
 from breathe.renderer.target import TargetHandler
+from breathe.renderer.text import TextCache, linked_text, string_text
 
 from sphinx import addnodes
 from sphinx.application import Sphinx
@@ -13,26 +25,19 @@ from sphinx.directives import ObjectDescription
 from sphinx.domains import cpp, c, python
 from sphinx.util.nodes import nested_parse_with_titles
 from sphinx.util import url_re
-from sphinx.ext.graphviz import graphviz
 
 from docutils import nodes
 from docutils.nodes import Node, TextElement
 from docutils.statemachine import StringList, UnexpectedIndentationError
 from docutils.parsers.rst.states import Text
 
-try:
-    from sphinxcontrib import phpdomain as php  # type: ignore
-except ImportError:
-    php = None
-
-try:
-    from sphinx_csharp import csharp as cs  # type: ignore
-except ImportError:
-    cs = None
-
 import re
 import textwrap
-from typing import Any, Callable, cast, Dict, List, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, cast, Dict, List, Optional, Tuple, Type, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from breathe.parser import compound, compoundsuper
 
 ContentCallback = Callable[[addnodes.desc_content], None]
 Declarator = Union[addnodes.desc_signature, addnodes.desc_signature_line]
@@ -61,14 +66,65 @@ class WithContext:
 class BaseObject:
     # Use this class as the first base class to make sure the overrides are used.
     # Set the content_callback attribute to a function taking a docutils node.
+    # The last signature node and the content node are remembered while the directive runs so
+    # that the renderer doesn't need to search the resulting nodes for them.
+
+    breathe_signature: Optional[addnodes.desc_signature] = None
+    breathe_content: Optional[addnodes.desc_content] = None
+    # The AST of the declaration if the renderer built it directly
+    breathe_ast: Any = None
+
+    def handle_signature(self, sig: str, signode: addnodes.desc_signature) -> Any:
+        self.breathe_signature = signode
+        return super().handle_signature(sig, signode)  # type: ignore
+
+    def parse_definition(self, parser) -> Any:
+        # Only called by the C and C++ domains, which parse the declarations of their directives
+        if self.breathe_ast is not None:
+            parser.pos = parser.end
+            return self.breathe_ast
+
+        cache: Optional[DeclarationCache] = self.env.temp_data.get(  # type: ignore
+            "breathe_declaration_cache"
+        )
+        if cache is None:
+            return super().parse_definition(parser)  # type: ignore
+
+        key = (type(parser), self.object_type, self.objtype, parser.definition)  # type: ignore
+        ast = cache.get(key)
+        if ast is not None:
+            # Leave the parser at the end of the definition as if it had parsed it
+            parser.pos = parser.end
+            return ast
+
+        ast = super().parse_definition(parser)  # type: ignore
+        # Declarations with trailing text fail to parse as a whole so they aren't kept
+        parser.skip_ws()
+        if parser.eof:
+            cache.store(key, ast)
+        return ast
 
     def transform_content(self, contentnode: addnodes.desc_content) -> None:
+        self.breathe_content = contentnode
         super().transform_content(contentnode)  # type: ignore
         callback = getattr(self, "breathe_content_callback", None)
         if callback is None:
             return
         callback(contentnode)
 
+    @property
+    def breathe_declarator(self) -> Optional[Declarator]:
+        """The node with the actual declarator rather than, e.g., "template <...>"."""
+        signode = self.breathe_signature
+        if signode is None:
+            return None
+        # In sphinx 1.5, there is now a desc_signature_line node within the desc_signature
+        # This should be used instead
+        for child in reversed(signode.children):
+            if isinstance(child, addnodes.desc_signature_line):
+                return child
+        return signode
+
 
 # ----------------------------------------------------------------------------
 
@@ -157,11 +213,20 @@ class PyClasslike(BaseObject, python.PyClasslike):
 
 # ----------------------------------------------------------------------------
 
-# Create multi-inheritance classes to merge BaseObject from Breathe with
-# classes from phpdomain.
+# The PHP and C# domains are provided by optional packages, so they are only imported and the
+# multi-inheritance classes merging BaseObject with their directives only created on first use.
 # We use capitalization (and the namespace) to differentiate between the two
 
-if php is not None:
+
+@lru_cache(maxsize=None)
+def _php_domain() -> Optional[Tuple[Any, Dict[str, Tuple[Type[ObjectDescription], str]]]]:
+    """Returns the phpdomain module and the directives for its object types, or None if
+    sphinxcontrib-phpdomain isn't installed."""
+
+    try:
+        from sphinxcontrib import phpdomain as php  # type: ignore
+    except ImportError:
+        return None
 
     class PHPNamespaceLevel(BaseObject, php.PhpNamespacelevel):
         """Description of a PHP item *in* a namespace (not the space itself)."""
@@ -177,10 +242,25 @@ if php is not None:
     class PHPGlobalLevel(BaseObject, php.PhpGloballevel):
         pass
 
+    php_classes = {
+        "function": (PHPNamespaceLevel, "function"),
+        "class": (PHPClassLike, "class"),
+        "attr": (PHPClassMember, "attr"),
+        "method": (PHPClassMember, "method"),
+        "global": (PHPGlobalLevel, "global"),
+    }
+    return php, php_classes
 
-# ----------------------------------------------------------------------------
 
-if cs is not None:
+@lru_cache(maxsize=None)
+def _cs_classes() -> Optional[Dict[str, Tuple[Type[ObjectDescription], str]]]:
+    """Returns the directives for the C# object types, or None if sphinx-csharp isn't
+    installed."""
+
+    try:
+        from sphinx_csharp import csharp as cs  # type: ignore
+    except ImportError:
+        return None
 
     class CSharpCurrentNamespace(BaseObject, cs.CSharpCurrentNamespace):
         pass
@@ -227,6 +307,24 @@ if cs is not None:
     class CSharpXRefRole(BaseObject, cs.CSharpXRefRole):
         pass
 
+    return {
+        # 'doxygen-name': (CSharp class, key in CSharpDomain.object_types)
+        "namespace": (CSharpNamespacePlain, "namespace"),
+        "class": (CSharpClass, "class"),
+        "struct": (CSharpStruct, "struct"),
+        "interface": (CSharpInterface, "interface"),
+        "function": (CSharpMethod, "function"),
+        "method": (CSharpMethod, "method"),
+        "variable": (CSharpVariable, "var"),
+        "property": (CSharpProperty, "property"),
+        "event": (CSharpEvent, "event"),
+        "enum": (CSharpEnum, "enum"),
+        "enumvalue": (CSharpEnumValue, "enumerator"),
+        "attribute": (CSharpAttribute, "attr"),
+        # Fallback to cpp domain
+        "typedef": (CPPTypeObject, "type"),
+    }
+
 
 # ----------------------------------------------------------------------------
 
@@ -273,35 +371,6 @@ class DomainDirectiveFactory:
         "namespace": (PyClasslike, "class"),
     }
 
-    if php is not None:
-        php_classes = {
-            "function": (PHPNamespaceLevel, "function"),
-            "class": (PHPClassLike, "class"),
-            "attr": (PHPClassMember, "attr"),
-            "method": (PHPClassMember, "method"),
-            "global": (PHPGlobalLevel, "global"),
-        }
-        php_classes_default = php_classes["class"]  # Directive when no matching ones were found
-
-    if cs is not None:
-        cs_classes = {
-            # 'doxygen-name': (CSharp class, key in CSharpDomain.object_types)
-            "namespace": (CSharpNamespacePlain, "namespace"),
-            "class": (CSharpClass, "class"),
-            "struct": (CSharpStruct, "struct"),
-            "interface": (CSharpInterface, "interface"),
-            "function": (CSharpMethod, "function"),
-            "method": (CSharpMethod, "method"),
-            "variable": (CSharpVariable, "var"),
-            "property": (CSharpProperty, "property"),
-            "event": (CSharpEvent, "event"),
-            "enum": (CSharpEnum, "enum"),
-            "enumvalue": (CSharpEnumValue, "enumerator"),
-            "attribute": (CSharpAttribute, "attr"),
-            # Fallback to cpp domain
-            "typedef": (CPPTypeObject, "type"),
-        }
-
     @staticmethod
     def create(domain: str, args) -> ObjectDescription:
         cls = cast(Type[ObjectDescription], None)
@@ -310,7 +379,8 @@ class DomainDirectiveFactory:
             cls, name = DomainDirectiveFactory.c_classes[args[0]]
         elif domain == "py":
             cls, name = DomainDirectiveFactory.python_classes[args[0]]
-        elif php is not None and domain == "php":
+        elif domain == "php" and _php_domain() is not None:
+            php, php_classes = _php_domain()  # type: ignore
             separators = php.separators
             arg_0 = args[0]
             if any([separators["method"] in n for n in args[1]]):
@@ -322,13 +392,14 @@ class DomainDirectiveFactory:
                 if arg_0 in ["variable"]:
                     arg_0 = "global"
 
-            if arg_0 in DomainDirectiveFactory.php_classes:
-                cls, name = DomainDirectiveFactory.php_classes[arg_0]  # type: ignore
+            if arg_0 in php_classes:
+                cls, name = php_classes[arg_0]
             else:
-                cls, name = DomainDirectiveFactory.php_classes_default  # type: ignore
+                # Directive when no matching ones were found
+                cls, name = php_classes["class"]
 
-        elif cs is not None and domain == "cs":
-            cls, name = DomainDirectiveFactory.cs_classes[args[0]]
+        elif domain == "cs" and _cs_classes() is not None:
+            cls, name = _cs_classes()[args[0]]  # type: ignore
         else:
             domain = "cpp"
             cls, name = DomainDirectiveFactory.cpp_classes[args[0]]  # type: ignore
@@ -339,33 +410,11 @@ class DomainDirectiveFactory:
         return cls(*args)
 
 
-class NodeFinder(nodes.SparseNodeVisitor):
-    """Find the Docutils desc_signature declarator and desc_content nodes."""
-
-    def __init__(self, document):
-        super().__init__(document)
-        self.declarator = None
-        self.content = None
-
-    def visit_desc_signature(self, node):
-        # Find the last signature node because it contains the actual declarator
-        # rather than "template <...>". In Sphinx 1.4.1 we'll be able to use sphinx_cpp_tagname:
-        # https://github.com/michaeljones/breathe/issues/242
-        self.declarator = node
-
-    def visit_desc_signature_line(self, node):
-        # In sphinx 1.5, there is now a desc_signature_line node within the desc_signature
-        # This should be used instead
-        self.declarator = node
+def _create_graphviz_node() -> Node:
+    # sphinx.ext.graphviz imports all of Sphinx's writers so leave that until a graph is rendered
+    from sphinx.ext.graphviz import graphviz
 
-    def visit_desc_content(self, node):
-        self.content = node
-        # The SparseNodeVisitor seems to not actually be universally Sparse,
-        # but only for nodes known to Docutils.
-        # So if there are extensions with new node types in the content,
-        # then the visitation will fail.
-        # We anyway don't need to visit the actual content, so skip it.
-        raise nodes.SkipChildren
+    return graphviz()
 
 
 def intersperse(iterable, delimiter):
@@ -508,6 +557,7 @@ class SphinxRenderer:
         self.filter_ = filter_
 
         self.context: Optional[RenderContext] = None
+        self._domain_cache: Dict[Tuple[str, str], str] = {}
         self.output_defname = True
         # Nesting level for lists.
         self.nesting_level = 0
@@ -563,13 +613,6 @@ class SphinxRenderer:
     def get_domain(self) -> str:
         """Returns the domain for the current node."""
 
-        def get_filename(node) -> Optional[str]:
-            """Returns the name of a file where the declaration represented by node is located."""
-            try:
-                return node.location.file
-            except AttributeError:
-                return None
-
         self.context = cast(RenderContext, self.context)
         node_stack = self.context.node_stack
         node = node_stack[0]
@@ -577,6 +620,27 @@ class SphinxRenderer:
         # the domain instead.
         if isinstance(node, str) or node.node_type == "enumvalue":
             node = node_stack[1]
+
+        # The domain is needed several times for each node, and finding it may require parsing the
+        # compound file, so remember it for nodes which can be identified
+        identifier = getattr(node, "id", None) or getattr(node, "refid", None)
+        if not identifier:
+            return self._find_domain(node)
+
+        key = (node.node_type, identifier)
+        try:
+            return self._domain_cache[key]
+        except KeyError:
+            domain = self._find_domain(node)
+            self._domain_cache[key] = domain
+            return domain
+
+    def _find_domain(self, node) -> str:
+        def get_filename(node) -> Optional[str]:
+            """Returns the name of a file where the declaration represented by node is located."""
+            location = getattr(node, "location", None)
+            return location.file if location is not None else None
+
         filename = get_filename(node)
         if not filename and node.node_type == "compound":
             file_data = self.compound_parser.parse(node.refid)
@@ -589,13 +653,19 @@ class SphinxRenderer:
         return sep.join(names)
 
     def run_directive(
-        self, obj_type: str, declaration: str, contentCallback: ContentCallback, options={}
+        self,
+        obj_type: str,
+        declaration: str,
+        contentCallback: ContentCallback,
+        options={},
+        ast: Any = None,
     ) -> List[Node]:
         self.context = cast(RenderContext, self.context)
         args = [obj_type, [declaration]] + self.context.directive_args[2:]
         directive = DomainDirectiveFactory.create(self.context.domain, args)
         assert issubclass(type(directive), BaseObject)
         directive.breathe_content_callback = contentCallback  # type: ignore
+        directive.breathe_ast = ast  # type: ignore
 
         # Translate Breathe's no-link option into the standard noindex option.
         if "no-link" in self.context.directive_args[2]:
@@ -634,11 +704,7 @@ class SphinxRenderer:
         # If there are nodes, there should be at least 2.
         if len(nodes) != 0:
             assert len(nodes) >= 2, nodes
-            rst_node = nodes[1]
-            finder = NodeFinder(rst_node.document)
-            rst_node.walk(finder)
-
-            signode = finder.declarator
+            signode = directive.breathe_declarator
 
             if self.context.child:
                 signode.children = [n for n in signode.children if not n.tagname == "desc_addname"]
@@ -654,7 +720,11 @@ class SphinxRenderer:
         display_obj_type: Optional[str] = None,
         declarator_callback: Optional[DeclaratorCallback] = None,
         options={},
+        ast: Any = None,
     ) -> List[Node]:
+        """Runs the domain directive for the declaration, ast is the already built AST of the
+        declaration for the C++ domain, see breathe.renderer.declaration."""
+
         if obj_type is None:
             obj_type = node.kind
         if content_callback is None:
@@ -664,7 +734,7 @@ class SphinxRenderer:
 
             content_callback = content
         declaration = declaration.replace("\n", " ")
-        nodes_ = self.run_directive(obj_type, declaration, content_callback, options)
+        nodes_ = self.run_directive(obj_type, declaration, content_callback, options, ast)
 
         assert self.app.env is not None
         if self.app.env.config.breathe_debug_trace_doxygen_ids:
@@ -806,13 +876,43 @@ class SphinxRenderer:
 
         return "::".join(names)
 
+    def text(self, node) -> str:
+        """Returns the text of the nodes a linkedtext node is rendered to without rendering it if
+        possible, see breathe.renderer.text."""
+
+        if node is None:
+            return ""
+        if isinstance(node, str):
+            return string_text(node)
+
+        def create() -> str:
+            text = linked_text(node) if node.node_type == "linkedtext" else None
+            if text is None:
+                text = "".join(n.astext() for n in self.render(node))
+            return text
+
+        cache: Optional[TextCache] = self.app.env.temp_data.get("breathe_text_cache")
+        if cache is None:
+            return create()
+        return cache.get(node, "text", create)
+
     def create_template_prefix(self, decl) -> str:
         if not decl.templateparamlist:
             return ""
-        nodes = self.render(decl.templateparamlist)
-        return "template<" + "".join(n.astext() for n in nodes) + ">"
+        node = decl.templateparamlist
+        dom = self.get_domain() or "cpp"
+
+        def create() -> str:
+            return ", ".join(self.template_parameter_text(param, dom) for param in node.param)
+
+        cache: Optional[TextCache] = self.app.env.temp_data.get("breathe_text_cache")
+        text = create() if cache is None else cache.get(node, ("templateparamlist", dom), create)
+        return "template<" + text + ">"
+
+    def run_domain_directive(self, kind, names) -> Tuple[List[Node], BaseObject]:
+        """Runs the domain directive for kind and returns the resulting nodes along with the
+        directive, which gives access to its declarator and content nodes."""
 
-    def run_domain_directive(self, kind, names):
         domain_directive = DomainDirectiveFactory.create(
             self.context.domain, [kind, names] + self.context.directive_args[2:]
         )
@@ -837,15 +937,12 @@ class SphinxRenderer:
             _debug_indent -= 1
 
         # Filter out outer class names if we are rendering a member as a part of a class content.
-        rst_node = nodes[1]
-        finder = NodeFinder(rst_node.document)
-        rst_node.walk(finder)
-
-        signode = finder.declarator
+        assert isinstance(domain_directive, BaseObject)
+        signode = domain_directive.breathe_declarator
 
         if len(names) > 0 and self.context.child:
             signode.children = [n for n in signode.children if not n.tagname == "desc_addname"]
-        return nodes
+        return nodes, domain_directive
 
     def create_doxygen_target(self, node):
         """Can be overridden to create a target node which uses the doxygen refid information
@@ -970,7 +1067,7 @@ class SphinxRenderer:
         obj_type = kwargs.get("objtype", None)
         if obj_type is None:
             obj_type = node.kind
-        nodes = self.run_domain_directive(obj_type, [declaration.replace("\n", " ")])
+        nodes, directive = self.run_domain_directive(obj_type, [declaration.replace("\n", " ")])
         if self.app.env.config.breathe_debug_trace_doxygen_ids:
             target = self.create_doxygen_target(node)
             if len(target) == 0:
@@ -978,12 +1075,8 @@ class SphinxRenderer:
             else:
                 print("{}Doxygen target (old): {}".format("  " * _debug_indent, target[0]["ids"]))
 
-        rst_node = nodes[1]
-        finder = NodeFinder(rst_node.document)
-        rst_node.walk(finder)
-
-        signode = finder.declarator
-        contentnode = finder.content
+        signode = directive.breathe_declarator
+        contentnode = directive.breathe_content
 
         update_signature = kwargs.get("update_signature", None)
         if update_signature is not None:
@@ -999,7 +1092,8 @@ class SphinxRenderer:
     def visit_doxygen(self, node) -> List[Node]:
         nodelist: List[Node] = []
 
-        # Process all the compound children
+        # Process all the compound children, reading their files ahead of rendering them
+        self.prefetch(node.get_compound())
         for n in node.get_compound():
             nodelist.extend(self.render(n))
         return nodelist
@@ -1188,19 +1282,16 @@ class SphinxRenderer:
 
             self.context.directive_args[1] = [arg]
 
-            nodes = self.run_domain_directive(kind, self.context.directive_args[1])
+            nodes, directive = self.run_domain_directive(kind, self.context.directive_args[1])
             rst_node = nodes[1]
 
-            finder = NodeFinder(rst_node.document)
-            rst_node.walk(finder)
-
             if kind in ("interface", "namespace"):
                 # This is not a real C++ declaration type that Sphinx supports,
                 # so we hax the replacement of it.
-                finder.declarator[0] = addnodes.desc_annotation(kind + " ", kind + " ")
+                directive.breathe_declarator[0] = addnodes.desc_annotation(kind + " ", kind + " ")
 
             rst_node.children[0].insert(0, doxygen_target)
-            return nodes, finder.content
+            return nodes, directive.breathe_content
 
         refid = self.get_refid(node.refid)
         render_sig = kwargs.get("render_signature", render_signature)
@@ -1374,9 +1465,13 @@ class SphinxRenderer:
         for kind, _ in self.sections:
             addnode(kind, lambda: section_nodelists.get(kind, []))
 
-        # Take care of innerclasses
-        addnode("innerclass", lambda: self.render_iterable(node.innerclass))
-        addnode("innernamespace", lambda: self.render_iterable(node.innernamespace))
+        # Take care of innerclasses, unless they are rendered in documents of their own
+        self.prefetch([] if "sharded" in options else node.innerclass)
+        if "inner" in options:
+            self.compound_parser.prefetch(ref.refid for ref in node.innergroup)
+        if "sharded" not in options:
+            addnode("innerclass", lambda: self.render_iterable(node.innerclass))
+            addnode("innernamespace", lambda: self.render_iterable(node.innernamespace))
 
         if "inner" in options:
             for node in node.innergroup:
@@ -1476,17 +1571,7 @@ class SphinxRenderer:
             nodelist.extend(self.render_iterable(node.ordered_children))
         else:
             contentNodeCands = self.render_iterable(node.content)
-            # if there are consecutive nodes.Text we should collapse them
-            # and rerender them to ensure the right paragraphifaction
-            contentNodes: List[Node] = []
-            for n in contentNodeCands:
-                if len(contentNodes) != 0 and isinstance(contentNodes[-1], nodes.Text):
-                    if isinstance(n, nodes.Text):
-                        prev = contentNodes.pop()
-                        contentNodes.extend(self.render_string(prev.astext() + n.astext()))
-                        continue  # we have handled this node
-                contentNodes.append(n)
-            nodelist.extend(contentNodes)
+            nodelist.extend(self.collapse_text(contentNodeCands))
             nodelist.extend(self.render_iterable(node.images))
 
             paramList = self.render_iterable(node.parameterlist)
@@ -1526,6 +1611,33 @@ class SphinxRenderer:
 
         return [nodes.paragraph("", "", *nodelist)]
 
+    def collapse_text(self, nodelist: List[Node]) -> List[Node]:
+        """Collapses consecutive nodes.Text and rerenders them to ensure the right
+        paragraphifaction, e.g., for text split around a <linebreak/>.
+
+        Each run of text is joined and rendered once, rather than rendering the text collected so
+        far again for every node in the run, which is quadratic in the length of the run.
+        """
+
+        result: List[Node] = []
+        run: List[Node] = []
+
+        def flush() -> None:
+            if len(run) == 1:
+                result.append(run[0])
+            elif run:
+                result.extend(self.render_string("".join(n.astext() for n in run)))
+            run.clear()
+
+        for n in nodelist:
+            if isinstance(n, nodes.Text):
+                run.append(n)
+            else:
+                flush()
+                result.append(n)
+        flush()
+        return result
+
     def visit_docparblock(self, node) -> List[Node]:
         return self.render_iterable(node.para)
 
@@ -1710,40 +1822,52 @@ class SphinxRenderer:
             # Handle has a preformatted text
             return [nodes.literal_block(text, text)]
 
-        is_inline = False
+        # Work on a local copy of the text as the Doxygen node is shared between renders
+        text = node.text
+        variant = "embed:rst"
+        for extended in ("leading-asterisk", "leading-slashes", "inline"):
+            if text.strip().startswith("embed:rst:" + extended):
+                variant = extended
+                break
 
         # do we need to strip leading asterisks?
         # NOTE: We could choose to guess this based on every line starting with '*'.
         #   However This would have a side-effect for any users who have an rst-block
         #   consisting of a simple bullet list.
         #   For now we just look for an extended embed tag
-        if node.text.strip().startswith("embed:rst:leading-asterisk"):
-            lines = node.text.splitlines()
+        if variant == "leading-asterisk":
+            lines = text.splitlines()
             # Replace the first * on each line with a blank space
             lines = map(lambda text: text.replace("*", " ", 1), lines)
-            node.text = "\n".join(lines)
+            text = "\n".join(lines)
 
         # do we need to strip leading ///?
-        elif node.text.strip().startswith("embed:rst:leading-slashes"):
-            lines = node.text.splitlines()
+        elif variant == "leading-slashes":
+            lines = text.splitlines()
             # Replace the /// on each line with three blank spaces
             lines = map(lambda text: text.replace("///", "   ", 1), lines)
-            node.text = "\n".join(lines)
-
-        elif node.text.strip().startswith("embed:rst:inline"):
-            # Inline all text inside the verbatim
-            node.text = "".join(node.text.splitlines())
-            is_inline = True
+            text = "\n".join(lines)
 
+        is_inline = variant == "inline"
         if is_inline:
-            text = node.text.replace("embed:rst:inline", "", 1)
+            # Inline all text inside the verbatim
+            text = "".join(text.splitlines())
+            text = text.replace("embed:rst:inline", "", 1)
         else:
             # Remove the first line which is "embed:rst[:leading-asterisk]"
-            text = "\n".join(node.text.split("\n")[1:])
+            text = "\n".join(text.split("\n")[1:])
 
             # Remove starting whitespace
             text = textwrap.dedent(text)
 
+        # The same documentation is frequently rendered several times so reuse earlier parses
+        rst_cache: Optional[ParsedRstCache] = self.app.env.temp_data.get("breathe_rst_cache")
+        key = (variant, text)
+        if rst_cache is not None:
+            cached = rst_cache.get(key, self.state.document)
+            if cached is not None:
+                return cached
+
         # Inspired by autodoc.py in Sphinx
         rst = StringList()
         for line in text.split("\n"):
@@ -1763,9 +1887,11 @@ class SphinxRenderer:
         else:
             nested_parse_with_titles(self.state, rst, rst_node)
 
+        if rst_cache is not None:
+            rst_cache.store(key, [rst_node])
         return [rst_node]
 
-    def visit_inc(self, node: compoundsuper.incType) -> List[Node]:
+    def visit_inc(self, node: "compoundsuper.incType") -> List[Node]:
         if not self.app.config.breathe_show_include:
             return []
 
@@ -1779,7 +1905,7 @@ class SphinxRenderer:
 
         return [nodes.container("", nodes.emphasis("", "", *text))]
 
-    def visit_ref(self, node: compoundsuper.refType) -> List[Node]:
+    def visit_ref(self, node: "compoundsuper.refType") -> List[Node]:
         def get_node_info(file_data):
             name = node.content_[0].getValue()
             name = name.rsplit("::", 1)[-1]
@@ -1947,7 +2073,7 @@ class SphinxRenderer:
 
         return [table]
 
-    def visit_mixedcontainer(self, node: compoundsuper.MixedContainer) -> List[Node]:
+    def visit_mixedcontainer(self, node: "compoundsuper.MixedContainer") -> List[Node]:
         return self.render_optional(node.getValue())
 
     def visit_description(self, node) -> List[Node]:
@@ -1968,7 +2094,7 @@ class SphinxRenderer:
                 declaration = " ".join(
                     [
                         self.create_template_prefix(node),
-                        "".join(n.astext() for n in self.render(node.get_type())),
+                        self.text(node.get_type()),
                         name,
                         node.get_argsstring(),
                     ]
@@ -1987,7 +2113,7 @@ class SphinxRenderer:
                     elements.append("explicit")
                 # TODO: handle constexpr when parser has been updated
                 #       but Doxygen seems to leave it in the type anyway
-                typ = "".join(n.astext() for n in self.render(node.get_type()))
+                typ = self.text(node.get_type())
                 # Doxygen sometimes leaves 'static' in the type,
                 # e.g., for "constexpr static auto f()"
                 typ = typ.replace("static ", "")
@@ -2000,6 +2126,9 @@ class SphinxRenderer:
                 elements.append(name)
                 elements.append(node.get_argsstring())
                 declaration = " ".join(elements)
+                if (not dom or dom == "cpp") and not elements[0]:
+                    ast = function_declaration(self.app.config, elements[1:-3], node, name)
+                    return self.handle_declaration(node, declaration, ast=ast)
             nodes = self.handle_declaration(node, declaration)
             return nodes
         else:
@@ -2036,7 +2165,7 @@ class SphinxRenderer:
             self.context = cast(RenderContext, self.context)
             self.context.directive_args[1] = [signature]
 
-            nodes = self.run_domain_directive(node.kind, self.context.directive_args[1])
+            nodes, directive = self.run_domain_directive(node.kind, self.context.directive_args[1])
 
             assert self.app.env is not None
             if self.app.env.config.breathe_debug_trace_doxygen_ids:
@@ -2049,8 +2178,6 @@ class SphinxRenderer:
                     )
 
             rst_node = nodes[1]
-            finder = NodeFinder(rst_node.document)
-            rst_node.walk(finder)
 
             # Templates have multiple signature nodes in recent versions of Sphinx.
             # Insert Doxygen target into the first signature node.
@@ -2058,7 +2185,7 @@ class SphinxRenderer:
                 target = self.create_doxygen_target(node)
             rst_node.children[0].insert(0, target)
 
-            finder.content.extend(self.description(node))
+            directive.breathe_content.extend(self.description(node))
             return nodes
 
     def visit_define(self, node) -> List[Node]:
@@ -2090,35 +2217,44 @@ class SphinxRenderer:
 
         names = self.get_qualification()
         names.append(node.name)
-        declaration = self.join_nested_name(names)
+        name = self.join_nested_name(names)
+        declaration = name
         dom = self.get_domain()
         if (not dom or dom == "cpp") and node.strong == "yes":
             # It looks like Doxygen does not make a difference
             # between 'enum class' and 'enum struct',
             # so render them both as 'enum class'.
             obj_type = "enum-class"
-            underlying_type = "".join(n.astext() for n in self.render(node.type_))
+            underlying_type = self.text(node.type_)
             if len(underlying_type.strip()) != 0:
                 declaration += " : "
                 declaration += underlying_type
         else:
             obj_type = "enum"
+        ast = None
+        if not dom or dom == "cpp":
+            ast = enum_declaration(self.app.config, node, name, obj_type)
         return self.handle_declaration(
-            node, declaration, obj_type=obj_type, content_callback=content
+            node, declaration, obj_type=obj_type, content_callback=content, ast=ast
         )
 
     def visit_enumvalue(self, node) -> List[Node]:
+        ast = None
         if self.app.config.breathe_show_enumvalue_initializer:
             declaration = node.name + self.make_initializer(node)
         else:
             declaration = node.name
-        return self.handle_declaration(node, declaration, obj_type="enumvalue")
+            dom = self.get_domain()
+            if not dom or dom == "cpp":
+                ast = enumerator_declaration(self.app.config, node.name)
+        return self.handle_declaration(node, declaration, obj_type="enumvalue", ast=ast)
 
     def visit_typedef(self, node) -> List[Node]:
-        type_ = "".join(n.astext() for n in self.render(node.get_type()))
+        type_ = self.text(node.get_type())
         names = self.get_qualification()
         names.append(node.get_name())
         name = self.join_nested_name(names)
+        ast = None
         if node.definition.startswith("using "):
             # TODO: looks like Doxygen does not generate the proper XML
             #       for the template parameter list
@@ -2131,7 +2267,10 @@ class SphinxRenderer:
             #   definition has only the typename, which makes it impossible to
             #   distinguish between them so fallback to "typedef" behavior here.
             declaration = " ".join([type_, name, node.get_argsstring()])
-        return self.handle_declaration(node, declaration)
+            dom = self.get_domain()
+            if not dom or dom == "cpp":
+                ast = typedef_declaration(self.app.config, node, name)
+        return self.handle_declaration(node, declaration, ast=ast)
 
     def make_initializer(self, node) -> str:
         initializer = node.initializer
@@ -2154,6 +2293,7 @@ class SphinxRenderer:
         name = self.join_nested_name(names)
         dom = self.get_domain()
         options = {}
+        ast = None
         if dom == "py":
             declaration = name
             initializer = self.make_initializer(node).strip().lstrip("=").strip()
@@ -2163,7 +2303,7 @@ class SphinxRenderer:
             declaration = " ".join(
                 [
                     self.create_template_prefix(node),
-                    "".join(n.astext() for n in self.render(node.get_type())),
+                    self.text(node.get_type()),
                     name,
                     node.get_argsstring(),
                 ]
@@ -2182,7 +2322,7 @@ class SphinxRenderer:
                 elements.append("static")
             if node.mutable == "yes":
                 elements.append("mutable")
-            typename = "".join(n.astext() for n in self.render(node.get_type()))
+            typename = self.text(node.get_type())
             # Doxygen sometimes leaves 'static' in the type,
             # e.g., for "constexpr static int i"
             typename = typename.replace("static ", "")
@@ -2193,8 +2333,10 @@ class SphinxRenderer:
             elements.append(node.get_argsstring())
             elements.append(self.make_initializer(node))
             declaration = " ".join(elements)
+            if (not dom or dom == "cpp") and not elements[0] and not elements[-1]:
+                ast = variable_declaration(self.app.config, elements[1:-4], node, name)
         if not dom or dom in ("c", "cpp", "py", "cs"):
-            return self.handle_declaration(node, declaration, options=options)
+            return self.handle_declaration(node, declaration, options=options, ast=ast)
         else:
             return self.render_declaration(node, declaration)
 
@@ -2208,7 +2350,7 @@ class SphinxRenderer:
         signode = addnodes.desc_signature()
         desc += signode
 
-        typ = "".join(n.astext() for n in self.render(node.get_type()))
+        typ = self.text(node.get_type())
         # in Doxygen < 1.9 the 'friend' part is there, but afterwards not
         # https://github.com/michaeljones/breathe/issues/616
         assert typ in ("friend class", "friend struct", "class", "struct")
@@ -2224,7 +2366,7 @@ class SphinxRenderer:
         return [desc]
 
     def visit_templateparam(
-        self, node: compound.paramTypeSub, *, insertDeclNameByParsing: bool = False
+        self, node: "compound.paramTypeSub", *, insertDeclNameByParsing: bool = False
     ) -> List[Node]:
         nodelist: List[Node] = []
 
@@ -2249,30 +2391,13 @@ class SphinxRenderer:
             appendDeclName = True
             if insertDeclNameByParsing:
                 if dom == "cpp" and sphinx.version_info >= (4, 1, 0):
-                    parser = cpp.DefinitionParser(
-                        "".join(n.astext() for n in nodelist),
-                        location=self.state.state_machine.get_source_and_line(),
-                        config=self.app.config,
+                    text = self.name_template_parameter(
+                        "".join(n.astext() for n in nodelist), node.declname
                     )
-                    try:
-                        # we really should use _parse_template_parameter()
-                        # but setting a name there is non-trivial, so we use type
-                        ast = parser._parse_type(named="single", outer="templateParam")
-                        assert ast.name is None
-                        nn = cpp.ASTNestedName(
-                            names=[
-                                cpp.ASTNestedNameElement(cpp.ASTIdentifier(node.declname), None)
-                            ],
-                            templates=[False],
-                            rooted=False,
-                        )
-                        ast.name = nn
+                    if text is not None:
                         # the actual nodes don't matter, as it is astext()-ed later
-                        nodelist = [nodes.Text(str(ast))]
+                        nodelist = [nodes.Text(text)]
                         appendDeclName = False
-                    except cpp.DefinitionError:
-                        # happens with "typename ...Args", so for now, just append
-                        pass
 
             if appendDeclName:
                 if nodelist:
@@ -2296,7 +2421,52 @@ class SphinxRenderer:
 
         return nodelist
 
-    def visit_templateparamlist(self, node: compound.templateparamlistTypeSub) -> List[Node]:
+    def name_template_parameter(self, type_: str, declname: str) -> Optional[str]:
+        """Returns the C++ template parameter with the type and name as the domain writes it, or
+        None if the type can't be parsed."""
+
+        parser = cpp.DefinitionParser(
+            type_,
+            location=self.state.state_machine.get_source_and_line(),
+            config=self.app.config,
+        )
+        try:
+            # we really should use _parse_template_parameter()
+            # but setting a name there is non-trivial, so we use type
+            ast = parser._parse_type(named="single", outer="templateParam")
+        except cpp.DefinitionError:
+            # happens with "typename ...Args", so for now, just append
+            return None
+        assert ast.name is None
+        nn = cpp.ASTNestedName(
+            names=[cpp.ASTNestedNameElement(cpp.ASTIdentifier(declname), None)],
+            templates=[False],
+            rooted=False,
+        )
+        ast.name = nn
+        return str(ast)
+
+    def template_parameter_text(self, node: "compound.paramTypeSub", dom: str) -> str:
+        """The text of visit_templateparam with the declaration name inserted by parsing."""
+
+        text = self.text(node.type_) if node.type_ else ""
+        if node.declname:
+            named = None
+            if dom == "cpp" and sphinx.version_info >= (4, 1, 0):
+                named = self.name_template_parameter(text, node.declname)
+            if named is not None:
+                text = named
+            elif text:
+                text += " " + node.declname
+            else:
+                text = node.declname
+        if node.array:
+            text += node.array
+        if node.defval:
+            text += " = " + self.text(node.defval)
+        return text
+
+    def visit_templateparamlist(self, node: "compound.templateparamlistTypeSub") -> List[Node]:
         nodelist: List[Node] = []
         self.output_defname = False
         for i, item in enumerate(node.param):
@@ -2373,7 +2543,7 @@ class SphinxRenderer:
 
     def visit_docdot(self, node) -> List[Node]:
         """Translate node from doxygen's dot command to sphinx's graphviz directive."""
-        graph_node = graphviz()
+        graph_node = _create_graphviz_node()
         if node.content_ and node.content_[0].getValue().rstrip("\n"):
             graph_node["code"] = node.content_[0].getValue()
         else:
@@ -2409,17 +2579,18 @@ class SphinxRenderer:
                     self.app.confdir + os.sep + project_path + os.sep + dot_file_path
                 )
         try:
-            with open(dot_file_path, encoding="utf-8") as fp:
-                dotcode = fp.read()
+            # The XML_OUTPUT path may be an archive, so read it through the path handler
+            with path_handler.open_file(dot_file_path) as fp:
+                dotcode = fp.read().decode("utf-8")
             if not dotcode.rstrip("\n"):
                 raise RuntimeError("%s found but without any content" % dot_file_path)
-        except OSError as exc:
+        except (OSError, ArchiveError) as exc:
             # doxygen seems to prevent this from triggering as a non-existant file
             # generates no XML output for the corresponding `\dotfile` cmd
             self.state.document.reporter.warning(exc)  # better safe than sorry
         except RuntimeError as exc:
             self.state.document.reporter.warning(exc)
-        graph_node = graphviz()
+        graph_node = _create_graphviz_node()
         graph_node["code"] = dotcode
         graph_node["options"] = {"docname": dot_file_path}
         caption = "" if not node.content_ else node.content_[0].getValue()
@@ -2429,60 +2600,21 @@ class SphinxRenderer:
             return [nodes.figure("", graph_node, caption_node)]
         return [graph_node]
 
-    def visit_docgraph(self, node: compoundsuper.graphType) -> List[Node]:
+    def visit_docgraph(self, node: "compoundsuper.graphType") -> List[Node]:
         """Create a graph (generated by doxygen - not user-defined) from XML using dot
         syntax."""
-        # use graphs' legend from doxygen (v1.9.1)
-        # most colors can be changed via `graphviz_dot_args` in conf.py
-        edge_colors = {
-            # blue (#1414CE) doesn't contrast well in dark mode.
-            # "public-inheritance": "1414CE",  # allow user to customize this one
-            "private-inheritance": "8B1A1A",  # hardcoded
-            "protected-inheritance": "006400",  # hardcoded
-            # the following are demonstrated in the doxygen graphs' legend, but
-            # these don't show in XML properly (bug?); these keys are fiction.
-            "used-internal": "9C35CE",  # should also be dashed
-            "template-instantiated-inheritance": "FFA500",  # should also be dashed
-        }
-
-        # assemble the dot syntax we'll pass to the graphviz directive
-        dot = "digraph {\n"
-        dot += '    graph [bgcolor="#00000000"]\n'  # transparent color for graph's bg
-        dot += '    node [shape=rectangle style=filled fillcolor="#FFFFFF"'
-        dot += " font=Helvetica padding=2]\n"
-        dot += '    edge [color="#1414CE"]\n'
-        relations = []
-        for g_node in node.get_node():
-            dot += '    "%s" [label="%s"' % (g_node.get_id(), g_node.get_label())
-            dot += ' tooltip="%s"' % g_node.get_label()
-            if g_node.get_id() == "1":
-                # the disabled grey color is used in doxygen to indicate that the URL is
-                # not set (for the compound in focus). Setting this here doesn't allow
-                # further customization. Maybe remove this since URL is not used?
-                #
-                dot += ' fillcolor="#BFBFBF"'  # hardcoded
-            # URLs from a doxygen refid won't work in sphinx graphviz; we can't convert
-            # the refid until all docs are built, and pending references are un-noticed
-            # within graphviz directives. Maybe someone wiser will find a way to do it.
-            #
-            # dot += ' URL="%s"' % g_node.get_link().get_refid()
-            dot += "]\n"
-            for child_node in g_node.childnode:
-                edge = f'    "{g_node.get_id()}"'
-                edge += f' -> "{child_node.get_refid()}" ['
-                edge += f"dir={node.get_direction()} "
-                # edge labels don't appear in XML (bug?); use tooltip in meantime
-                edge += 'tooltip="%s"' % child_node.get_relation()
-                if child_node.get_relation() in edge_colors.keys():
-                    edge += ' color="#%s"' % edge_colors.get(child_node.get_relation())
-                edge += "]\n"
-                relations.append(edge)
-        for relation in relations:
-            dot += relation
-        dot += "}"
+        config = self.app.config
+        max_nodes = config.breathe_graph_max_nodes
+        max_depth = config.breathe_graph_max_depth
+        # The same graph is often shown in several documents so reuse the DOT created for it
+        dot_cache: Optional[DotCache] = self.app.env.temp_data.get("breathe_dot_cache")
+        if dot_cache is not None:
+            dot = dot_cache.get(node, max_nodes, max_depth)
+        else:
+            dot = create_dot(node, max_nodes, max_depth)
 
         # use generated dot syntax to create a graphviz node
-        graph_node = graphviz()
+        graph_node = _create_graphviz_node()
         graph_node["code"] = dot
         graph_node["align"] = "center"
         graph_node["options"] = {}
@@ -2624,6 +2756,18 @@ class SphinxRenderer:
                 result = method(self, node)
         return result
 
+    def prefetch(self, refs: List) -> None:
+        """Starts reading the compound files of the references which the filter lets through, as
+        those are the ones rendering them is going to read."""
+
+        self.context = cast(RenderContext, self.context)
+        allowed = [
+            ref.refid
+            for ref in refs
+            if self.filter_.allow(self.context.create_child_context(ref).node_stack)
+        ]
+        self.compound_parser.prefetch(allowed)
+
     def render_optional(self, node) -> List[Node]:
         """Render a node that can be None."""
         return self.render(node) if node else []
@@ -0,0 +1,81 @@
+"""
+Declaration Text
+================
+
+The declarations handed to the domain directives are text assembled from the types, parameters
+and template parameter lists of the members in the Doxygen XML. Rendering those to docutils nodes
+only to join the text of the nodes again creates whole node trees which are thrown away right
+after, and the same types are needed several times for each member, e.g., when resolving the
+overloads of a function.
+
+The text of linked text, i.e., text with references to other entities in it, is instead put
+together directly from the XML here, following what the renderer would produce for it. Anything
+other than plain text and references is left to the renderer. The text is kept for each node as
+the same node is rendered as part of every declaration of its member.
+"""
+
+from typing import Callable, Dict, Hashable, Optional
+from weakref import WeakKeyDictionary
+
+
+def string_text(value: str) -> str:
+    """Returns the text of the nodes SphinxRenderer.render_string creates for a string."""
+
+    stripped = value.strip()
+    if stripped:
+        delimiter = None
+        if "<linebreak>" in stripped:
+            delimiter = "<linebreak>"
+        elif "\n" in stripped:
+            delimiter = "\n"
+        if delimiter:
+            # Each line becomes a paragraph of its own
+            return "".join(line.strip() for line in value.split(delimiter) if line.strip())
+        return value
+    if value == " ":
+        return value
+    return ""
+
+
+def linked_text(node) -> Optional[str]:
+    """Returns the text the renderer produces for a linkedtext node, or None if it contains
+    anything but text and references."""
+
+    parts = []
+    for item in node.content_:
+        value = item.getValue()
+        if not value:
+            continue
+        if isinstance(value, str):
+            parts.append(string_text(value))
+            continue
+        if getattr(value, "node_type", None) != "docreftext" or getattr(value, "para", None):
+            return None
+        # The text of the reference is the text of the pending_xref it becomes
+        text = linked_text(value)
+        if text is None:
+            return None
+        parts.append(text)
+    return "".join(parts)
+
+
+class TextCache:
+    """Keeps the declaration text created for each Doxygen node.
+
+    The nodes are held weakly so that entries go away together with the parsed XML they came
+    from. Each node can have several texts, e.g., for different domains.
+    """
+
+    def __init__(self) -> None:
+        self._store: "WeakKeyDictionary[object, Dict[Hashable, str]]" = WeakKeyDictionary()
+
+    def get(self, node, variant: Hashable, create: Callable[[], str]) -> str:
+        by_variant = self._store.setdefault(node, {})
+        text = by_variant.get(variant)
+        if text is None:
+            text = create()
+            by_variant[variant] = text
+        return text
+
+    def clear(self) -> None:
+        self._store.clear()
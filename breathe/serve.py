@@ -0,0 +1,240 @@
+"""
+    breathe.serve
+    ~~~~~~~~~~~~~
+
+    Keeps a cache directory written by breathe-cache up to date while the Doxygen XML changes, for
+    local authoring where the documentation is rebuilt over and over, e.g., by sphinx-autobuild.
+
+    The process polls the XML directory and only parses the files which were modified since the
+    last poll. The index is kept in memory and only parsed again when index.xml itself changes,
+    in which case the entries of compounds which are gone are dropped. Each rebuild reads the
+    parsed trees from the cache directory through the ``breathe_parse_cache`` setting, just like
+    a cache written once by breathe-cache.
+"""
+
+from breathe import __version__
+from breathe.cache import (
+    CACHE_VERSION,
+    MANIFEST_FILENAME,
+    entry_filename,
+    file_digest,
+    parse_file,
+    write_json,
+)
+from breathe.parser import compound, index
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Below this many modified files, parsing them in this process is quicker than starting a pool
+POOL_THRESHOLD = 16
+
+
+def _stat(filename: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class CacheWatcher:
+    """Updates the cache directory for the XML directory with the files modified since the last
+    call to update."""
+
+    def __init__(self, xml_dir: str, cache_dir: str, jobs: Optional[int] = None) -> None:
+        self.xml_dir = xml_dir
+        self.cache_dir = cache_dir
+        self.jobs = jobs
+
+        # The size and digest of each cached file, as recorded in the manifest
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # The modified time and size of each file when it was last looked at
+        self.stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        # The files listed in the index, starting with index.xml itself
+        self.names: List[str] = []
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_manifest()
+
+    def _load_manifest(self) -> None:
+        # Entries of an existing cache are kept as long as their files haven't changed, so that
+        # starting up doesn't parse everything again
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST_FILENAME)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") != CACHE_VERSION or manifest.get("breathe") != __version__:
+            return
+
+        for name, entry in manifest["files"].items():
+            filename = os.path.join(self.xml_dir, name)
+            stat = _stat(filename)
+            if stat is None or stat[1] != entry["size"]:
+                continue
+            with open(filename, "rb") as f:
+                if file_digest(f.read()) != entry["digest"]:
+                    continue
+            self.files[name] = entry
+            self.stats[name] = stat
+
+    def _parse(self, names: List[str]) -> None:
+        if len(names) < POOL_THRESHOLD:
+            results = [parse_file(self.xml_dir, name, self.cache_dir) for name in names]
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(
+                    executor.map(
+                        parse_file,
+                        [self.xml_dir] * len(names),
+                        names,
+                        [self.cache_dir] * len(names),
+                        chunksize=16,
+                    )
+                )
+        for name, size, digest in results:
+            self.files[name] = {"size": size, "digest": digest}
+
+    def update(self) -> List[str]:
+        """Parses the files which changed since the last update into the cache directory. Returns
+        the names of the files parsed."""
+
+        index_stat = _stat(os.path.join(self.xml_dir, "index.xml"))
+        index_changed = not self.names or index_stat != self.stats.get("index.xml")
+        if index_changed:
+            index_tree = index.parse(os.path.join(self.xml_dir, "index.xml"))
+            names = ["index.xml"]
+            for compound_ in index_tree.get_compound():
+                name = "%s.xml" % compound_.refid
+                if os.path.isfile(os.path.join(self.xml_dir, name)):
+                    names.append(name)
+            self.names = names
+
+        stats = {}
+        for name in self.names:
+            stat = _stat(os.path.join(self.xml_dir, name))
+            if stat is not None and (name not in self.files or stat != self.stats.get(name)):
+                stats[name] = stat
+        if not stats and not index_changed:
+            return []
+
+        modified = list(stats)
+        self._parse(modified)
+        # Only once they have been parsed, so that files which failed are tried again
+        self.stats.update(stats)
+        self.stats["index.xml"] = index_stat
+
+        if index_changed:
+            # Drop the entries of the compounds which aren't listed any more
+            listed = set(self.names)
+            for name in list(self.files):
+                if name not in listed:
+                    del self.files[name]
+                    self.stats.pop(name, None)
+                    try:
+                        os.remove(os.path.join(self.cache_dir, entry_filename(name)))
+                    except OSError:
+                        pass
+
+        write_json(
+            os.path.join(self.cache_dir, MANIFEST_FILENAME),
+            {"version": CACHE_VERSION, "breathe": __version__, "files": self.files},
+        )
+        return modified
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse and check the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="""\
+Keep the parsed trees of the XML created by Doxygen in <rootpath> up to date in
+<CACHEDIR>, parsing the files which change while this runs. Point the
+breathe_parse_cache setting at <CACHEDIR> so that every rebuild reads them from
+there, e.g., when rebuilding with sphinx-autobuild.""",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        action="store",
+        dest="cachedir",
+        help="Directory to store the cache in",
+        required=True,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        help="number of processes to parse with (default: number of cores)",
+        default=None,
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        action="store",
+        dest="interval",
+        type=float,
+        help="seconds between looking for modified files (default: 1)",
+        default=1.0,
+    )
+    parser.add_argument(
+        "--once", action="store_true", dest="once", help="update the cache once and exit"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", dest="quiet", help="suppress informational messages"
+    )
+    parser.add_argument(
+        "--version", action="version", version="Breathe (breathe-serve) %s" % __version__
+    )
+    parser.add_argument("rootpath", type=str, help="The directory contains index.xml")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.rootpath):
+        print("%s is not a directory." % args.rootpath, file=sys.stderr)
+        sys.exit(1)
+
+    watcher = CacheWatcher(args.rootpath, args.cachedir, args.jobs)
+    last_error = None
+    try:
+        while True:
+            try:
+                modified = watcher.update()
+            except (
+                index.ParseError,
+                compound.ParseError,
+                index.FileIOError,
+                compound.FileIOError,
+            ) as e:
+                error = "Cannot parse %s: %s" % (args.rootpath, e)
+                if args.once:
+                    print(error, file=sys.stderr)
+                    sys.exit(1)
+                # Doxygen may be writing the files right now, so try again at the next poll
+                if error != last_error:
+                    print(error, file=sys.stderr)
+                last_error = error
+                modified = []
+            else:
+                last_error = None
+            if modified and not args.quiet:
+                print("Cached %d files in %s" % (len(modified), args.cachedir))
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+# So program can be started with "python -m breathe.serve ..."
+if __name__ == "__main__":
+    main()
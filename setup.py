@@ -55,6 +55,8 @@ setup(
     entry_points={
         "console_scripts": [
             "breathe-apidoc = breathe.apidoc:main",
+            "breathe-cache = breathe.cache:main",
+            "breathe-serve = breathe.serve:main",
         ],
     },
     install_requires=requires,
@@ -0,0 +1,170 @@
+-- Source of doxygen_sqlite3.db, a subset of the database written by Doxygen with
+-- GENERATE_SQLITE3 = YES for the following header. Regenerate it with:
+--
+--   sqlite3 doxygen_sqlite3.db < fixture.sql
+--
+-- namespace ns {
+--     /// The colors.
+--     enum Color { Red = 1, Green };
+--
+--     class Base {};
+--
+--     /// A widget.
+--     class Widget : public Base {
+--     public:
+--         /// Returns the size.
+--         int size() const;
+--         /// The count.
+--         static int count;
+--     };
+--
+--     /// Makes a widget.
+--     Widget make(int width, Color color = Red);
+-- }
+
+CREATE TABLE meta (
+    doxygen_version TEXT PRIMARY KEY NOT NULL,
+    schema_version TEXT NOT NULL,
+    generated_at TEXT NOT NULL,
+    generated_on TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    project_number TEXT,
+    project_brief TEXT
+);
+CREATE TABLE path (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    type INTEGER NOT NULL,
+    local INTEGER NOT NULL,
+    found INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE refid (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    refid TEXT NOT NULL UNIQUE
+);
+CREATE TABLE contains (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    inner_rowid INTEGER NOT NULL,
+    outer_rowid INTEGER NOT NULL
+);
+CREATE TABLE compoundref (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    base_rowid INTEGER NOT NULL,
+    derived_rowid INTEGER NOT NULL,
+    prot INTEGER NOT NULL,
+    virt INTEGER NOT NULL
+);
+CREATE TABLE member (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    scope_rowid INTEGER NOT NULL,
+    memberdef_rowid INTEGER NOT NULL,
+    prot INTEGER NOT NULL,
+    virt INTEGER NOT NULL
+);
+CREATE TABLE param (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    attributes TEXT,
+    type TEXT,
+    declname TEXT,
+    defname TEXT,
+    array TEXT,
+    defval TEXT,
+    briefdescription TEXT
+);
+CREATE TABLE memberdef_param (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    memberdef_id INTEGER NOT NULL,
+    param_id INTEGER NOT NULL
+);
+CREATE TABLE compounddef (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT,
+    kind TEXT NOT NULL,
+    prot INTEGER,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL,
+    header_id INTEGER,
+    briefdescription TEXT,
+    detaileddescription TEXT
+);
+CREATE TABLE memberdef (
+    rowid INTEGER PRIMARY KEY NOT NULL,
+    name TEXT NOT NULL,
+    definition TEXT,
+    type TEXT,
+    argsstring TEXT,
+    scope TEXT,
+    initializer TEXT,
+    bitfield TEXT,
+    prot INTEGER DEFAULT 0,
+    static INTEGER DEFAULT 0,
+    const INTEGER DEFAULT 0,
+    explicit INTEGER DEFAULT 0,
+    inline INTEGER DEFAULT 0,
+    virt INTEGER DEFAULT 0,
+    kind TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL,
+    bodyfile_id INTEGER,
+    bodystart INTEGER,
+    bodyend INTEGER,
+    detaileddescription TEXT,
+    briefdescription TEXT,
+    inbodydescription TEXT
+);
+
+INSERT INTO meta VALUES ('1.9.1', '0.2.1', '2021-01-01', '00:00', 'fixture', NULL, NULL);
+INSERT INTO path VALUES (1, 1, 0, 1, 'widget.h');
+
+INSERT INTO refid VALUES (1, 'namespacens');
+INSERT INTO refid VALUES (2, 'classns_1_1Base');
+INSERT INTO refid VALUES (3, 'classns_1_1Widget');
+INSERT INTO refid VALUES (4, 'widget_8h');
+INSERT INTO refid VALUES (5, 'namespacens_1a4');
+INSERT INTO refid VALUES (6, 'namespacens_1a4a5');
+INSERT INTO refid VALUES (7, 'namespacens_1a4a6');
+INSERT INTO refid VALUES (8, 'classns_1_1Widget_1a1');
+INSERT INTO refid VALUES (9, 'classns_1_1Widget_1a2');
+INSERT INTO refid VALUES (10, 'namespacens_1a3');
+
+INSERT INTO compounddef VALUES
+    (1, 'ns', NULL, 'namespace', 0, 1, 1, 1, NULL, '', ''),
+    (2, 'ns::Base', NULL, 'class', 0, 1, 5, 1, NULL, '', ''),
+    (3, 'ns::Widget', NULL, 'class', 0, 1, 8, 1, NULL,
+     '<para>A widget.</para>', '<para>Long description of widget.</para>'),
+    (4, 'widget.h', NULL, 'file', NULL, 1, 1, 1, NULL, '', '');
+
+INSERT INTO contains (inner_rowid, outer_rowid) VALUES (2, 1), (3, 1), (1, 4), (2, 4), (3, 4);
+INSERT INTO compoundref (base_rowid, derived_rowid, prot, virt) VALUES (2, 3, 0, 0);
+
+INSERT INTO memberdef VALUES
+    (5, 'Color', 'enum ns::Color', '', '', 'ns', NULL, NULL, 0, 0, 0, 0, 0, 0, 'enum',
+     1, 3, 1, NULL, NULL, NULL, '', '<para>The colors.</para>', ''),
+    (6, 'Red', NULL, NULL, NULL, 'ns', '= 1', NULL, 0, 0, 0, 0, 0, 0, 'enumvalue',
+     1, 3, 1, NULL, NULL, NULL, '', '', ''),
+    (7, 'Green', NULL, NULL, NULL, 'ns', NULL, NULL, 0, 0, 0, 0, 0, 0, 'enumvalue',
+     1, 3, 1, NULL, NULL, NULL, '', '', ''),
+    (8, 'size', 'int ns::Widget::size', 'int', '() const', 'ns::Widget', NULL, NULL,
+     0, 0, 1, 0, 0, 0, 'function', 1, 11, 1, NULL, NULL, NULL,
+     '<para>Some text <emphasis>with</emphasis> markup.</para>',
+     '<para>Returns the size.</para>', ''),
+    (9, 'count', 'int ns::Widget::count', 'int', '', 'ns::Widget', NULL, NULL,
+     0, 1, 0, 0, 0, 0, 'variable', 1, 13, 1, NULL, NULL, NULL, '',
+     '<para>The count.</para>', ''),
+    (10, 'make', 'Widget ns::make', 'Widget', '(int width, Color color=Red)', 'ns', NULL, NULL,
+     0, 0, 0, 0, 0, 0, 'function', 1, 17, 1, NULL, NULL, NULL, '',
+     '<para>Makes a widget.</para>', '');
+
+INSERT INTO member (scope_rowid, memberdef_rowid, prot, virt) VALUES
+    (1, 5, 0, 0), (4, 5, 0, 0),
+    (5, 6, 0, 0), (5, 7, 0, 0),
+    (3, 8, 0, 0), (3, 9, 0, 0),
+    (1, 10, 0, 0), (4, 10, 0, 0);
+
+INSERT INTO param VALUES
+    (1, NULL, 'int', 'width', NULL, NULL, NULL, NULL),
+    (2, NULL, 'Color', 'color', NULL, NULL, 'Red', NULL);
+INSERT INTO memberdef_param (memberdef_id, param_id) VALUES (10, 1), (10, 2);
@@ -0,0 +1,132 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from breathe.apidoc import Manifest, main
+
+
+class TestApidoc(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.xml_dir = os.path.join(self.directory.name, "xml")
+        self.out_dir = os.path.join(self.directory.name, "out")
+        os.mkdir(self.xml_dir)
+        self.write_index(
+            [("class", "classWidget", "Widget"), ("class", "classGadget", "Gadget")]
+            + [("namespace", "namespacens", "ns"), ("struct", "structPoint", "Point")]
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_index(self, compounds):
+        with open(os.path.join(self.xml_dir, "index.xml"), "w") as f:
+            f.write("<doxygenindex>")
+            for kind, refid, name in compounds:
+                f.write(
+                    '<compound refid="%s" kind="%s"><name>%s</name></compound>'
+                    % (refid, kind, name)
+                )
+            f.write("</doxygenindex>")
+
+    def run_apidoc(self, *options):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["-o", self.out_dir] + list(options) + [self.xml_dir])
+        return output.getvalue()
+
+    def files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.out_dir)
+            for root, _, names in os.walk(self.out_dir)
+            for name in names
+            if name != Manifest.FILENAME
+        )
+
+    def test_manifest(self):
+        self.run_apidoc("-f")
+        widget = os.path.join(self.out_dir, "class", "classWidget.rst")
+        mtime = os.stat(widget).st_mtime_ns
+
+        # files recorded in the manifest are neither read back nor written again
+        output = self.run_apidoc("-f")
+        self.assertIn("File %s up to date, skipping." % widget, output)
+        self.assertNotIn("Creating file", output)
+        self.assertEqual(os.stat(widget).st_mtime_ns, mtime)
+
+    def test_remove_stale(self):
+        self.run_apidoc("-f")
+        self.assertEqual(
+            self.files(),
+            [
+                "class/classGadget.rst",
+                "class/classWidget.rst",
+                "classlist.rst",
+                "namespace/namespacens.rst",
+                "namespacelist.rst",
+                "struct/structPoint.rst",
+                "structlist.rst",
+            ],
+        )
+
+        # files which were modified since they were written are kept
+        with open(os.path.join(self.out_dir, "class", "classGadget.rst"), "a") as f:
+            f.write("Edited\n")
+        self.write_index([("class", "classWidget", "Widget"), ("class", "classGadget", "Gadget")])
+        self.run_apidoc("-f", "--remove-stale")
+        self.assertEqual(
+            self.files(), ["class/classGadget.rst", "class/classWidget.rst", "classlist.rst"]
+        )
+
+    def test_remove_stale_of_generated_types(self):
+        self.run_apidoc("-f")
+        # the files of the types which aren't generated aren't stale
+        self.write_index([("class", "classWidget", "Widget"), ("struct", "structPoint", "Point")])
+        self.run_apidoc("-f", "-g", "class,namespace", "--remove-stale")
+        self.assertEqual(
+            self.files(),
+            [
+                "class/classWidget.rst",
+                "classlist.rst",
+                "struct/structPoint.rst",
+                "structlist.rst",
+            ],
+        )
+
+    def test_dry_run(self):
+        output = self.run_apidoc("-n")
+        self.assertFalse(os.path.exists(self.out_dir))
+        self.assertIn(
+            "Would create file %s." % os.path.join(self.out_dir, "class", "classWidget.rst"), output
+        )
+
+        self.run_apidoc("-f")
+        self.write_index([("class", "classWidget", "Widget")])
+        output = self.run_apidoc("-f", "-n", "--remove-stale")
+        stale = os.path.join(self.out_dir, "struct", "structPoint.rst")
+        self.assertIn("Would remove file %s." % stale, output)
+        self.assertEqual(output.count("Would remove file %s." % stale), 1)
+        self.assertTrue(os.path.exists(stale))
+
+    def test_jobs(self):
+        self.write_index(
+            [("class", "class%d" % i, "Widget%d" % i) for i in range(50)]
+            + [("struct", "struct%d" % i, "Point%d" % i) for i in range(50)]
+        )
+        self.run_apidoc("-f", "-j", "1")
+        serial = {}
+        for name in self.files():
+            with open(os.path.join(self.out_dir, name)) as f:
+                serial[name] = f.read()
+
+        shutil.rmtree(self.out_dir)
+        self.run_apidoc("-f", "-j", "8")
+        parallel = {}
+        for name in self.files():
+            with open(os.path.join(self.out_dir, name)) as f:
+                parallel[name] = f.read()
+        self.assertEqual(len(parallel), 102)
+        self.assertEqual(parallel, serial)
@@ -0,0 +1,73 @@
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from unittest import TestCase, mock
+
+from breathe import archive, path_handler
+
+
+class TestArchives(TestCase):
+    def test_archives(self):
+        with tempfile.TemporaryDirectory() as directory:
+            members = {"xml/index.xml": b"<index/>", "xml/class.xml": b"<class/>"}
+            zip_path = os.path.join(directory, "xml.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                for name, data in members.items():
+                    zip_file.writestr(name, data)
+            tar_path = os.path.join(directory, "xml.tar.gz")
+            with tarfile.open(tar_path, "w:gz") as tar_file:
+                for name, data in members.items():
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    tar_file.addfile(info, io.BytesIO(data))
+            gz_path = os.path.join(directory, "class.xml")
+            with gzip.open(gz_path + ".gz", "wb") as gz_file:
+                gz_file.write(b"<class/>")
+
+            for archive in (zip_path, tar_path):
+                # the top-level folder holding index.xml is the root of the archive
+                path = os.path.join(archive, "class.xml")
+                with path_handler.open_file(path) as fp:
+                    self.assertEqual(fp.read(), b"<class/>")
+                self.assertEqual(path_handler.source_file(path), archive)
+                self.assertRaises(OSError, path_handler.open_file, os.path.join(archive, "x.xml"))
+
+            with path_handler.open_file(gz_path) as fp:
+                self.assertEqual(fp.read(), b"<class/>")
+            self.assertEqual(path_handler.source_file(gz_path), gz_path + ".gz")
+
+    def test_concurrent_reads(self):
+        reads = []
+
+        class SlowTarArchive(archive.TarArchive):
+            def __init__(self, filename):
+                reads.append(filename)
+                time.sleep(0.05)
+                super().__init__(filename)
+
+        with tempfile.TemporaryDirectory() as directory:
+            tar_path = os.path.join(directory, "xml.tar.gz")
+            with tarfile.open(tar_path, "w:gz") as tar_file:
+                info = tarfile.TarInfo("index.xml")
+                info.size = len(b"<index/>")
+                tar_file.addfile(info, io.BytesIO(b"<index/>"))
+
+            # the prefetch threads open the same archive at once, it is still only read once
+            results = []
+            with mock.patch.object(archive, "TarArchive", SlowTarArchive):
+                threads = [
+                    threading.Thread(target=lambda: results.append(archive.get_archive(tar_path)))
+                    for _ in range(4)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            self.assertEqual(reads, [tar_path])
+            self.assertEqual(len(results), 4)
+            self.assertTrue(all(result is results[0] for result in results))
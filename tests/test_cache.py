@@ -0,0 +1,89 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from breathe.cache import ParseCache, build_cache
+from breathe.serve import CacheWatcher
+
+
+class TestParseCache(TestCase):
+    def test_build_cache(self):
+        index_xml = (
+            '<doxygenindex><compound refid="classWidget" kind="class"><name>Widget</name>'
+            '<member refid="classWidget_1a1" kind="function"><name>draw</name></member>'
+            "</compound></doxygenindex>"
+        )
+        compound_xml = (
+            '<doxygen><compounddef id="classWidget" kind="class">'
+            "<compoundname>Widget</compoundname></compounddef></doxygen>"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            xml_dir = os.path.join(directory, "xml")
+            cache_dir = os.path.join(directory, "cache")
+            os.mkdir(xml_dir)
+            for name, content in (("index.xml", index_xml), ("classWidget.xml", compound_xml)):
+                with open(os.path.join(xml_dir, name), "w") as f:
+                    f.write(content)
+
+            self.assertEqual(build_cache(xml_dir, cache_dir, jobs=1), 2)
+            # entries are written to temporary files first and moved into place
+            self.assertEqual(
+                sorted(os.listdir(cache_dir)),
+                ["classWidget.xml.pickle", "index.xml.pickle", "manifest.json"],
+            )
+
+            cache = ParseCache(cache_dir)
+            compound_path = os.path.join(xml_dir, "classWidget.xml")
+            self.assertEqual(cache.load(compound_path).compounddef.compoundname, "Widget")
+
+            # entries are ignored once the file they were parsed from changes
+            with open(compound_path, "w") as f:
+                f.write(compound_xml.replace("Widget<", "Gadget<"))
+            self.assertIsNone(cache.load(compound_path))
+            self.assertIsNone(ParseCache(xml_dir).load(compound_path))
+
+    def test_watcher(self):
+        index_xml = (
+            '<doxygenindex><compound refid="classWidget" kind="class"><name>Widget</name>'
+            "</compound>%s</doxygenindex>"
+        )
+        gadget = '<compound refid="classGadget" kind="class"><name>Gadget</name></compound>'
+        compound_xml = (
+            '<doxygen><compounddef id="class%s" kind="class">'
+            "<compoundname>%s</compoundname></compounddef></doxygen>"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            xml_dir = os.path.join(directory, "xml")
+            cache_dir = os.path.join(directory, "cache")
+            os.mkdir(xml_dir)
+
+            def write(name, content):
+                filename = os.path.join(xml_dir, name)
+                with open(filename, "w") as f:
+                    f.write(content)
+                # make sure the modified time changes even on filesystems with a coarse one
+                mtime = os.path.getmtime(filename) + len(content)
+                os.utime(filename, (mtime, mtime))
+
+            write("index.xml", index_xml % "")
+            write("classWidget.xml", compound_xml % ("Widget", "Widget"))
+            write("classGadget.xml", compound_xml % ("Gadget", "Gadget"))
+
+            watcher = CacheWatcher(xml_dir, cache_dir)
+            self.assertEqual(watcher.update(), ["index.xml", "classWidget.xml"])
+            self.assertEqual(watcher.update(), [])
+
+            # only modified files are parsed again
+            write("classWidget.xml", compound_xml % ("Widget", "Widgets"))
+            self.assertEqual(watcher.update(), ["classWidget.xml"])
+            widget = ParseCache(cache_dir).load(os.path.join(xml_dir, "classWidget.xml"))
+            self.assertEqual(widget.compounddef.compoundname, "Widgets")
+
+            # a new compound in the index is picked up
+            write("index.xml", index_xml % gadget)
+            self.assertEqual(watcher.update(), ["index.xml", "classGadget.xml"])
+            gadget_tree = ParseCache(cache_dir).load(os.path.join(xml_dir, "classGadget.xml"))
+            self.assertEqual(gadget_tree.compounddef.compoundname, "Gadget")
+
+            # a new watcher keeps the entries of files which haven't changed since
+            self.assertEqual(CacheWatcher(xml_dir, cache_dir).update(), [])
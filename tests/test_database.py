@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from breathe.parser.database import DATABASE_FILENAME, Database, find_database
+
+
+class TestDatabase(TestCase):
+    def test_database(self):
+        filename = os.path.join(os.path.dirname(__file__), "data", "sqlite3", DATABASE_FILENAME)
+        self.assertEqual(find_database(os.path.dirname(filename)), filename)
+
+        db = Database(filename)
+        root = db.parse_index()
+        compounds = {compound.name: compound for compound in root.compound}
+        self.assertEqual(
+            [(member.kind, member.name) for member in compounds["ns"].member],
+            [("enum", "Color"), ("enumvalue", "Red"), ("enumvalue", "Green"), ("function", "make")],
+        )
+
+        compounddef = db.parse_compound(compounds["ns::Widget"].refid).compounddef
+        self.assertEqual(compounddef.basecompoundref[0].content_[0].value, "ns::Base")
+        sections = [(section.kind, section.memberdef[0].name) for section in compounddef.sectiondef]
+        self.assertEqual(sections, [("public-func", "size"), ("public-static-attrib", "count")])
+        self.assertEqual(compounddef.location.file, "widget.h")
+
+        compounddef = db.parse_compound("namespacens").compounddef
+        enum, function = [sectiondef.memberdef[0] for sectiondef in compounddef.sectiondef]
+        self.assertEqual([value.name for value in enum.enumvalue], ["Red", "Green"])
+        self.assertEqual([param.declname for param in function.param], ["width", "color"])
+
+    def test_special_characters(self):
+        filename = os.path.join(os.path.dirname(__file__), "data", "sqlite3", DATABASE_FILENAME)
+        with tempfile.TemporaryDirectory() as directory:
+            # characters which have a meaning in a URI are part of the path
+            project = os.path.join(directory, "docs?mode=rw#100%")
+            os.mkdir(project)
+            shutil.copy(filename, project)
+
+            db = Database(os.path.join(project, DATABASE_FILENAME))
+            self.assertIn("ns", [compound.name for compound in db.parse_index().compound])
+            db.connection.close()
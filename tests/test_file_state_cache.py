@@ -0,0 +1,115 @@
+import io
+import os
+import pickle
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from sphinx.application import Sphinx
+
+from breathe.file_state_cache import FileState
+
+
+class TestFileState(TestCase):
+    def test_add_and_purge(self):
+        state = FileState()
+        state.add("xml/index.xml", 1.0, "index")
+        state.add("xml/index.xml", 2.0, "api")
+        state.add("xml/classWidget.xml", 1.0, "api")
+        self.assertEqual(state.docnames("xml/index.xml"), {"index", "api"})
+
+        mtimes = {"xml/index.xml": 2.0, "xml/classWidget.xml": 3.0}
+        self.assertEqual(state.stale_docnames(mtimes.__getitem__), {"api"})
+
+        # a purged document is gone, and it doesn't pick up its old files when it is read again
+        state.purge("api")
+        self.assertEqual(state.docnames("xml/index.xml"), {"index"})
+        self.assertEqual(len(state), 1)
+        state.add("xml/other.xml", 1.0, "api")
+        self.assertEqual(state.docnames("xml/classWidget.xml"), set())
+        self.assertEqual(state.docnames("xml/other.xml"), {"api"})
+
+    def test_pickle(self):
+        state = FileState()
+        state.add("/a/xml/index.xml", 1.0, "index")
+        state.add("/a/xml/classWidget.xml", 2.0, "api")
+        state.add("archive.zip/classWidget.xml", 3.0, "index")
+        state.add("plain.xml", 4.0, "gone")
+        state.purge("gone")
+
+        loaded = pickle.loads(pickle.dumps(state))
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.docnames("/a/xml/index.xml"), {"index"})
+        self.assertEqual(loaded.docnames("/a/xml/classWidget.xml"), {"api"})
+        self.assertEqual(loaded.docnames("archive.zip/classWidget.xml"), {"index"})
+        self.assertEqual(loaded.docnames("plain.xml"), set())
+        mtimes = {"/a/xml/index.xml": 1.0, "/a/xml/classWidget.xml": 2.0}
+        mtimes["archive.zip/classWidget.xml"] = 5.0
+        self.assertEqual(loaded.stale_docnames(mtimes.__getitem__), {"index"})
+
+    def test_from_dict(self):
+        state = FileState.from_dict({"xml/index.xml": (1.0, {"index", "api"})})
+        self.assertEqual(state.docnames("xml/index.xml"), {"index", "api"})
+        self.assertEqual(state.stale_docnames(lambda filename: 1.0), set())
+
+    def test_parallel_read(self):
+        index = (
+            "<doxygenindex>"
+            + "".join(
+                '<compound refid="class%s" kind="class"><name>%s</name></compound>' % (name, name)
+                for name in ("Widget", "Gadget")
+            )
+            + "</doxygenindex>"
+        )
+
+        def compound(name):
+            return (
+                '<doxygen><compounddef id="class%s" kind="class" language="C++" prot="public">'
+                "<compoundname>%s</compoundname></compounddef></doxygen>" % (name, name)
+            )
+
+        def build(srcdir, read):
+            app = Sphinx(
+                srcdir,
+                srcdir,
+                os.path.join(srcdir, "out"),
+                os.path.join(srcdir, "doctrees"),
+                "html",
+                status=None,
+                warning=io.StringIO(),
+                parallel=2,
+            )
+            app.connect("env-before-read-docs", lambda app, env, docnames: read.extend(docnames))
+            app.build()
+            return app.env.breathe_file_state
+
+        with tempfile.TemporaryDirectory() as srcdir:
+            os.mkdir(os.path.join(srcdir, "xml"))
+            with open(os.path.join(srcdir, "xml", "index.xml"), "w") as f:
+                f.write(index)
+            for name in ("Widget", "Gadget"):
+                with open(os.path.join(srcdir, "xml", "class%s.xml" % name), "w") as f:
+                    f.write(compound(name))
+            with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                f.write('extensions = ["breathe"]\nbreathe_projects = {"test": "xml"}\n')
+                f.write('breathe_default_project = "test"\n')
+            # enough documents for Sphinx to read them in parallel
+            docnames = ["doc%d" % i for i in range(8)]
+            with open(os.path.join(srcdir, "index.rst"), "w") as f:
+                f.write(".. toctree::\n\n" + "".join("   %s\n" % d for d in docnames))
+            for i, docname in enumerate(docnames):
+                with open(os.path.join(srcdir, docname + ".rst"), "w") as f:
+                    f.write(".. doxygenclass:: %s\n" % ("Widget", "Gadget")[i % 2])
+
+            read: List[str] = []
+            widget = os.path.join(srcdir, "xml", "classWidget.xml")
+            file_state = build(srcdir, read)
+            self.assertEqual(file_state.docnames(widget), set(docnames[::2]))
+
+            # only the documents of the modified file are read again
+            mtime = os.path.getmtime(widget) + 10
+            os.utime(widget, (mtime, mtime))
+            read.clear()
+            file_state = build(srcdir, read)
+            self.assertEqual(sorted(read), docnames[::2])
+            self.assertEqual(file_state.docnames(widget), set(docnames[::2]))
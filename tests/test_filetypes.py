@@ -0,0 +1,47 @@
+import timeit
+from unittest import TestCase
+
+from pygments.lexers import find_lexer_class_for_filename, get_lexer_for_filename
+from pygments.util import ClassNotFound
+
+from breathe import filetypes
+
+
+class TestFiletypes(TestCase):
+    filenames = [
+        "src/module%d/file%d.%s" % (i % 37, i, ext)
+        for i, ext in enumerate(["h", "hpp", "cpp", "c", "py", "cs", "md", "txt", "unknown"] * 400)
+    ]
+
+    def test_get_pygments_alias(self):
+        # one of each kind of pattern, including ambiguous ones and ones without a match
+        for filename in ("widget.h", "dir/widget.cpp", "Makefile", "Makefile.am", "a.php5", "a.x"):
+            try:
+                expected = get_lexer_for_filename(filename).aliases[0]
+            except ClassNotFound:
+                expected = None
+            self.assertEqual(filetypes.get_pygments_alias(filename), expected)
+
+    def test_benchmark(self):
+        def resolve_all():
+            filetypes.get_pygments_alias.cache_clear()
+            for filename in self.filenames:
+                filetypes.get_pygments_alias(filename)
+
+        resolve_all()
+        table_time = timeit.timeit(resolve_all, number=1)
+        # pygments matches every filename against all patterns, so only time a fraction of them
+        sample = self.filenames[: len(self.filenames) // 100]
+        pygments_time = timeit.timeit(
+            lambda: [find_lexer_class_for_filename(filename) for filename in sample], number=1
+        )
+        # The times are only reported, e.g., with "pytest -s", as they vary between runs
+        print(
+            "%d filenames took %.3fs, pygments took %.3fs for %d of them"
+            % (len(self.filenames), table_time, pygments_time, len(sample))
+        )
+
+        for filename in sample:
+            lexer = find_lexer_class_for_filename(filename)
+            expected = lexer.aliases[0] if lexer else None
+            self.assertEqual(filetypes.get_pygments_alias(filename), expected)
@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from breathe.finder import stack
+from breathe.renderer import NodeStack
+
+
+class TestNodeStack(TestCase):
+    def test_node_stack(self):
+        root = NodeStack.from_sequence(["parent", "grandparent"])
+        child = stack("child", root)
+
+        self.assertEqual(list(child), ["child", "parent", "grandparent"])
+        self.assertEqual(len(child), 3)
+        self.assertEqual(child[0], "child")
+        self.assertEqual(child[2], "grandparent")
+        self.assertEqual(child[-1], "grandparent")
+        self.assertIs(child[1:], root)
+        self.assertEqual(child[:2], ["child", "parent"])
+        self.assertRaises(IndexError, lambda: child[3])
+
+        # Pushing doesn't modify the stack that was pushed on to
+        self.assertEqual(list(stack("sibling", root)), ["sibling", "parent", "grandparent"])
+        self.assertEqual(list(root), ["parent", "grandparent"])
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+class TestImportTime(TestCase):
+    # Modules which are only needed once Doxygen output is read or rendered
+    lazy_modules = [
+        "breathe.parser.compound",
+        "breathe.parser.compoundsuper",
+        "breathe.parser.index",
+        "breathe.parser.indexsuper",
+        "breathe.parser.database",
+        "concurrent.futures.thread",
+        "sphinx.ext.graphviz",
+        "sqlite3",
+        "tarfile",
+    ]
+
+    def test_import_time(self):
+        # Sphinx is imported first so that only the cost of importing breathe itself is measured
+        code = (
+            "import sys, sphinx.application\n"
+            "import breathe\n"
+            "print(' '.join(m for m in %r if m in sys.modules))" % self.lazy_modules
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.split(), [])
+
+        # Wall-clock times vary too much between machines to fail on, so they are only reported,
+        # e.g., with "pytest -s". The lines are "import time: self [us] | cumulative | package"
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "breathe":
+                print("importing breathe took %dus" % int(fields[1]))
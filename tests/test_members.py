@@ -0,0 +1,117 @@
+import io
+import os
+import re
+import tempfile
+from unittest import TestCase
+
+from docutils import nodes
+from sphinx.application import Sphinx
+
+from breathe.finder.factory import Finder
+from breathe.directives.members import parse_entries
+
+XML_DIR = os.path.join(os.path.dirname(__file__), "data", "members")
+
+
+class TestMembers(TestCase):
+    def test_parse_entries(self):
+        lines = ["function ns::make(int, const U &)", "", "  variable  ns::count ", "enum"]
+        self.assertEqual(
+            parse_entries(lines),
+            [("function", "ns::make(int, const U &)"), ("variable", "ns::count"), ("enum", "")],
+        )
+
+    def test_filter_all(self):
+        class KindFilter:
+            def __init__(self, kind):
+                self.kind = kind
+
+            def allow(self, node_stack):
+                return node_stack[0] == self.kind
+
+        walks = []
+
+        def filter_(filter_, matches):
+            walks.append(filter_)
+            matches.extend(n for n in (["enumvalue"], ["define"]) if filter_.allow(n))
+
+        finder = Finder(None, None)
+        finder.filter_ = filter_  # type: ignore
+        filters = [KindFilter("enumvalue"), KindFilter("typedef"), KindFilter("enumvalue")]
+
+        # the filters are all matched in one walk
+        self.assertEqual(finder.filter_all_(filters), [[["enumvalue"]], [], [["enumvalue"]]])
+        self.assertEqual(len(walks), 1)
+        self.assertEqual(finder.filter_all_([]), [])
+
+    def test_render(self):
+        members = """\
+.. doxygenmembers::
+   :no-link:
+
+   function ns::make
+   variable ns::Widget::count
+   bogus ns::Widget
+   enum ns::Color
+   enumvalue ns::Red
+   function ns::Widget::size
+   function ns::missing
+"""
+        directives = """\
+.. doxygenfunction:: ns::make
+   :no-link:
+.. doxygenvariable:: ns::Widget::count
+   :no-link:
+.. doxygenenum:: ns::Color
+   :no-link:
+.. doxygenenumvalue:: ns::Red
+   :no-link:
+.. doxygenfunction:: ns::Widget::size
+   :no-link:
+.. doxygenfunction:: ns::missing
+   :no-link:
+"""
+
+        def render(content):
+            # Each in a project of its own, as the C++ domain renders declarations which were
+            # already seen in another document differently
+            with tempfile.TemporaryDirectory() as srcdir:
+                with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                    f.write('extensions = ["breathe"]\nbreathe_projects = {"test": %r}\n' % XML_DIR)
+                    f.write('breathe_default_project = "test"\n')
+                with open(os.path.join(srcdir, "index.rst"), "w") as f:
+                    f.write(content)
+
+                warning = io.StringIO()
+                app = Sphinx(
+                    srcdir,
+                    srcdir,
+                    os.path.join(srcdir, "out"),
+                    os.path.join(srcdir, "doctrees"),
+                    "html",
+                    status=None,
+                    warning=warning,
+                )
+                app.build()
+
+                # The logged warnings name the line of their directive, so only the nodes shown
+                # are compared, without the addresses of the lookup keys of the C++ domain
+                doctree = app.env.get_doctree("index")
+                rendered = [
+                    re.sub(r" object at 0x[0-9a-f]+", "", n.pformat())
+                    for n in doctree.children
+                    if not isinstance(n, nodes.system_message)
+                ]
+                return rendered, warning.getvalue()
+
+        # the entry of an unknown kind is replaced by a warning, the others render the same
+        members_nodes, members_warnings = render(members)
+        unknown = [n for n in members_nodes if "bogus ns::Widget" in n]
+        self.assertEqual(len(unknown), 1)
+        members_nodes.remove(unknown[0])
+        directives_nodes, directives_warnings = render(directives)
+        self.assertEqual(members_nodes, directives_nodes)
+        self.assertIn("Cannot find function", members_nodes[-1])
+        self.assertIn('got "bogus ns::Widget"', members_warnings)
+        self.assertIn('Cannot find function "ns::missing"', members_warnings)
+        self.assertIn('Cannot find function "ns::missing"', directives_warnings)
@@ -0,0 +1,87 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from sphinx.application import Sphinx
+
+from breathe import missing_symbols
+from breathe.project import ProjectInfo
+
+
+class TestMissingSymbols(TestCase):
+    def test_summary(self):
+        missing = {
+            ("xml", "doxygenfunction", "ns::gone", (1, 2)): {"api", "index"},
+            ("xml", "doxygenenumvalue", "Blue", (1, 2)): {"old"},
+        }
+        self.assertEqual(
+            missing_symbols.summary(missing, {"api", "index", "other"}),
+            ["doxygenfunction:: ns::gone (xml) in api, index"],
+        )
+
+    def test_index_changes(self):
+        class MockApp:
+            def __init__(self, confdir):
+                self.confdir = confdir
+
+        with tempfile.TemporaryDirectory() as confdir:
+            app = MockApp(confdir)
+            project_info = ProjectInfo(app, "proj", "xml", "", "")
+            # no index, e.g., a database project, so nothing is remembered
+            self.assertIsNone(missing_symbols.create_key(app, project_info, "doxygenfunction", "f"))
+
+            os.mkdir(os.path.join(confdir, "xml"))
+            index = os.path.join(confdir, "xml", "index.xml")
+            with open(index, "w") as f:
+                f.write("<doxygenindex/>")
+            key = missing_symbols.create_key(app, project_info, "doxygenfunction", "f")
+            self.assertEqual(key[:3], ("xml", "doxygenfunction", "f"))
+
+            # the fingerprint changes with the index
+            with open(index, "w") as f:
+                f.write("<doxygenindex></doxygenindex>")
+            self.assertNotEqual(
+                missing_symbols.create_key(app, project_info, "doxygenfunction", "f"), key
+            )
+
+    def test_repeated_warnings(self):
+        with tempfile.TemporaryDirectory() as srcdir:
+            os.mkdir(os.path.join(srcdir, "xml"))
+            with open(os.path.join(srcdir, "xml", "index.xml"), "w") as f:
+                f.write("<doxygenindex/>")
+            with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                f.write('extensions = ["breathe"]\nbreathe_projects = {"test": "xml"}\n')
+                f.write('breathe_default_project = "test"\n')
+            with open(os.path.join(srcdir, "index.rst"), "w") as f:
+                f.write(".. toctree::\n\n   a\n   b\n")
+            for docname in ("a", "b"):
+                with open(os.path.join(srcdir, docname + ".rst"), "w") as f:
+                    f.write(".. doxygenclass:: Gone\n\n.. doxygenclass:: Gone\n")
+
+            def build():
+                warning = io.StringIO()
+                status = io.StringIO()
+                app = Sphinx(
+                    srcdir,
+                    srcdir,
+                    os.path.join(srcdir, "out"),
+                    os.path.join(srcdir, "doctrees"),
+                    "html",
+                    status=status,
+                    warning=warning,
+                    freshenv=True,
+                )
+                app.build()
+                return warning.getvalue(), status.getvalue()
+
+            # only the first miss warns, all of them are in the summary and the documents
+            warnings, status = build()
+            self.assertEqual(warnings.count('Cannot find class "Gone"'), 1)
+            self.assertIn("doxygenclass:: Gone (xml) in a, b", status)
+            with open(os.path.join(srcdir, "out", "b.html")) as f:
+                self.assertEqual(f.read().count("Cannot find class"), 2)
+
+            # and the first miss of the next build warns again
+            warnings, status = build()
+            self.assertEqual(warnings.count('Cannot find class "Gone"'), 1)
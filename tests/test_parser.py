@@ -0,0 +1,198 @@
+import io
+import os
+import re
+import tempfile
+from unittest import TestCase
+
+from sphinx.application import Sphinx
+
+from breathe.parser import CompoundPrefetcher
+from breathe.parser import compound
+from breathe.parser.member_index import MemberIndex, fragment, scan
+
+
+class TestCompoundPrefetcher(TestCase):
+    def test_prefetch(self):
+        class MockConfig:
+            breathe_prefetch_workers = 2
+
+        class MockApp:
+            config = MockConfig()
+
+        compound_xml = (
+            '<doxygen><compounddef id="%s" kind="class"><compoundname>%s</compoundname>'
+            "</compounddef></doxygen>"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = []
+            for name in ("first", "second"):
+                filename = os.path.join(directory, name + ".xml")
+                with open(filename, "w") as f:
+                    f.write(compound_xml % (name, name))
+                filenames.append(filename)
+            broken = os.path.join(directory, "broken.xml")
+            with open(broken, "w") as f:
+                f.write("<doxygen>")
+
+            prefetcher = CompoundPrefetcher(MockApp(), {})
+            prefetcher.prefetch(filenames + [broken, os.path.join(directory, "missing.xml")])
+            try:
+                for name, filename in zip(("first", "second"), filenames):
+                    self.assertEqual(prefetcher.wait(filename).compounddef.compoundname, name)
+                # each result is only handed out once, after that the file is parsed as usual
+                self.assertIsNone(prefetcher.wait(filenames[0]))
+                # errors are left to the regular parse to report
+                self.assertIsNone(prefetcher.wait(broken))
+                self.assertIsNone(prefetcher.wait(os.path.join(directory, "missing.xml")))
+                self.assertEqual((prefetcher.pending, prefetcher.batches), ({}, {}))
+            finally:
+                prefetcher.shutdown()
+
+    def test_window(self):
+        class MockConfig:
+            breathe_prefetch_workers = 1
+
+        class MockApp:
+            config = MockConfig()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = []
+            for name in ("a", "b", "c", "d", "e", "f"):
+                filename = os.path.join(directory, name + ".xml")
+                with open(filename, "w") as f:
+                    f.write('<doxygen><compounddef id="%s" kind="class"/></doxygen>' % name)
+                filenames.append(filename)
+
+            prefetcher = CompoundPrefetcher(MockApp(), {})
+            prefetcher.PENDING_PER_WORKER = 2
+            try:
+                # only a few files are read ahead, the next ones start as results are taken
+                prefetcher.prefetch(filenames)
+                self.assertEqual(list(prefetcher.pending), filenames[:2])
+                self.assertIsNotNone(prefetcher.wait(filenames[0]))
+                self.assertEqual(list(prefetcher.pending), filenames[1:3])
+
+                # the files skipped over are dropped rather than kept until the end of the build
+                self.assertIsNotNone(prefetcher.wait(filenames[2]))
+                self.assertEqual(list(prefetcher.pending), filenames[3:5])
+                self.assertIsNone(prefetcher.wait(filenames[1]))
+                # files which haven't been started yet are left to the regular parse
+                self.assertIsNone(prefetcher.wait(filenames[5]))
+                self.assertEqual((prefetcher.pending, prefetcher.batches), ({}, {}))
+            finally:
+                prefetcher.shutdown()
+
+
+class TestMemberIndex(TestCase):
+    compound_xml = (
+        '<?xml version="1.0"?>\n<doxygen><compounddef id="namespacens" kind="namespace">'
+        "<compoundname>ns</compoundname>"
+        '<sectiondef kind="func">'
+        '<memberdef kind="function" id="namespacens_1a1"><name>make</name></memberdef>'
+        '<memberdef kind="function" id="namespacens_1a2"><name>take</name></memberdef>'
+        "</sectiondef>"
+        '<sectiondef kind="enum"><header>Colours</header>'
+        '<memberdef kind="enum" id="namespacens_1a3"><name>Color</name>'
+        '<enumvalue id="namespacens_1a3a4"><name>Red</name></enumvalue></memberdef>'
+        "</sectiondef>"
+        "<briefdescription><para>The namespace.</para></briefdescription>"
+        '<location file="ns.h"/></compounddef></doxygen>'
+    )
+
+    def test_fragment(self):
+        data = self.compound_xml.encode("utf-8")
+        member_index = scan(data)
+        self.assertEqual(
+            set(member_index["members"]),
+            {"namespacens_1a1", "namespacens_1a2", "namespacens_1a3", "namespacens_1a3a4"},
+        )
+
+        def read(offset, length):
+            return data[offset : offset + length]
+
+        tree = compound.parse(io.BytesIO(fragment(read, member_index, "namespacens_1a2")))
+        self.assertEqual(tree.compounddef.compoundname, "ns")
+        (sectiondef,) = tree.compounddef.sectiondef
+        self.assertEqual(sectiondef.kind, "func")
+        self.assertEqual([m.id for m in sectiondef.memberdef], ["namespacens_1a2"])
+        # the rest of the compound after its sections is kept
+        (para,) = tree.compounddef.briefdescription.content_
+        self.assertEqual(para.name, "para")
+        self.assertEqual(tree.compounddef.location.file, "ns.h")
+
+        # enum values are found in their enum, along with the header of its section
+        tree = compound.parse(io.BytesIO(fragment(read, member_index, "namespacens_1a3a4")))
+        (sectiondef,) = tree.compounddef.sectiondef
+        self.assertEqual(sectiondef.header, "Colours")
+        self.assertEqual([m.id for m in sectiondef.memberdef], ["namespacens_1a3"])
+        self.assertIsNone(fragment(read, member_index, "namespacens_1a9"))
+
+    def test_sidecar(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "namespacens.xml")
+            with open(filename, "w") as f:
+                f.write(self.compound_xml)
+            sidecar_dir = os.path.join(directory, "members")
+
+            tree = MemberIndex(sidecar_dir).parse_member(filename, "namespacens_1a1")
+            self.assertEqual(tree.compounddef.sectiondef[0].memberdef[0].name, "make")
+            self.assertIsNone(MemberIndex(sidecar_dir).parse_member(filename, "namespacens_1a9"))
+
+            # the ranges are read back from the sidecar by later builds, until the file changes
+            loaded = MemberIndex(sidecar_dir)
+            stamp = [os.stat(filename).st_mtime_ns, os.stat(filename).st_size]
+            self.assertIsNotNone(loaded._load(filename, stamp))
+            with open(filename, "w") as f:
+                f.write(self.compound_xml.replace("make", "remake"))
+            tree = loaded.parse_member(filename, "namespacens_1a1")
+            self.assertEqual(tree.compounddef.sectiondef[0].memberdef[0].name, "remake")
+
+    def test_render(self):
+        xml_dir = os.path.join(os.path.dirname(__file__), "data", "members")
+        # One member per document, so that each only needs a single member of its compound file
+        documents = {
+            "make": ".. doxygenfunction:: ns::make",
+            "size": ".. doxygenfunction:: ns::Widget::size",
+            "count": ".. doxygenvariable:: ns::Widget::count",
+            "red": ".. doxygenenumvalue:: ns::Red",
+        }
+
+        def render(member_index):
+            with tempfile.TemporaryDirectory() as srcdir:
+                with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                    f.write('extensions = ["breathe"]\nbreathe_projects = {"test": %r}\n' % xml_dir)
+                    f.write('breathe_default_project = "test"\n')
+                    f.write("breathe_member_index = %r\n" % member_index)
+                with open(os.path.join(srcdir, "index.rst"), "w") as f:
+                    f.write(".. toctree::\n\n" + "".join("   %s\n" % d for d in documents))
+                for docname, content in documents.items():
+                    with open(os.path.join(srcdir, docname + ".rst"), "w") as f:
+                        f.write(content + "\n")
+
+                app = Sphinx(
+                    srcdir,
+                    srcdir,
+                    os.path.join(srcdir, "out"),
+                    os.path.join(srcdir, "doctrees"),
+                    "html",
+                    status=None,
+                    warning=io.StringIO(),
+                )
+                app.build()
+
+                sidecars = os.path.isdir(os.path.join(srcdir, "doctrees", "breathe", "members"))
+                # Without the addresses of the lookup keys of the C++ domain
+                rendered = {
+                    docname: [
+                        re.sub(r" object at 0x[0-9a-f]+", "", n.pformat())
+                        for n in app.env.get_doctree(docname).children
+                    ]
+                    for docname in documents
+                }
+                return rendered, sidecars
+
+        fragments, sidecars = render(True)
+        self.assertTrue(sidecars)
+        whole, sidecars = render(False)
+        self.assertFalse(sidecars)
+        self.assertEqual(fragments, whole)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from breathe.directives.prescan import scan_directives
+
+
+class TestPrescan(TestCase):
+    def test_scan_directives(self):
+        source = "\n".join(
+            [
+                "Title",
+                "=====",
+                "",
+                ".. doxygenclass:: ns::Widget",
+                "   :project: widgets",
+                "   :members:",
+                "",
+                "   :outline:",
+                "",
+                ".. note::",
+                "",
+                "   .. doxygenfunction:: ns::make(int)",
+                "",
+                ".. autodoxygenindex::",
+            ]
+        )
+        self.assertEqual(
+            scan_directives(source),
+            [
+                ("doxygenclass", "ns::Widget", {"project": "widgets", "members": ""}),
+                ("doxygenfunction", "ns::make(int)", {}),
+            ],
+        )
+
+    def test_literal_blocks(self):
+        source = "\n".join(
+            [
+                "Use it like this::",
+                "",
+                "   .. doxygenclass:: Example",
+                "",
+                ".. code-block:: rst",
+                "",
+                "   .. doxygenfunction:: example",
+                "      :project: example",
+                "",
+                ".. doxygenindex::",
+                "",
+                ".. doxygenclass:: ns::Widget",
+            ]
+        )
+        self.assertEqual(
+            scan_directives(source), [("doxygenindex", "", {}), ("doxygenclass", "ns::Widget", {})]
+        )
@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from breathe.project import ProjectInfo
+
+
+class TestDomainForFile(TestCase):
+    def test_domain_for_file(self):
+        class MockConfig:
+            breathe_domain_by_extension = {"h": "cpp", "py": "py"}
+            breathe_domain_by_file_pattern = {"*/c/*": "c", "*/c/legacy/*.h": "cpp"}
+
+        class MockApp:
+            config = MockConfig()
+
+        project_info = ProjectInfo(MockApp(), "project", "xml", "", "")
+
+        self.assertEqual(project_info.domain_for_file("src/widget.h"), "cpp")
+        self.assertEqual(project_info.domain_for_file("src/widget.py"), "py")
+        self.assertEqual(project_info.domain_for_file("src/widget.cs"), "")
+        self.assertEqual(project_info.domain_for_file("src/c/widget.h"), "c")
+        # The last matching pattern wins
+        self.assertEqual(project_info.domain_for_file("src/c/legacy/widget.h"), "cpp")
+        self.assertEqual(project_info.domain_for_file("src/c/legacy/widget.c"), "c")
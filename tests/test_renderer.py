@@ -218,6 +218,9 @@ class MockCompoundParser:
         compounddef = self.compound_dict[compoundname]
         return self.MockFileData(compounddef)
 
+    def prefetch(self, compoundnames):
+        pass
+
 
 class NodeFinder(nodes.NodeVisitor):
     """Find node with specified class name."""
@@ -592,3 +595,340 @@ def test_ellipsis(app):
     # Verify that parsing an ellipsis works
     ast_param = cls._parse_args(argsstrings[0])
     ret = cls._resolve_function(matches, ast_param, None)
+
+
+def test_render_cache_copies(app):
+    from breathe.renderer.cache import RenderCache
+    from breathe.renderer.filter import FilterFactory, filter_fingerprint
+
+    filter_factory = FilterFactory(app)
+    assert filter_fingerprint(filter_factory.create_outline_filter({"outline": ""})) == (
+        filter_fingerprint(filter_factory.create_outline_filter({"outline": None}))
+    )
+    assert filter_fingerprint(filter_factory.create_outline_filter({})) != (
+        filter_fingerprint(filter_factory.create_outline_filter({"outline": ""}))
+    )
+
+    document = MockState(app).document
+    cache = RenderCache()
+    key = ("project", (("memberdef", "foo"),), "doxygenfunction", (), "", (), "mock-doc")
+    assert cache.get(key, document) is None
+
+    target = nodes.target(ids=["foo"], names=["foo"])
+    document.note_explicit_target(target)
+    cache.store(key, [nodes.paragraph("", "", target, nodes.Text("foo"))])
+
+    first = cache.get(key, document)
+    second = cache.get(key, document)
+    assert first is not None and second is not None
+    assert first[0] is not second[0]
+    assert first[0].astext() == "foo"
+    # the ids are already registered with the document by the original render
+    assert find_node(first, "target")["ids"] == []
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_render_cache_documents():
+    """Test that documents rendering the same no-link directive don't share the cached output"""
+    import io
+    import re
+    import tempfile
+    from sphinx.application import Sphinx
+
+    xml_dir = os.path.join(os.path.dirname(__file__), "data", "members")
+    directive = ".. doxygenclass:: ns::Widget\n   :members:\n   :no-link:\n"
+
+    def build(render_cache):
+        with tempfile.TemporaryDirectory() as srcdir:
+            with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                f.write('extensions = ["breathe"]\nbreathe_projects = {"test": %r}\n' % xml_dir)
+                f.write('breathe_default_project = "test"\n')
+                f.write("breathe_render_cache = %r\n" % render_cache)
+            for docname in ("index", "other"):
+                with open(os.path.join(srcdir, docname + ".rst"), "w") as f:
+                    f.write(directive)
+            app = Sphinx(
+                srcdir,
+                srcdir,
+                os.path.join(srcdir, "out"),
+                os.path.join(srcdir, "doctrees"),
+                "html",
+                status=None,
+                warning=io.StringIO(),
+            )
+            app.build()
+
+            # every document registers the declarations it shows with the C++ domain
+            root = app.env.domaindata["cpp"]["root_symbol"]
+            docnames = {s.docname for s in root.get_all_symbols() if s.declaration}
+            assert docnames == {"index", "other"}
+            return [
+                re.sub(r" object at 0x[0-9a-f]+", "", n.pformat())
+                for docname in ("index", "other")
+                for n in app.env.get_doctree(docname).children
+            ]
+
+    assert build(True) == build(False)
+
+
+def test_parsed_rst_cache_self_contained(app):
+    from breathe.renderer.cache import ParsedRstCache
+
+    document = MockState(app).document
+    cache = ParsedRstCache()
+
+    cache.store(("embed:rst", "*plain*"), [nodes.paragraph("", "", nodes.emphasis("", "plain"))])
+    xref = sphinx.addnodes.pending_xref("", nodes.Text("foo"), reftarget="foo")
+    cache.store(("embed:rst", ":any:`foo`"), [nodes.paragraph("", "", xref)])
+
+    cached = cache.get(("embed:rst", "*plain*"), document)
+    assert cached is not None and cached[0].astext() == "plain"
+    assert cached[0].document is document
+    # cross-references capture the context they were parsed in so they aren't reused
+    assert cache.get(("embed:rst", ":any:`foo`"), document) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_declaration_cache(app):
+    from breathe.renderer.cache import DeclarationCache
+
+    argsstrings, matches = get_matches("arange.xml")
+    cls = get_directive(app)
+    cache = DeclarationCache()
+    cls.env.temp_data["breathe_declaration_cache"] = cache
+
+    # the candidates are parsed once, after that the results come from the cache
+    for args in argsstrings:
+        cls._resolve_function(matches, cls._parse_args(args), None)
+    assert cache.hits > 0
+    misses = cache.misses
+    for args in argsstrings:
+        assert cls._parse_args(args) == cls._parse_args(args)
+        cls._resolve_function(matches, cls._parse_args(args), None)
+    assert cache.misses == misses
+
+    # every use gets a declaration of its own to register with the domain
+    key = next(key for key in cache._store if key[1] == "function")
+    ast = cache.get(key)
+    assert ast is not cache.get(key) and ast.symbol is None
+    assert ast.declaration is cache.get(key).declaration
+
+
+def test_declaration_builders(app):
+    """Test that the ASTs built from Doxygen members are the ones the C++ parser produces"""
+    import io
+    from breathe.parser import compound
+    from breathe.renderer import declaration
+    from sphinx.domains import cpp
+
+    def parse(text, object_type, directive_type):
+        parser = cpp.DefinitionParser(text, location=None, config=app.config)
+        ast = parser.parse_declaration(object_type, directive_type)
+        parser.assert_end()
+        return ast
+
+    def member(kind, type_, name, argsstring="", params="", attributes=""):
+        return (
+            '<memberdef kind="%s" id="%s" prot="public" static="no" %s>'
+            "<type>%s</type><name>%s</name><argsstring>%s</argsstring>%s</memberdef>"
+            % (kind, name, attributes, type_, name, argsstring, params)
+        )
+
+    param = "<param><type>%s</type><declname>%s</declname></param>"
+    widget = '<ref refid="classns_1_1Widget" kindref="compound">ns::Widget</ref>'
+    xml = "".join(
+        [
+            '<doxygen><compounddef id="namespacens" kind="namespace">',
+            '<compoundname>ns</compoundname><sectiondef kind="func">',
+            member(
+                "function",
+                "size_t",
+                "size",
+                "(int index, ns::Widget) const",
+                param % ("int", "index") + param % (widget, ""),
+                'const="yes"',
+            ),
+            member(
+                "function", "const ns::Widget &amp;", "get", "(int index)", param % ("int", "index")
+            ),
+            member("function", "int", "count", "() noexcept"),
+            member(
+                "function", "int", "sum", "(int(&amp;values)[3])", param % ("int(&amp;)", "values")
+            ),
+            member("variable", widget, "current"),
+            member("variable", "unsigned long", "total"),
+            member("typedef", "double", "Real"),
+            member("typedef", "std::vector&lt; int &gt;", "Ints"),
+            member("enum", "char", "Color", attributes='strong="yes"'),
+            member("enum", "unsigned char", "Shade", attributes='strong="yes"'),
+            "</sectiondef></compounddef></doxygen>",
+        ]
+    )
+    root = compound.parse(io.BytesIO(xml.encode("utf-8")))
+    members = {
+        memberdef.name: memberdef
+        for sectiondef in root.compounddef.sectiondef
+        for memberdef in sectiondef.memberdef
+    }
+
+    config = app.config
+    cases = [
+        (
+            declaration.function_declaration(config, ["static"], members["size"], "ns::size"),
+            parse("static size_t ns::size(int index, ns::Widget) const", "function", "function"),
+        ),
+        (
+            declaration.variable_declaration(config, ["mutable"], members["current"], "current"),
+            parse("mutable ns::Widget current", "member", "var"),
+        ),
+        (
+            declaration.typedef_declaration(config, members["Real"], "ns::Real"),
+            parse("double ns::Real", "type", "type"),
+        ),
+        (
+            declaration.enum_declaration(config, members["Color"], "ns::Color", "enum-class"),
+            parse("ns::Color : char", "enum", "enum-class"),
+        ),
+        (
+            declaration.enumerator_declaration(config, "Red"),
+            parse("Red", "enumerator", "enumerator"),
+        ),
+    ]
+    for built, parsed in cases:
+        assert built is not None
+        assert built == parsed and str(built) == str(parsed)
+
+    # anything but single names is left to the parser
+    assert declaration.function_declaration(config, [], members["get"], "get") is None
+    assert declaration.function_declaration(config, [], members["count"], "count") is None
+    assert declaration.function_declaration(config, [], members["sum"], "sum") is None
+    assert declaration.function_declaration(config, [], members["size"], "operator==") is None
+    assert declaration.function_declaration(config, ["explicit"], members["size"], "f") is None
+    assert declaration.variable_declaration(config, [], members["total"], "total") is None
+    assert declaration.typedef_declaration(config, members["Ints"], "Ints") is None
+    assert declaration.enum_declaration(config, members["Shade"], "Shade", "enum-class") is None
+
+
+def test_linked_text(app):
+    """Test that the text of linked text is the text of the nodes it is rendered to"""
+    from breathe.renderer.text import TextCache, linked_text
+
+    app.config.breathe_separate_member_pages = False
+    app.config.breathe_use_project_refids = False
+    renderer = SphinxRenderer(app, None, [], None, None, MockTargetHandler(), None, OpenFilter())
+    renderer.context = MockContext(app, [], None)
+
+    argsstrings, matches = get_matches("arange.xml")
+    linked = [member_def.type_ for member_def, _ in matches]
+    linked.extend(param.type_ for member_def, _ in matches for param in member_def.param)
+    linked.append(WrappedLinkedText(content_=[WrappedMixedContainer(value=" a\n b ")]))
+    for node in linked:
+        assert linked_text(node) == "".join(n.astext() for n in renderer.render(node))
+
+    cache = TextCache()
+    node = linked[0]
+    assert cache.get(node, "text", lambda: "Tensor") == "Tensor"
+    assert cache.get(node, "text", lambda: "changed") == "Tensor"
+    assert cache.get(node, "other", lambda: "other") == "other"
+
+
+def test_collapse_text(app):
+    """Test that the runs of text in large descriptions are collapsed like they were pairwise and
+    report how long each takes"""
+    import time
+    from breathe.parser.compound import docParaTypeSub
+    from xml.dom import minidom
+
+    renderer = SphinxRenderer(app, None, [], None, None, MockTargetHandler(), None, OpenFilter())
+    renderer.context = MockContext(app, [], None)
+
+    # a generated table of values, with the lines split around the <linebreak/> elements
+    lines = ["VALUE_%d = %d" % (i, i) for i in range(2000)]
+    xml = "<para>%s</para>" % "<linebreak/>\n".join(lines)
+    para = docParaTypeSub.factory()
+    para.build(minidom.parseString(xml).documentElement)
+    (paragraph,) = renderer.visit_docpara(para)
+    assert [n.astext() for n in paragraph.children] == lines
+
+    def pairwise(nodelist):
+        # what visit_docpara used to do, render the text so far again for every node in the run
+        result = []
+        for n in nodelist:
+            if result and isinstance(result[-1], nodes.Text) and isinstance(n, nodes.Text):
+                prev = result.pop()
+                result.extend(renderer.render_string(prev.astext() + n.astext()))
+                continue
+            result.append(n)
+        return result
+
+    values = [nodes.Text("VALUE_%d = %d, " % (i, i)) for i in range(5000)]
+    values[2500:2500] = [nodes.emphasis(text="deprecated")]
+
+    # each is only run once, as the pairwise reference is quadratic
+    start = time.perf_counter()
+    collapsed = renderer.collapse_text(values)
+    collapse_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = pairwise(values)
+    pairwise_time = time.perf_counter() - start
+    assert collapsed == expected
+
+    # The times are only reported, e.g., with "pytest -s", as they vary between runs
+    print(
+        "%d text nodes took %.3fs, pairwise took %.3fs"
+        % (len(values), collapse_time, pairwise_time)
+    )
+
+
+def test_create_dot_limits():
+    """Test that graphs are cut down to the nodes closest to the focus node"""
+    from breathe.parser.compoundsuper import childnodeType, graphType, nodeType
+    from breathe.renderer.graph import DotCache, create_dot
+
+    # a chain of includes 1 -> 2 -> 3 -> 4 with 5 including the focus node
+    graph = graphType(
+        node=[
+            nodeType(id="1", label="a.h", childnode=[childnodeType("include", "2")]),
+            nodeType(id="2", label="b.h", childnode=[childnodeType("include", "3")]),
+            nodeType(id="3", label="c.h", childnode=[childnodeType("include", "4")]),
+            nodeType(id="4", label="d.h"),
+            nodeType(id="5", label="e.h", childnode=[childnodeType("include", "1")]),
+        ]
+    )
+
+    dot = create_dot(graph)
+    assert '"4" [label="d.h"' in dot and "truncated" not in dot
+
+    dot = create_dot(graph, max_depth=1)
+    assert '"2" [label="b.h"' in dot and '"5" [label="e.h"' in dot
+    assert '"3" [label' not in dot and '"2" -> "3"' not in dot
+    assert '"truncated" [label="2 more not shown"' in dot
+    assert '"2" -> "truncated" [style=dashed]' in dot
+
+    dot = create_dot(graph, max_nodes=2)
+    assert dot.count("[label=") == 3
+    assert '"truncated" [label="3 more not shown"' in dot
+
+    cache = DotCache()
+    assert cache.get(graph, 0, 1) is cache.get(graph, 0, 1)
+    assert cache.get(graph) == create_dot(graph)
+
+
+def test_dotfile_in_broken_archive(app, tmp_path):
+    """Test that a dot file which can't be read from an archive is reported as a warning"""
+
+    archive = tmp_path / "xml.zip"
+    archive.write_bytes(b"not a zip file")
+
+    class MockDotFile:
+        name = str(archive / "graph.dot")
+        content_ = []
+
+    renderer = SphinxRenderer(
+        app, None, [], MockState(app), None, MockTargetHandler(), None, OpenFilter()
+    )
+    messages = []
+    renderer.state.document.reporter.warning = messages.append
+    (graph_node,) = renderer.visit_docdotfile(MockDotFile())
+    assert graph_node["code"] == ""
+    assert len(messages) == 1
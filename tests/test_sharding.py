@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from sphinx.application import Sphinx
+
+from breathe.directives.sharding import MARKER, ShardGenerator, shard_directory, toctree
+
+XML_DIR = os.path.join(os.path.dirname(__file__), "data", "members")
+
+
+class TestSharding(TestCase):
+    def test_shard_directory(self):
+        self.assertEqual(shard_directory("api/index", ""), "api/index_shards")
+        self.assertEqual(shard_directory("api/index", "classes"), "api/classes")
+        self.assertEqual(shard_directory("api/index", "."), "api")
+        self.assertEqual(
+            toctree("api", [("classWidget", "class", "Widget")]),
+            ".. toctree::\n   :maxdepth: 1\n\n   /api/classWidget\n",
+        )
+
+    def test_write(self):
+        class MockEnv:
+            pass
+
+        class MockApp:
+            env = MockEnv()
+
+        with tempfile.TemporaryDirectory() as directory:
+            MockApp.srcdir = directory
+            generator = ShardGenerator(MockApp(), {}, None, None)
+            generator.write("api", "classWidget", "index", "Widget\n")
+            generator.write("api", "classGadget", "index", "Gadget\n")
+            filename = os.path.join(directory, "api", "classWidget.rst")
+            with open(filename) as f:
+                self.assertTrue(f.read().startswith(MARKER))
+            with open(os.path.join(directory, "api", "notes.rst"), "w") as f:
+                f.write("Written by hand\n")
+
+            # unchanged shards aren't written again
+            os.utime(filename, (0, 0))
+            generator = ShardGenerator(MockApp(), {}, None, None)
+            generator.write("api", "classWidget", "index", "Widget\n")
+            self.assertEqual(os.path.getmtime(filename), 0)
+
+            # only generated documents of compounds that are gone are removed
+            generator.remove_stale()
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(directory, "api"))), ["classWidget.rst", "notes.rst"]
+            )
+
+    def test_generate(self):
+        def build(srcdir):
+            app = Sphinx(
+                srcdir,
+                srcdir,
+                os.path.join(srcdir, "out"),
+                os.path.join(srcdir, "doctrees"),
+                "html",
+                status=None,
+                warning=io.StringIO(),
+            )
+            app.build()
+            return app.env
+
+        with tempfile.TemporaryDirectory() as srcdir:
+            with open(os.path.join(srcdir, "conf.py"), "w") as f:
+                f.write('extensions = ["breathe"]\nbreathe_projects = {"test": %r}\n' % XML_DIR)
+                f.write('breathe_default_project = "test"\n')
+            with open(os.path.join(srcdir, "index.rst"), "w") as f:
+                f.write(".. toctree::\n\n   api\n   notes\n")
+            with open(os.path.join(srcdir, "api.rst"), "w") as f:
+                f.write(".. doxygenindex::\n   :sharded: api\n")
+            notes = os.path.join(srcdir, "notes.rst")
+            with open(notes, "w") as f:
+                f.write("Notes\n=====\n")
+
+            env = build(srcdir)
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(srcdir, "api"))),
+                ["classns_1_1Widget.rst", "namespacens.rst"],
+            )
+            self.assertEqual(env.breathe_sharded_docnames, {"api"})
+            # the files read to generate the shards are recorded by the documents using them
+            index_xml = os.path.join(XML_DIR, "index.xml")
+            self.assertEqual(
+                env.breathe_file_state.docnames(index_xml),
+                {"api", "api/classns_1_1Widget", "api/namespacens"},
+            )
+
+            # documents which didn't use the option and haven't changed since aren't read
+            mtime = os.path.getmtime(notes)
+            with open(notes, "w") as f:
+                f.write(".. doxygenindex::\n   :sharded: notes\n")
+            os.utime(notes, (mtime, mtime))
+            env = build(srcdir)
+            self.assertEqual(env.breathe_sharded_docnames, {"api"})
+            self.assertFalse(os.path.exists(os.path.join(srcdir, "notes")))
+
+            os.utime(notes, (mtime + 10, mtime + 10))
+            env = build(srcdir)
+            self.assertEqual(env.breathe_sharded_docnames, {"api", "notes"})
+            self.assertTrue(os.path.isdir(os.path.join(srcdir, "notes")))